@@ -0,0 +1,72 @@
+"""Per-event cost of snap_to_smith and of the batched snapper.
+
+Run from the repository root:  python -m benchmarks.bench_snap
+"""
+import timeit
+
+import numpy as np
+
+from utils.smith_snap import SmithSnapper, default_snapper, r_values, x_values
+
+
+def _loop_snap(x, y, tolerance=0.05):
+    # The original per-circle implementation, kept here as the reference point
+    closest_point = (x, y)
+    min_dist = float('inf')
+    for r in r_values:
+        center = r / (1 + r), 0
+        radius = 1 / (1 + r)
+        dx, dy = x - center[0], y - center[1]
+        dist_to_circle = abs(np.hypot(dx, dy) - radius)
+        if dist_to_circle < min_dist and dist_to_circle < tolerance:
+            theta = np.arctan2(dy, dx)
+            closest_point = (center[0] + radius * np.cos(theta), center[1] + radius * np.sin(theta))
+            min_dist = dist_to_circle
+    for xval in x_values:
+        for sign in [+1, -1]:
+            cx, cy = 1, sign * 1 / xval
+            r = 1 / abs(xval)
+            dx, dy = x - cx, y - cy
+            dist_to_arc = abs(np.hypot(dx, dy) - r)
+            if dist_to_arc < min_dist and dist_to_arc < tolerance:
+                theta = np.arctan2(dy, dx)
+                closest_point = (cx + r * np.cos(theta), cy + r * np.sin(theta))
+                min_dist = dist_to_arc
+    return closest_point
+
+
+def main(n_points=2000, batch_size=10000):
+    rng = np.random.default_rng(0)
+    pts = rng.uniform(-1.1, 1.1, size=(n_points, 2))
+
+    for x, y in pts[:200]:
+        assert _loop_snap(x, y) == default_snapper.snap(x, y)
+
+    def run(fn):
+        return timeit.timeit(lambda: [fn(x, y) for x, y in pts], number=1) / n_points
+
+    loop_cost = run(_loop_snap)
+    vec_cost = run(default_snapper.snap)
+
+    xs, ys = rng.uniform(-1.1, 1.1, size=(2, batch_size))
+    batch_cost = timeit.timeit(lambda: default_snapper.snap_many(xs, ys), number=3) / 3 / batch_size
+
+    print(f"curves:              {len(default_snapper)}")
+    print(f"per-circle loop:     {loop_cost * 1e6:8.1f} us / event")
+    print(f"vectorized snap:     {vec_cost * 1e6:8.1f} us / event ({loop_cost / vec_cost:.0f}x)")
+    print(f"batched snap_many:   {batch_cost * 1e6:8.2f} us / point")
+
+    # Lookup cost as the curve count grows (finer r/x steps plus g/b and VSWR circles)
+    print()
+    for n in (100, 1000, 5000):
+        vals = np.geomspace(0.01, 50, n)
+        vswr = np.linspace(1.05, 20, n // 4)
+        for indexed in (False, True):
+            snapper = SmithSnapper(vals, vals, vals, vals, vswr, indexed=indexed)
+            cost = timeit.timeit(lambda: [snapper.snap(x, y) for x, y in pts[:500]], number=1) / 500
+            label = "indexed" if indexed else "full scan"
+            print(f"{len(snapper):6d} curves, {label:9s}: {cost * 1e6:8.1f} us / event")
+
+
+if __name__ == "__main__":
+    main()
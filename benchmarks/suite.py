@@ -0,0 +1,455 @@
+"""Headless benchmark suite: snapping, background generation, scene scaling, paint, hit-testing, grid,
+trace decimation, readout cache.
+
+Run from the repository root:
+
+    python -m benchmarks.suite                          # print results
+    python -m benchmarks.suite --save baseline.json     # record a baseline
+    python -m benchmarks.suite --compare baseline.json  # flag regressions (exit 1)
+
+Every benchmark reports the median of several repeats in seconds per operation.
+Baselines are plain JSON, so results from two builds can also be diffed by hand.
+`--quick` drops the 100k item scene and lowers repeat counts.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QWheelEvent
+from PyQt5.QtCore import QT_VERSION_STR, PYQT_VERSION_STR, QPoint, QPointF, QRectF, Qt
+
+BASELINE_VERSION = 1
+
+
+def measure(fn, repeat=5, number=1, setup=None):
+    """Median and min seconds per call of fn() over `repeat` rounds of `number` calls."""
+    times = []
+    for _ in range(repeat):
+        state = setup() if setup else None
+        start = time.perf_counter()
+        for _ in range(number):
+            fn() if state is None else fn(state)
+        times.append((time.perf_counter() - start) / number)
+    return {"median": float(np.median(times)), "min": float(np.min(times)), "repeat": repeat}
+
+
+# Snapping
+
+def bench_snap(quick):
+    from utils.smith_snap import default_snapper
+
+    rng = np.random.default_rng(0)
+    pts = rng.uniform(-1.1, 1.1, size=(500, 2)).tolist()
+    xs, ys = rng.uniform(-1.1, 1.1, size=(2, 20000))
+
+    def single():
+        for x, y in pts:
+            default_snapper.snap(x, y)
+
+    single_cost = measure(single, repeat=3 if quick else 7)
+    batch_cost = measure(lambda: default_snapper.snap_many(xs, ys), repeat=3 if quick else 7)
+    return {
+        "snap.single": _per(single_cost, len(pts)),
+        "snap.batch": _per(batch_cost, len(xs)),
+    }
+
+
+def _per(result, n):
+    return dict(result, median=result["median"] / n, min=result["min"] / n)
+
+
+# Background generation
+
+def bench_background(quick):
+    from core.background_cache import BackgroundCache
+    from core.smith_chart_view import SmithChartView
+
+    results = {}
+    for mode in ("vector", "tiled", "image"):
+        with tempfile.TemporaryDirectory() as tmp:
+            def fresh_cache():
+                # A new, empty cache directory per round
+                return BackgroundCache(tempfile.mkdtemp(dir=tmp))
+
+            results[f"background.cold.{mode}"] = measure(
+                lambda cache: SmithChartView(background_mode=mode, background_cache=cache),
+                repeat=2 if quick else 4, setup=fresh_cache)
+
+            warm = BackgroundCache(os.path.join(tmp, "warm"))
+            SmithChartView(background_mode=mode, background_cache=warm)
+            results[f"background.warm.{mode}"] = measure(
+                lambda: SmithChartView(background_mode=mode, background_cache=warm),
+                repeat=3 if quick else 6)
+    return results
+
+
+# Scene construction
+
+def populate(view, n, seed=0, max_circle_radius=30):
+    """Add n annotations in a realistic mix: 70% points, 10% each arrows, labels, circles.
+
+    Circle radii are uniform in [30, max_circle_radius] scene units.
+    """
+    from core.graphics_items import MovablePoint, StretchableArrowWithHandles, DraggableText, SnapCircleItem
+
+    rng = np.random.default_rng(seed)
+    transform = view.chart_transform()
+    gamma = rng.uniform(-0.95, 0.95, size=(n, 2))
+    xs, ys = transform.gamma_to_scene(gamma[:, 0], gamma[:, 1])
+    kinds = rng.choice(4, size=n, p=[0.7, 0.1, 0.1, 0.1])
+    radii = rng.uniform(30, max(30, max_circle_radius), size=n)
+    scene = view.scene
+    for kind, x, y, r in zip(kinds.tolist(), xs.tolist(), ys.tolist(), radii.tolist()):
+        if kind == 0:
+            point = MovablePoint(5)
+            scene.addItem(point)
+            point.setPos(x, y)
+        elif kind == 1:
+            StretchableArrowWithHandles((x, y), (x + 40, y + 25)).add_to_scene(scene)
+        elif kind == 2:
+            text = DraggableText("Label")
+            scene.addItem(text)
+            text.setPos(x, y)
+        else:
+            SnapCircleItem().add_to_scene(scene, QPointF(x, y), QPointF(x + r, y))
+
+
+def populate_bulk(view, n, seed=0, max_circle_radius=30):
+    """populate() through ChartBuilder: the same mix, one bulk call per kind."""
+    from core.chart_api import ChartBuilder
+
+    rng = np.random.default_rng(seed)
+    transform = view.chart_transform()
+    gamma = rng.uniform(-0.95, 0.95, size=(n, 2))
+    kinds = rng.choice(4, size=n, p=[0.7, 0.1, 0.1, 0.1])
+    radii = rng.uniform(30, max(30, max_circle_radius), size=n)
+    z = gamma[:, 0] + 1j * gamma[:, 1]
+    chart = ChartBuilder(view)
+    chart.add_points(z[kinds == 0])
+    # Scene offsets in Γ units; scene y points down
+    chart.add_arrows(z[kinds == 1], z[kinds == 1] + (40 - 25j) / transform.radius)
+    chart.add_texts(z[kinds == 2], "Label")
+    chart.add_circles(z[kinds == 3], radii[kinds == 3] / transform.radius)
+
+
+def bench_scene(quick):
+    from core.smith_chart_view import SmithChartView
+
+    results = {}
+    sizes = (1000, 10000) if quick else (1000, 10000, 100000)
+    for n in sizes:
+        views = []
+
+        def build(view):
+            # Until every label shows its text, as scene.bulk does
+            populate(view, n)
+            view.readouts.flush()
+            views.append(view)
+
+        def new_view():
+            return SmithChartView(background_mode="vector")
+
+        def build_bulk(view):
+            populate_bulk(view, n)
+            views.append(view)
+
+        def undo_bulk(view):
+            while view.undo_stack.canUndo():
+                view.undo_stack.undo()
+
+        def new_populated_view():
+            view = new_view()
+            populate_bulk(view, n)
+            # A frame passes before any undo: Qt scans its unpolished list on every
+            # removeItem, which would make the undo quadratic
+            QApplication.processEvents()
+            return view
+
+        repeat = 1 if n >= 100000 else 3
+        results[f"scene.build.{n // 1000}k"] = measure(build, repeat=repeat, setup=new_view)
+        results[f"scene.bulk.{n // 1000}k"] = measure(build_bulk, repeat=repeat, setup=new_view)
+        results[f"scene.undo_bulk.{n // 1000}k"] = measure(undo_bulk, repeat=repeat, setup=new_populated_view)
+        for view in views:
+            view.scene.clear()
+    return results
+
+
+# Paint under pan / zoom
+
+def bench_paint(quick):
+    from core.smith_chart_view import SmithChartView
+
+    results = {}
+    frames = 20 if quick else 60
+    for mode in ("tiled", "vector"):
+        view = SmithChartView(background_mode=mode)
+        view.resize(1200, 900)
+        populate(view, 2000)
+        view.show()
+        QApplication.processEvents()
+
+        def pan():
+            bar = view.horizontalScrollBar()
+            for i in range(frames):
+                bar.setValue(bar.value() + (15 if i < frames // 2 else -15))
+                view.viewport().repaint()
+
+        center = QPointF(600, 450)
+
+        def zoom():
+            # Through wheelEvent, so the view's zoom-time cache policy is included
+            for i in range(frames):
+                delta = QPoint(0, 120 if i < frames // 2 else -120)
+                QApplication.sendEvent(view.viewport(), QWheelEvent(
+                    center, center, QPoint(), delta, Qt.NoButton, Qt.NoModifier, Qt.NoScrollPhase, False))
+                view.viewport().repaint()
+
+        view.viewport().repaint()
+        results[f"paint.pan.{mode}"] = _per(measure(pan, repeat=3), frames)
+        results[f"paint.zoom.{mode}"] = _per(measure(zoom, repeat=3), frames)
+        view.close()
+    return results
+
+
+# Hit-testing and selection
+
+def bench_hittest(quick):
+    from PyQt5.QtGui import QPainterPath
+    from core.smith_chart_view import SmithChartView
+
+    results = {}
+    rng = np.random.default_rng(1)
+    clicks = [QPoint(int(x), int(y)) for x, y in rng.uniform(100, 800, size=(200, 2))]
+    bands = rng.uniform(100, 740, size=(50, 2))
+    for n in ((1000, 4000) if quick else (1000, 4000, 16000)):
+        view = SmithChartView(background_mode="vector")
+        view.resize(900, 900)
+        # Chart circles are often large, so most clicks land inside several of them
+        populate(view, n, max_circle_radius=400)
+        view.show()
+        QApplication.processEvents()
+
+        def click():
+            # What a mouse press or hover asks the scene for
+            for pos in clicks:
+                view.items(pos)
+
+        def select():
+            # Rubber band of 60x60 device pixels
+            for x, y in bands:
+                path = QPainterPath()
+                path.addRect(QRectF(view.mapToScene(QPoint(int(x), int(y))),
+                                    view.mapToScene(QPoint(int(x) + 60, int(y) + 60))))
+                view.scene.setSelectionArea(path, view.viewportTransform())
+            view.scene.clearSelection()
+
+        results[f"hittest.click.{n // 1000}k"] = _per(measure(click, repeat=3 if quick else 5), len(clicks))
+        results[f"hittest.select.{n // 1000}k"] = _per(measure(select, repeat=3 if quick else 5), len(bands))
+        view.close()
+        view.scene.clear()
+    return results
+
+
+# Grid drawing and snapping across zoom levels
+
+def bench_grid(quick):
+    from core.smith_chart_view import SmithChartView
+
+    results = {}
+    rng = np.random.default_rng(2)
+    frames = 10 if quick else 30
+    view = SmithChartView(background_mode="vector")
+    view.resize(1200, 900)
+    view.show()
+    QApplication.processEvents()
+    view.fitInView(view.bg_item, Qt.KeepAspectRatio)
+    transform = view.chart_transform()
+    # Zoom toward the short-circuit edge, where r circles crowd together
+    target = QPointF(*transform.gamma_to_scene(-0.9, 0.05))
+    for zoom in (1, 4, 16):
+        view.centerOn(target)
+        QApplication.processEvents()
+
+        def paint():
+            for _ in range(frames):
+                view.viewport().repaint()
+
+        visible = view.mapToScene(view.viewport().rect()).boundingRect()
+        gr, gi = transform.scene_to_gamma(rng.uniform(visible.left(), visible.right(), 500),
+                                          rng.uniform(visible.top(), visible.bottom(), 500))
+        snapper = view.snapper()
+        pts = list(zip(gr.tolist(), gi.tolist()))
+
+        def snap():
+            for x, y in pts:
+                snapper.snap(x, y)
+
+        view.viewport().repaint()
+        results[f"grid.paint.x{zoom}"] = _per(measure(paint, repeat=3), frames)
+        results[f"grid.snap.x{zoom}"] = _per(measure(snap, repeat=3 if quick else 5), len(pts))
+        view.scale(4, 4)
+    view.close()
+    return results
+
+
+def bench_trace(quick):
+    from core.trace_item import decimate
+
+    # Noisy 1M-sample sweep over about 100 x 20 item units
+    rng = np.random.default_rng(3)
+    n = 1_000_000
+    t = np.linspace(0, 1, n)
+    points = np.column_stack([100 * t + rng.normal(0, 1, n),
+                              10 + 5 * np.sin(20 * t) + rng.normal(0, 3, n)])
+    results = {}
+    for level in (0, 3):
+        kept = decimate(points, level)
+        columns = len(np.unique(np.floor(points[:, 0] * 2.0 ** level)))
+        assert len(kept) <= 4 * columns + 2, f"level {level}: {len(kept)} samples for {columns} columns"
+        results[f"trace.decimate.1m.L{level}"] = measure(
+            lambda: decimate(points, level), repeat=3 if quick else 5)
+    return results
+
+
+# Readout cache under a hovering cursor
+
+def bench_readout(quick):
+    from utils.readout import ReadoutCache, readout_arrays
+
+    # The cursor rests near a few spots while the chart is zoomed 4x (radius 1600 device
+    # pixels) and scrolled smoothly, so each visit maps to a slightly different Γ
+    rng = np.random.default_rng(4)
+    n = 5000 if quick else 20000
+    spots = rng.uniform(-0.6, 0.6, size=(40, 2))
+    pixel = 1 / 1600
+    hover = spots[rng.integers(0, len(spots), n)] + rng.uniform(-0.3, 0.3, size=(n, 2)) * pixel
+
+    cache = ReadoutCache()
+    rows = np.array([cache.lookup(gr, gi) for gr, gi in hover])
+    exact = readout_arrays(hover[:, 0], hover[:, 1])
+    z_error = np.abs(rows[:, 4] + 1j * rows[:, 5] - (exact[:, 4] + 1j * exact[:, 5])).max()
+    hit_rate = cache.hits / (cache.hits + cache.misses)
+    assert z_error < 0.005, f"cached z off by {z_error:.4f}"
+    assert hit_rate >= 0.8, f"hover hit rate {hit_rate:.2f}"
+
+    def lookups(cache):
+        for gr, gi in hover:
+            cache.lookup(gr, gi)
+
+    return {"readout.hover.lookup": _per(measure(lookups, repeat=3 if quick else 5, setup=ReadoutCache), n)}
+
+
+SUITES = {
+    "snap": bench_snap,
+    "background": bench_background,
+    "scene": bench_scene,
+    "paint": bench_paint,
+    "hittest": bench_hittest,
+    "grid": bench_grid,
+    "trace": bench_trace,
+    "readout": bench_readout,
+}
+
+
+def run(suites, quick=False):
+    results = {}
+    for name in suites:
+        start = time.perf_counter()
+        results.update(SUITES[name](quick))
+        print(f"[{name}] done in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return results
+
+
+def metadata():
+    return {
+        "version": BASELINE_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "qt": QT_VERSION_STR,
+        "pyqt": PYQT_VERSION_STR,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(results, baseline, threshold):
+    """Rows of (name, baseline, current, ratio, status); status is 'regression' above 1 + threshold."""
+    rows = []
+    for name in sorted(set(results) | set(baseline)):
+        old = baseline.get(name, {}).get("median")
+        new = results.get(name, {}).get("median")
+        if old is None or new is None:
+            rows.append((name, old, new, None, "missing" if new is None else "new"))
+            continue
+        ratio = new / old if old > 0 else float("inf")
+        if ratio > 1 + threshold:
+            status = "regression"
+        elif ratio < 1 / (1 + threshold):
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append((name, old, new, ratio, status))
+    return rows
+
+
+def _fmt(seconds):
+    if seconds is None:
+        return "-"
+    for unit, scale in (("s", 1), ("ms", 1e3), ("us", 1e6)):
+        if seconds * scale >= 1:
+            return f"{seconds * scale:.3g} {unit}"
+    return f"{seconds * 1e9:.3g} ns"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite")
+    parser.add_argument("--suite", action="append", choices=sorted(SUITES),
+                        help="run only these suites (repeatable)")
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--save", metavar="PATH", help="write results as a baseline JSON file")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="relative slowdown reported as a regression (default 0.15)")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])  # noqa: F841 (kept alive for the run)
+    results = run(args.suite or list(SUITES), args.quick)
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({"meta": metadata(), "results": results}, f, indent=1, sort_keys=True)
+
+    if not args.compare:
+        for name, result in sorted(results.items()):
+            print(f"{name:28s} {_fmt(result['median']):>10s}  (min {_fmt(result['min'])})")
+        return 0
+
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    if baseline.get("meta", {}).get("machine") != platform.machine():
+        print("warning: baseline was recorded on a different machine type", file=sys.stderr)
+    # Suites that were not run this time are not reported as missing
+    ran = {name.split(".")[0] for name in results}
+    base_results = {k: v for k, v in baseline["results"].items() if k.split(".")[0] in ran}
+
+    regressions = 0
+    for name, old, new, ratio, status in compare(results, base_results, args.threshold):
+        ratio_text = f"{ratio:6.2f}x" if ratio is not None else "      -"
+        print(f"{name:28s} {_fmt(old):>10s} -> {_fmt(new):>10s} {ratio_text}  {status}")
+        regressions += status == "regression"
+    print(f"{regressions} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+from PyQt5.QtGui import QImage, QPainterPath
+from PyQt5.QtCore import QStandardPaths, QFile, QIODevice, QDataStream
+import contextlib
+import hashlib
+import os
+import shutil
+import threading
+import numpy as np
+
+# Bump when the rendering code changes in a way the parameters don't capture
+CACHE_VERSION = 1
+
+
+def default_cache_dir():
+    override = os.environ.get("SMITHCHARTER_CACHE_DIR")
+    if override:
+        return override
+    location = QStandardPaths.writableLocation(QStandardPaths.GenericCacheLocation)
+    if not location:
+        location = os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(location, "SmithCharter")
+
+
+def grid_cache_key(*parts):
+    """Stable hash of the grid parameters: arrays are hashed by dtype, shape and bytes."""
+    h = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            arr = np.ascontiguousarray(part)
+            h.update(f"{arr.dtype.str}{arr.shape}".encode())
+            h.update(arr.tobytes())
+        else:
+            h.update(repr(part).encode())
+        h.update(b"|")
+    return h.hexdigest()[:24]
+
+
+def image_to_array(image):
+    image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+    ptr = image.constBits()
+    ptr.setsize(image.sizeInBytes())
+    arr = np.frombuffer(ptr, dtype=np.uint8).reshape(image.height(), image.bytesPerLine())
+    return arr[:, :image.width() * 4].reshape(image.height(), image.width(), 4).copy()
+
+
+def array_to_image(arr):
+    """Wrap an (H, W, 4) uint8 array as a QImage. The image owns a copy of the pixels."""
+    arr = np.ascontiguousarray(arr)
+    h, w = arr.shape[:2]
+    return QImage(arr.data, w, h, w * 4, QImage.Format_ARGB32_Premultiplied).copy()
+
+
+class BackgroundCache:
+    """Generated chart backgrounds stored under the user cache directory.
+
+    Every entry is named `<kind>-<key>`, where the key hashes everything the
+    rendering depends on. Storing an entry removes older entries of the same kind,
+    so changing the r/x values, colors or resolution invalidates the stale copy.
+    Raster images are kept as .npy files and opened memory-mapped.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory or default_cache_dir()
+
+    def _path(self, kind, key, ext):
+        return os.path.join(self.directory, f"{kind}-{key}{ext}")
+
+    def _ensure_dir(self):
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _drop_stale(self, kind, keep):
+        if not os.path.isdir(self.directory):
+            return
+        prefix = f"{kind}-"
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and not name.startswith(os.path.basename(keep)):
+                path = os.path.join(self.directory, name)
+                try:
+                    if os.path.isdir(path):
+                        shutil.rmtree(path)
+                    else:
+                        os.remove(path)
+                except OSError:
+                    pass
+
+    def _write_atomic(self, path, write):
+        tmp = path + ".tmp"
+        try:
+            write(tmp)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Could not write background cache {path}: {e}")
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    # Raster images
+
+    def load_image(self, kind, key):
+        path = self._path(kind, key, ".npy")
+        if not os.path.exists(path):
+            return None
+        try:
+            return array_to_image(np.load(path, mmap_mode="r"))
+        except (OSError, ValueError):
+            return None
+
+    def save_image(self, kind, key, image):
+        self._ensure_dir()
+        path = self._path(kind, key, ".npy")
+        arr = image_to_array(image)
+
+        def write(tmp):
+            with open(tmp, "wb") as f:
+                np.save(f, arr)
+
+        self._write_atomic(path, write)
+        self._drop_stale(kind, path)
+
+    # Vector paths
+
+    def load_paths(self, kind, key):
+        path = self._path(kind, key, ".qpaths")
+        if not os.path.exists(path):
+            return None
+        f = QFile(path)
+        if not f.open(QIODevice.ReadOnly):
+            return None
+        stream = QDataStream(f)
+        count = stream.readUInt32()
+        paths = []
+        for _ in range(count):
+            p = QPainterPath()
+            stream >> p
+            paths.append(p)
+        ok = stream.status() == QDataStream.Ok
+        f.close()
+        return paths if ok else None
+
+    def save_paths(self, kind, key, paths):
+        self._ensure_dir()
+        path = self._path(kind, key, ".qpaths")
+
+        def write(tmp):
+            f = QFile(tmp)
+            if not f.open(QIODevice.WriteOnly):
+                raise OSError(f.errorString())
+            stream = QDataStream(f)
+            stream.writeUInt32(len(paths))
+            for p in paths:
+                stream << p
+            f.close()
+
+        self._write_atomic(path, write)
+        self._drop_stale(kind, path)
+
+    # Tiles: one directory per key, one memory-mappable .npy per tile
+
+    def tile_store(self, kind, key):
+        directory = self._path(kind, key, "")
+        self._drop_stale(kind, directory)
+        return TileStore(directory)
+
+
+class TileStore:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def _path(self, level, i, j):
+        return os.path.join(self.directory, f"L{level}_{i}_{j}.npy")
+
+    def load(self, level, i, j):
+        path = self._path(level, i, j)
+        if not os.path.exists(path):
+            return None
+        try:
+            return array_to_image(np.load(path, mmap_mode="r"))
+        except (OSError, ValueError):
+            return None
+
+    def save(self, level, i, j, image):
+        # Tiles are written from pool threads and export processes too: write a private
+        # file and rename it into place, so readers never map a half-written tile
+        path = self._path(level, i, j)
+        tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "wb") as f:
+                np.save(f, image_to_array(image))
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Could not write tile cache {self.directory}: {e}")
+            with contextlib.suppress(OSError):
+                os.remove(tmp)
@@ -0,0 +1,155 @@
+"""Headless rendering of Smith charts to PNG / SVG / PDF.
+
+    python main.py export data/*.s2p -o reports --format pdf --jobs 8
+
+Inputs are Touchstone files or .smithsession directories. `--annotations SESSION`
+overlays a saved session (arrows, labels, circles) on every chart. Files are spread
+over a process pool; the parent renders the background grid into the on-disk
+BackgroundCache first, so every worker loads the same cached copy instead of
+rendering its own.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+EXPORT_FORMATS = ("png", "svg", "pdf")
+
+# Per-process state, created once by _init_worker
+_worker = {}
+
+
+def _ensure_app():
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance()
+    if app is None:
+        app = QApplication([sys.argv[0]])
+        # Keep a reference for the life of the process
+        _worker["app"] = app
+    return app
+
+
+def _make_view(background_mode):
+    from core.smith_chart_view import SmithChartView
+    return SmithChartView(background_mode=background_mode)
+
+
+def clear_annotations(view):
+    for item in list(view.scene.items()):
+        if item is not view.bg_item and item.parentItem() is None:
+            view.scene.removeItem(item)
+
+
+def render_view(view, out_path, fmt, size):
+    """Render the chart area of `view`'s scene to `out_path`.
+
+    SVG and PDF are written from vector geometry (core.vector_export); the
+    background image is replaced by the analytic grid.
+    """
+    if fmt in ("svg", "pdf"):
+        from core.vector_export import export_vector
+        export_vector(view, out_path, fmt, size)
+        return
+    if fmt != "png":
+        raise ValueError(f"Unknown export format {fmt!r}")
+
+    from PyQt5.QtGui import QImage, QPainter
+    from PyQt5.QtCore import Qt, QRectF
+
+    view.readouts.flush()
+    source = view.bg_item.sceneBoundingRect()
+    aspect = source.height() / source.width()
+    width, height = size, int(round(size * aspect))
+    image = QImage(width, height, QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.white)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform)
+    view.scene.render(painter, QRectF(0, 0, width, height), source)
+    painter.end()
+    if not image.save(out_path):
+        raise OSError(f"Could not write {out_path}")
+
+
+def _init_worker(background_mode, annotations):
+    _ensure_app()
+    _worker["view"] = _make_view(background_mode)
+    _worker["annotations"] = annotations
+
+
+def export_one(input_path, out_dir, fmt, size):
+    """Render one input with the process's view. Returns (input, output, error)."""
+    from core.session import SessionStore, SESSION_SUFFIX
+
+    view = _worker["view"]
+    clear_annotations(view)
+    name = os.path.basename(os.path.normpath(input_path))
+    stem = name[:-len(SESSION_SUFFIX)] if name.endswith(SESSION_SUFFIX) else os.path.splitext(name)[0]
+    out_path = os.path.join(out_dir, f"{stem}.{fmt}")
+    try:
+        if _worker["annotations"]:
+            SessionStore(_worker["annotations"]).load(view)
+        if os.path.isdir(input_path):
+            SessionStore(input_path).load(view)
+        else:
+            view.import_touchstone(input_path)
+        render_view(view, out_path, fmt, size)
+    except (OSError, ValueError) as e:
+        return input_path, None, str(e)
+    except Exception as e:
+        # Anything else is still this file's failure; the rest of the batch goes on
+        return input_path, None, f"{type(e).__name__}: {e}"
+    return input_path, out_path, None
+
+
+def warm_background_cache(background_mode):
+    """Render the shared background once so workers load it from the disk cache."""
+    _ensure_app()
+    _make_view(background_mode)
+
+
+def run_export(inputs, out_dir, fmt="png", size=1200, jobs=None, background_mode="auto", annotations=None):
+    os.makedirs(out_dir, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+    jobs = max(1, min(jobs, len(inputs)))
+
+    start = time.perf_counter()
+    warm_background_cache(background_mode)
+    tasks = [(path, out_dir, fmt, size) for path in inputs]
+
+    if jobs == 1:
+        _init_worker(background_mode, annotations)
+        results = [export_one(*task) for task in tasks]
+    else:
+        # Qt does not survive fork; every worker starts a fresh interpreter
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(jobs, initializer=_init_worker, initargs=(background_mode, annotations)) as pool:
+            results = pool.starmap(export_one, tasks, chunksize=max(1, len(tasks) // (jobs * 4)))
+
+    elapsed = time.perf_counter() - start
+    return results, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="main.py export", description="Render Smith charts without a window.")
+    parser.add_argument("inputs", nargs="+", help="Touchstone files or .smithsession directories")
+    parser.add_argument("-o", "--out-dir", default="export")
+    parser.add_argument("-f", "--format", choices=EXPORT_FORMATS, default="png")
+    parser.add_argument("-s", "--size", type=int, default=1200, help="output width in pixels/points")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--background", choices=("auto", "image", "vector", "tiled"), default="auto")
+    parser.add_argument("--annotations", help="session whose annotations are drawn on every chart")
+    args = parser.parse_args(argv)
+
+    results, elapsed = run_export(args.inputs, args.out_dir, args.format, args.size,
+                                  args.jobs, args.background, args.annotations)
+    failed = [(path, err) for path, out, err in results if err]
+    for path, err in failed:
+        print(f"failed: {path}: {err}", file=sys.stderr)
+
+    done = len(results) - len(failed)
+    rate = done / elapsed if elapsed > 0 else float("inf")
+    print(f"exported {done}/{len(results)} charts in {elapsed:.2f} s ({rate:.1f} charts/s)")
+    return 1 if failed else 0
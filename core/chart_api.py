@@ -0,0 +1,170 @@
+"""Building charts from code.
+
+ChartBuilder adds annotations in bulk from arrays of Γ (or, with impedance=True,
+normalized impedance) with one style for the whole call or one per item:
+
+    chart = ChartBuilder(view)
+    chart.add_points([0.2 + 0.1j, -0.3j], color="red")
+    chart.add_arrows(z_start, z_end, impedance=True, width=3)
+
+Items are built quiet (no flags, no readout label) and placed before they reach the
+scene, then added together as one undo step with the scene index and the views'
+repaints suspended (see core.undo.suspended_updates). Their readouts are computed
+in one batch, each item is completed with its label, and the index is rebuilt once.
+
+run_script() is the hook for automation and plugins: it runs a Python file's
+`build_chart(chart)` against a view.
+"""
+from PyQt5.QtGui import QColor, QPen, QBrush
+from PyQt5.QtCore import Qt, QPointF
+from core.graphics_items import MovablePoint, StretchableArrowWithHandles, DraggableText, SnapCircleItem
+from core.undo import AddCommand, BULK_INDEX_MIN_ITEMS, suspended_updates
+from utils.geometry import impedance_to_gamma
+from utils.readout import Readout, readout_arrays, format_impedance
+import importlib.util
+import os
+import numpy as np
+
+
+def bulk_insert(view, items, text="Add items", readouts=None):
+    """Add `items` to `view` as one undo step, with updates suspended while they go in.
+
+    `readouts` is (xs, ys, formatter) for items built with quiet=True: each is
+    completed with formatter(readout at its scene point) once it is in the scene.
+    """
+    items = list(items)
+    labels = _label_texts(view, *readouts) if readouts is not None else None
+    with suspended_updates(view.scene, rebuild_index=len(items) >= BULK_INDEX_MIN_ITEMS):
+        view.undo_stack.push(AddCommand(view.scene, items, text))
+        if labels is not None:
+            for item, label in zip(items, labels):
+                item.complete(label)
+    return items
+
+
+def _label_texts(view, xs, ys, formatter):
+    """formatter(readout) for each scene point, computed in one pass without the readout cache."""
+    gr, gi = view.chart_transform().scene_to_gamma(np.asarray(xs, dtype=float), np.asarray(ys, dtype=float))
+    return [formatter(Readout(*row)) for row in readout_arrays(gr, gi).tolist()]
+
+
+def _per_item(value, n, name):
+    """`value` repeated n times, or checked to be n long if it is a list or array."""
+    if isinstance(value, (list, np.ndarray)):
+        if len(value) != n:
+            raise ValueError(f"{name} has {len(value)} values for {n} items")
+        return list(value)
+    return [value] * n
+
+
+def _colors(color, n):
+    """One QColor per item; equal colors share a QColor."""
+    colors = {}
+    result = []
+    for c in _per_item(color, n, "color"):
+        key = c.rgba() if isinstance(c, QColor) else c
+        q = colors.get(key)
+        if q is None:
+            q = colors[key] = QColor(c)
+        result.append(q)
+    return result
+
+
+def _circle_label(readout):
+    return SnapCircleItem.circle_label(readout.gr, readout.gi)
+
+
+class ChartBuilder:
+    """Bulk, scriptable counterpart of the view's add_* buttons.
+
+    Positions are arrays of complex Γ (or normalized impedance with impedance=True).
+    Every add_* call returns the new items and can be undone in one step.
+    """
+
+    def __init__(self, view):
+        self.view = view
+
+    def _scene_xy(self, values, impedance):
+        values = np.atleast_1d(np.asarray(values, dtype=complex))
+        gamma = impedance_to_gamma(values) if impedance else values
+        xs, ys = self.view.chart_transform().complex_to_scene(gamma)
+        return xs.tolist(), ys.tolist()
+
+    def add_points(self, positions, radius=5, color=Qt.red, impedance=False):
+        """Points at `positions`; `radius` is in scene units, as for the Add Point button."""
+        xs, ys = self._scene_xy(positions, impedance)
+        n = len(xs)
+        brushes = {}
+        points = []
+        for x, y, r, c in zip(xs, ys, _per_item(radius, n, "radius"), _colors(color, n)):
+            brush = brushes.get(c.rgba())
+            if brush is None:
+                brush = brushes[c.rgba()] = QBrush(c)
+            point = MovablePoint(float(r), quiet=True)
+            point.setBrush(brush)
+            point.setPos(x, y)
+            points.append(point)
+        return bulk_insert(self.view, points, "Add points", (xs, ys, format_impedance))
+
+    def add_arrows(self, starts, ends, color=Qt.blue, width=2, impedance=False):
+        x1, y1 = self._scene_xy(starts, impedance)
+        x2, y2 = self._scene_xy(ends, impedance)
+        if len(x1) != len(x2):
+            raise ValueError(f"{len(x1)} arrow starts for {len(x2)} ends")
+        n = len(x1)
+        arrows = []
+        for a, b, c, d, q, w in zip(x1, y1, x2, y2, _colors(color, n), _per_item(width, n, "width")):
+            arrow = StretchableArrowWithHandles((a, b), (c, d), quiet=True)
+            arrow.setPen(QPen(q, float(w)))
+            arrows.append(arrow)
+        return bulk_insert(self.view, arrows, "Add arrows", (x2, y2, format_impedance))
+
+    def add_texts(self, positions, texts, color=Qt.black, font_size=None, impedance=False):
+        xs, ys = self._scene_xy(positions, impedance)
+        n = len(xs)
+        items = []
+        for x, y, text, q, size in zip(xs, ys, _per_item(texts, n, "texts"), _colors(color, n),
+                                       _per_item(font_size, n, "font_size")):
+            item = DraggableText(str(text))
+            if size is not None:
+                font = item.font()
+                font.setPointSizeF(float(size))
+                item.setFont(font)
+            item.setDefaultTextColor(q)
+            item.setPos(x, y)
+            items.append(item)
+        return bulk_insert(self.view, items, "Add texts")
+
+    def add_circles(self, centers, radii, color=Qt.black, width=2, impedance=False):
+        """Circles around `centers`; `radii` are in Γ units either way."""
+        centers = np.atleast_1d(np.asarray(centers, dtype=complex))
+        if impedance:
+            centers = impedance_to_gamma(centers)
+        n = len(centers)
+        radii = np.asarray(_per_item(radii, n, "radii"), dtype=float)
+        xs, ys = self._scene_xy(centers, False)
+        rx, ry = self._scene_xy(centers + radii, False)
+        circles = []
+        for a, b, c, d, q, w in zip(xs, ys, rx, ry, _colors(color, n), _per_item(width, n, "width")):
+            circle = SnapCircleItem(quiet=True)
+            circle.setPen(QPen(q, float(w)))
+            circle.set_handles(QPointF(a, b), QPointF(c, d))
+            # The outline comes from the known center and radius, not update_circle()
+            r = float(np.hypot(c - a, d - b))
+            circle.setRect(a - r, b - r, 2 * r, 2 * r)
+            circles.append(circle)
+        return bulk_insert(self.view, circles, "Add circles", (xs, ys, _circle_label))
+
+
+def run_script(view, path):
+    """Run `build_chart(chart)` from the Python file at `path` with a ChartBuilder on `view`."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(f"smithcharter_script_{name}", path)
+    if spec is None:
+        raise ValueError(f"{path} is not a Python file")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    build_chart = getattr(module, "build_chart", None)
+    if not callable(build_chart):
+        raise ValueError(f"{os.path.basename(path)} does not define build_chart(chart)")
+    return build_chart(ChartBuilder(view))
@@ -0,0 +1,75 @@
+from PyQt5.QtWidgets import QGraphicsPixmapItem
+from PyQt5.QtGui import QPixmap
+from core.smith_grid_item import SmithGridItem
+from core.tiled_background_item import TiledBackgroundItem
+from core.background_cache import BackgroundCache
+from utils.smith_snap import GridLevels, default_snapper
+from utils.readout import ReadoutCache
+import os
+import sys
+
+
+def resource_path(relative_path):
+    """ Get absolute path to resource, works for dev and for PyInstaller """
+    if hasattr(sys, '_MEIPASS'):
+        return os.path.join(sys._MEIPASS, relative_path)
+    return os.path.join(os.path.abspath("."), relative_path)
+
+
+class ChartResources:
+    """Background and snapping resources shared by every chart view in a workspace.
+
+    The first request for a background mode builds it (tile pyramid, vector paths or
+    pixmap); later requests get a new lightweight item over the same data, so
+    another view costs a scene and a few items rather than a second copy of the
+    background. All views share one memo of label readouts, and snap through the
+    Γ-plane index in `snapper` (raster backgrounds) or the per-level snappers of
+    `grid_levels` (generated grids, which adapt to the zoom).
+    """
+
+    def __init__(self, tile_cache_mb=64, background_cache=None, snapper=default_snapper, grid_levels=None):
+        self.tile_cache_mb = tile_cache_mb
+        self.background_cache = background_cache if background_cache is not None else BackgroundCache()
+        self.snapper = snapper
+        self.grid_levels = grid_levels or GridLevels()
+        self.readout_cache = ReadoutCache()
+        self._prototypes = {}
+
+    def background_item(self, mode, matplotlib_pixmap=None):
+        """A new background item for `mode`, sharing data with earlier items of that mode.
+
+        "auto" shows the bundled PNG as a tile pyramid and falls back to the vector
+        grid, "image" / "vector" force one of them, "tiled" tiles whichever source is
+        available, "matplotlib" uses `matplotlib_pixmap()` for the legacy raster.
+        """
+        bg_path = resource_path("resources/smith_chart_bg.png")
+        if mode == "auto":
+            mode = "tiled" if os.path.exists(bg_path) else "vector"
+        if mode == "image" and not os.path.exists(bg_path):
+            print("Image not found, drawing vector Smith chart grid...")
+            mode = "vector"
+
+        prototype = self._prototypes.get(mode)
+        if prototype is None:
+            prototype = self._build(mode, bg_path, matplotlib_pixmap)
+            self._prototypes[mode] = prototype
+
+        if isinstance(prototype, QPixmap):
+            # QPixmap is implicitly shared; items only hold a reference
+            return QGraphicsPixmapItem(prototype)
+        return prototype.shared_copy()
+
+    def _build(self, mode, bg_path, matplotlib_pixmap):
+        if mode == "tiled":
+            if os.path.exists(bg_path):
+                return TiledBackgroundItem.from_pixmap_file(bg_path, cache_limit_mb=self.tile_cache_mb)
+            grid = SmithGridItem(cache=self.background_cache, grid_levels=self.grid_levels)
+            return TiledBackgroundItem.from_grid(grid, cache_limit_mb=self.tile_cache_mb)
+        if mode == "vector":
+            return SmithGridItem(cache=self.background_cache, grid_levels=self.grid_levels)
+        if mode == "matplotlib":
+            return matplotlib_pixmap()
+        return QPixmap(bg_path)
+
+    def cache_bytes(self):
+        return sum(p.cache_bytes() for p in self._prototypes.values() if isinstance(p, TiledBackgroundItem))
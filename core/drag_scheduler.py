@@ -0,0 +1,88 @@
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtGui import QGuiApplication
+import time
+
+
+class DragUpdateScheduler(QObject):
+    """Coalesces handle drags so snapping and dependent geometry run once per frame.
+
+    Handles report the latest mouse position with schedule_move(); only the newest
+    position per handle survives until the next frame. While a frame is applied,
+    owners ask for their geometry refresh through defer(), so a circle whose center
+    and radius handles both moved is recomputed once instead of three times.
+    """
+
+    frame_applied = pyqtSignal()
+
+    def __init__(self, parent=None, fps=None):
+        super().__init__(parent)
+        if fps is None:
+            screen = QGuiApplication.primaryScreen()
+            fps = screen.refreshRate() if screen is not None else 60
+        self.frame_ms = 1000.0 / max(1.0, fps or 60)
+
+        self._pending = {}
+        self._deferred = {}
+        self._first_request = None
+        self._last_flush = 0.0
+        self.in_flush = False
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+        # Stats of the last applied frame, for the debug overlay
+        self.moves_requested = 0
+        self.last_frame_moves = 0
+        self.last_frame_updates = 0
+        self.last_latency_ms = 0.0
+        self.frames = 0
+
+    def schedule_move(self, handle, pos):
+        now = time.perf_counter()
+        if self._first_request is None:
+            self._first_request = now
+        self._pending[handle] = pos
+        self.moves_requested += 1
+
+        if not self._timer.isActive():
+            since_last = (now - self._last_flush) * 1000
+            self._timer.start(int(max(0.0, self.frame_ms - since_last)))
+
+    def defer(self, owner, method, *args):
+        """Run owner.method(*args) at the end of the current frame (latest args win)."""
+        self._deferred[(owner, method, args[:1])] = args
+
+    def flush(self):
+        self._timer.stop()
+        if not self._pending:
+            return
+
+        pending = self._pending
+        self._pending = {}
+        moves = self.moves_requested
+        self.moves_requested = 0
+
+        self.in_flush = True
+        try:
+            for handle, pos in pending.items():
+                handle.apply_drag(pos)
+            deferred = self._deferred
+            self._deferred = {}
+            for (owner, method, _), args in deferred.items():
+                getattr(owner, method)(*args)
+        finally:
+            self.in_flush = False
+
+        now = time.perf_counter()
+        self.last_frame_moves = moves
+        self.last_frame_updates = len(pending) + len(deferred)
+        self.last_latency_ms = (now - self._first_request) * 1000
+        self._first_request = None
+        self._last_flush = now
+        self.frames += 1
+        self.frame_applied.emit()
+
+    def overlay_text(self):
+        return (f"drag: {self.last_frame_moves} moves -> {self.last_frame_updates} updates/frame, "
+                f"latency {self.last_latency_ms:.1f} ms, frame {self.frame_ms:.1f} ms")
@@ -4,20 +4,158 @@ from PyQt5.QtWidgets import (
     QGraphicsScene, QGraphicsView,
     QGraphicsSimpleTextItem, QColorDialog
 )
-from PyQt5.QtGui import QBrush, QPen, QColor, QFont
+from PyQt5.QtGui import QBrush, QPen, QColor, QFont, QPainterPath
 from PyQt5.QtCore import Qt, QPointF, QTimer, QRectF
-from utils.smith_snap import snap_to_smith
+from PyQt5 import sip
+from utils.smith_snap import default_snapper
+from core.undo import PropertyCommand, DeleteCommand
+from utils.readout import Readout, readout_arrays, format_impedance
 import numpy as np
+import weakref
+
+
+def chart_transform_for(item):
+    """The Γ <-> scene transform of the view showing `item`, or None."""
+    scene = item.scene()
+    if scene is None:
+        return None
+    for view in scene.views():
+        if hasattr(view, 'chart_transform'):
+            return view.chart_transform()
+    return None
+
+
+# Cache policy for annotations. Shapes are cached in device pixels (re-rendered
+# only when the zoom changes or the item is edited); text is cached in item
+# coordinates, so zooming just rescales the pixmap instead of re-laying out text.
+# Qt drops an item's cache on update(), which every setter used on edit calls.
+# Device caches must be re-rendered at every new zoom, so the view suspends them
+# for the length of a zoom gesture (set_static_caching).
+STATIC_CACHE_MODE = QGraphicsItem.DeviceCoordinateCache
+TEXT_CACHE_MODE = QGraphicsItem.ItemCoordinateCache
+
+# Every item created with STATIC_CACHE_MODE, so a zoom gesture toggles just these
+# instead of walking all scene items
+_static_cached = weakref.WeakSet()
+
+
+def _cache_statically(item):
+    item.setCacheMode(STATIC_CACHE_MODE)
+    _static_cached.add(item)
+
+# Extra scene units around an outline that still count as a hit on it
+HIT_TOLERANCE = 3.0
+
+
+def _view_attribute(item, name):
+    scene = item.scene()
+    if scene is None:
+        return None
+    for view in scene.views():
+        value = getattr(view, name, None)
+        if value is not None:
+            return value
+    return None
+
+
+def drag_scheduler_for(item):
+    return _view_attribute(item, 'drag_scheduler')
+
+
+def instrumentation_for(item):
+    return _view_attribute(item, 'instrumentation')
+
+
+def push_command(item, command):
+    """Run an undoable command through the view's undo stack (or just run it)."""
+    stack = _view_attribute(item, 'undo_stack')
+    if stack is None:
+        command.redo()
+    else:
+        stack.push(command)
+
+
+def request_update(item, owner, method, *args):
+    """Call owner.method(*args) now, or once at the end of the drag frame being applied."""
+    instrumentation = instrumentation_for(item)
+    if instrumentation is not None:
+        instrumentation.count('handle_updates')
+    scheduler = drag_scheduler_for(item)
+    if scheduler is not None and scheduler.in_flush:
+        scheduler.defer(owner, method, *args)
+    else:
+        getattr(owner, method)(*args)
+
+
+def readout_label(parent, text=""):
+    """Child text item for a readout.
+
+    Left uncached: a short simple text draws from the glyph cache faster than
+    a per-item pixmap is blitted, and its text only changes on a flush.
+    """
+    label = QGraphicsSimpleTextItem(text, parent)
+    label.setBrush(QBrush(Qt.darkBlue))
+    label.setZValue(1)
+    return label
+
+
+def request_readout(item, label, pos, formatter):
+    """Set label to formatter(readout at scene `pos`), batched through the view's ReadoutService."""
+    service = _view_attribute(item, 'readouts')
+    if service is not None:
+        service.request(label, pos, formatter)
+        return
+    transform = chart_transform_for(item)
+    if transform is None:
+        label.setText("")
+        return
+    gr, gi = transform.scene_to_gamma(pos.x(), pos.y())
+    label.setText(formatter(Readout(*readout_arrays(gr, gi)[0])))
+
+
+def snap_scene_pos(item, pos):
+    transform = chart_transform_for(item)
+    if transform is None:
+        return pos
+    view_snapper = _view_attribute(item, 'snapper')
+    snapper = view_snapper() if view_snapper is not None else default_snapper
+    instrumentation = instrumentation_for(item)
+    if instrumentation is None:
+        x, y = transform.snap_scene(pos.x(), pos.y(), snapper)
+    else:
+        with instrumentation.section('snap'):
+            x, y = transform.snap_scene(pos.x(), pos.y(), snapper)
+    return QPointF(x, y)
+
+
+# Annotations built with quiet=True (see core.chart_api.ChartBuilder) have no flags
+# and no readout label: positioning and inserting them runs no Python itemChange()
+# for moves and queues no readouts. complete(text) adds both once they are in place.
 
 class MovablePoint(QGraphicsEllipseItem):
-    def __init__(self, radius):
+    FLAGS = QGraphicsItem.ItemIsMovable | QGraphicsItem.ItemIsSelectable | QGraphicsItem.ItemSendsGeometryChanges
+
+    def __init__(self, radius, quiet=False):
         super().__init__(-radius, -radius, 2*radius, 2*radius)
         self.setBrush(QBrush(Qt.red))
-        self.setFlags(self.ItemIsMovable | self.ItemIsSelectable)
-        self.label = QGraphicsSimpleTextItem("")
-        self.label.setParentItem(self)
-        self.label.setBrush(QBrush(Qt.darkBlue))
-        self.label.setZValue(1)
+        _cache_statically(self)
+        self.label = None
+        if not quiet:
+            self.complete()
+
+    def complete(self, text=""):
+        rect = self.rect()
+        self.label = readout_label(self, text)
+        self.label.setPos(rect.right() + 2, rect.top() - 14)
+        self.setFlags(self.FLAGS)
+
+    def itemChange(self, change, value):
+        if change == QGraphicsItem.ItemPositionHasChanged or change == QGraphicsItem.ItemSceneHasChanged:
+            if self.label is not None and self.scene():
+                request_readout(self, self.label, self.pos(), format_impedance)
+        # QGraphicsItem.itemChange() only returns `value`; calling it through sip costs
+        # as much as the rest of this method, and Qt calls this several times per insert
+        return value
 
     def contextMenuEvent(self, event):
         menu = QMenu()
@@ -26,11 +164,14 @@ class MovablePoint(QGraphicsEllipseItem):
         selected = menu.exec_(event.screenPos())
 
         if selected == delete_action:
-            self.scene().removeItem(self)
+            push_command(self, DeleteCommand(self.scene(), self.scene_items()))
         elif selected == color_action:
             color = QColorDialog.getColor()
             if color.isValid():
-                self.setBrush(QBrush(color))
+                push_command(self, PropertyCommand(self, 'setBrush', self.brush(), QBrush(color), "Change color"))
+
+    def scene_items(self):
+        return [self]
 
 class DraggableText(QGraphicsTextItem):
     def __init__(self, text):
@@ -54,6 +195,7 @@ class DraggableText(QGraphicsTextItem):
 
         self.base_width = 150
         self.setTextWidth(self.base_width)
+        self.setCacheMode(TEXT_CACHE_MODE)
 
     def paint(self, painter, option, widget):
         super().paint(painter, option, widget)
@@ -80,6 +222,7 @@ class DraggableText(QGraphicsTextItem):
             )
             if handle_rect.contains(event.pos()):
                 self.resizing = True
+                self._size_before_resize = self.text_size()
                 event.accept()
                 return
 
@@ -87,30 +230,37 @@ class DraggableText(QGraphicsTextItem):
 
     def mouseMoveEvent(self, event):
         if self.resizing:
-            # delta_x controls width
-            delta_x = max(30, event.pos().x())
-            delta_y = max(20, event.pos().y())
-
-            # Update text width first
-            self.setTextWidth(delta_x)
-
-            # Scale font size based on width scaling
-            scale_ratio = delta_x / self.base_width
-            new_font_size = max(self.min_font_size, self.default_font_size * scale_ratio)
-
-            font = self.font()
-            font.setPointSizeF(new_font_size)
-            self.setFont(font)
-
-            self.update()
+            # Relayout is expensive; coalesce it to one per frame when the view schedules drags
+            scheduler = drag_scheduler_for(self)
+            if scheduler is None:
+                self.apply_drag(event.pos())
+            else:
+                scheduler.schedule_move(self, event.pos())
             event.accept()
             return
 
         super().mouseMoveEvent(event)
 
+    def apply_drag(self, pos):
+        # delta_x controls width
+        delta_x = max(30, pos.x())
+
+        # Scale font size based on width scaling
+        scale_ratio = delta_x / self.base_width
+        new_font_size = max(self.min_font_size, self.default_font_size * scale_ratio)
+        if (delta_x, new_font_size) == self.text_size():
+            return
+        self.set_text_size((delta_x, new_font_size))
+
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.LeftButton and self.resizing:
+            scheduler = drag_scheduler_for(self)
+            if scheduler is not None:
+                scheduler.flush()
             self.resizing = False
+            if self.text_size() != self._size_before_resize:
+                push_command(self, PropertyCommand(
+                    self, 'set_text_size', self._size_before_resize, self.text_size(), "Resize text"))
             event.accept()
             return
 
@@ -123,70 +273,141 @@ class DraggableText(QGraphicsTextItem):
         selected = menu.exec_(event.screenPos())
 
         if selected == delete_action:
-            self.scene().removeItem(self)
+            push_command(self, DeleteCommand(self.scene(), self.scene_items()))
         elif selected == color_action:
             color = QColorDialog.getColor()
             if color.isValid():
-                self.setDefaultTextColor(color)
+                push_command(self, PropertyCommand(
+                    self, 'setDefaultTextColor', self.defaultTextColor(), color, "Change color"))
+
+    def scene_items(self):
+        return [self]
+
+    def text_size(self):
+        return self.textWidth(), self.font().pointSizeF()
+
+    def set_text_size(self, size):
+        width, font_size = size
+        self.setTextWidth(width)
+        font = self.font()
+        font.setPointSizeF(font_size)
+        self.setFont(font)
 
 
 class StretchHandle(QGraphicsEllipseItem):
-    def __init__(self, parent_object, which_end):
-        super().__init__(-5, -5, 10, 10)
+    # A child of the item it edits: it enters and leaves the scene with its owner.
+    # Owners stay at the scene origin, so handle positions are scene positions.
+    FLAGS = QGraphicsItem.ItemIsMovable | QGraphicsItem.ItemSendsGeometryChanges
+
+    def __init__(self, parent_object, which_end, quiet=False):
+        super().__init__(-5, -5, 10, 10, parent_object)
         self.setBrush(QBrush(Qt.green))
-        self.setFlags(QGraphicsItem.ItemIsMovable | QGraphicsItem.ItemSendsGeometryChanges)
+        if not quiet:
+            self.setFlags(self.FLAGS)
         self.parent_object = parent_object
         self.which_end = which_end
+        self._drag_offset = None
+        self._restoring = False
+
+    # Drags go through the view's DragUpdateScheduler when there is one: mouse moves
+    # only record the target and the snap + geometry update runs once per frame.
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._drag_offset = self.pos() - event.scenePos()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        scheduler = drag_scheduler_for(self)
+        if scheduler is None or self._drag_offset is None:
+            super().mouseMoveEvent(event)
+            return
+        scheduler.schedule_move(self, event.scenePos() + self._drag_offset)
+        event.accept()
+
+    def mouseReleaseEvent(self, event):
+        scheduler = drag_scheduler_for(self)
+        if scheduler is not None:
+            scheduler.flush()
+        self._drag_offset = None
+        super().mouseReleaseEvent(event)
+
+    def apply_drag(self, pos):
+        self.setPos(pos)
+
+    def restore_pos(self, pos):
+        """Move to a previously recorded position without snapping it again (undo/redo)."""
+        self._restoring = True
+        try:
+            self.setPos(pos)
+        finally:
+            self._restoring = False
+
+    def dependent_items(self):
+        """Items this handle drags along, so undo can restore their exact positions."""
+        if self.which_end == 'center' and getattr(self.parent_object, 'radius_handle', None) is not None:
+            return [self.parent_object.radius_handle]
+        return []
+
+    def _snapped(self, pos):
+        return pos if self._restoring else snap_scene_pos(self, pos)
 
     def itemChange(self, change, value):
         if change == QGraphicsItem.ItemPositionChange:
             if self.which_end == 'center':
-                from utils.smith_snap import snap_to_smith
-                snap_x, snap_y = snap_to_smith(value.x(), value.y())
-                snapped = QPointF(snap_x, snap_y)
+                snapped = self._snapped(value)
 
                 if hasattr(self.parent_object, 'move_radius_with_center'):
                     if hasattr(self.parent_object, 'radius_handle') and self.parent_object.radius_handle is not None:
                         delta = snapped - self.pos()
-                        self.parent_object.move_radius_with_center(delta)
+                        self.parent_object.move_radius_with_center(delta, snap=not self._restoring)
 
                 return snapped
 
             elif self.which_end == 'radius':
-                from utils.smith_snap import snap_to_smith
-                snap_x, snap_y = snap_to_smith(value.x(), value.y())
-                snapped = QPointF(snap_x, snap_y)
+                snapped = self._snapped(value)
 
                 if hasattr(self.parent_object, 'update_circle'):
-                    self.parent_object.update_circle()
+                    request_update(self, self.parent_object, 'update_circle')
 
                 return snapped
 
             elif self.which_end in ['start', 'end']:
-                from utils.smith_snap import snap_to_smith
-                snap_x, snap_y = snap_to_smith(value.x(), value.y())
-                snapped = QPointF(snap_x, snap_y)
+                snapped = self._snapped(value)
 
                 if hasattr(self.parent_object, 'update_line'):
-                    self.parent_object.update_line(self.which_end, snapped)
+                    request_update(self, self.parent_object, 'update_line', self.which_end, snapped)
 
                 return snapped
 
-        return super().itemChange(change, value)
+            elif self.which_end == 'load':
+                return self._snapped(value)
+
+        elif change == QGraphicsItem.ItemPositionHasChanged and self.which_end in ['center', 'radius']:
+            # Labels depend on the final (snapped) position, which only exists now
+            if hasattr(self.parent_object, 'update_circle'):
+                request_update(self, self.parent_object, 'update_circle')
+
+        elif change == QGraphicsItem.ItemPositionHasChanged and self.which_end == 'load':
+            request_update(self, self.parent_object, 'update_path')
+
+        # As in MovablePoint: the base implementation only returns `value`
+        return value
 
 
 class StretchableArrowWithHandles(QGraphicsLineItem):
-    def __init__(self, start, end):
+    FLAGS = (QGraphicsItem.ItemIsSelectable |
+             QGraphicsItem.ItemSendsScenePositionChanges |
+             QGraphicsItem.ItemSendsGeometryChanges)
+
+    def __init__(self, start, end, quiet=False):
         super().__init__(*start, *end)
         self.setPen(QPen(Qt.blue, 2))
-        self.setFlags(
-            QGraphicsItem.ItemIsSelectable |
-            QGraphicsItem.ItemSendsScenePositionChanges |
-            QGraphicsItem.ItemSendsGeometryChanges
-        )
+        _cache_statically(self)
 
-        self.start_handle = StretchHandle(self, 'start')
-        self.end_handle = StretchHandle(self, 'end')
+        self.end_label = None
+        # The line is already where the handles go: place them before they send changes
+        self.start_handle = StretchHandle(self, 'start', quiet=True)
+        self.end_handle = StretchHandle(self, 'end', quiet=True)
 
         self.start_handle.setPos(QPointF(*start))
         self.end_handle.setPos(QPointF(*end))
@@ -194,24 +415,40 @@ class StretchableArrowWithHandles(QGraphicsLineItem):
         # Initially hide handles
         self.start_handle.setVisible(False)
         self.end_handle.setVisible(False)
+        if not quiet:
+            self.complete()
+
+    def complete(self, text=""):
+        end = self.line().p2()
+        self.end_label = readout_label(self, text)
+        self.end_label.setPos(end.x() + 6, end.y() + 4)
+        self.setFlags(self.FLAGS)
+        self.start_handle.setFlags(StretchHandle.FLAGS)
+        self.end_handle.setFlags(StretchHandle.FLAGS)
 
     def add_to_scene(self, scene):
         scene.addItem(self)
-        scene.addItem(self.start_handle)
-        scene.addItem(self.end_handle)
 
     def update_line(self, which, pos):
         if which == 'start':
             self.setLine(pos.x(), pos.y(), self.line().x2(), self.line().y2())
         elif which == 'end':
             self.setLine(self.line().x1(), self.line().y1(), pos.x(), pos.y())
+            self.update_label()
+
+    def update_label(self):
+        end = self.line().p2()
+        self.end_label.setPos(end.x() + 6, end.y() + 4)
+        request_readout(self, self.end_label, end, format_impedance)
 
     def itemChange(self, change, value):
         if change == QGraphicsItem.ItemSelectedChange:
             selected = bool(value)
             self.start_handle.setVisible(selected)
             self.end_handle.setVisible(selected)
-        return super().itemChange(change, value)
+        elif change == QGraphicsItem.ItemSceneHasChanged and self.end_label is not None and self.scene():
+            self.update_label()
+        return value
 
     def contextMenuEvent(self, event):
         menu = QMenu()
@@ -220,22 +457,23 @@ class StretchableArrowWithHandles(QGraphicsLineItem):
         selected = menu.exec_(event.screenPos())
 
         if selected == delete_action:
-            scene = self.scene()
-            scene.removeItem(self)
-            scene.removeItem(self.start_handle)
-            scene.removeItem(self.end_handle)
+            push_command(self, DeleteCommand(self.scene(), self.scene_items()))
         elif selected == color_action:
             color = QColorDialog.getColor()
             if color.isValid():
-                self.setPen(QPen(color, 2))
+                push_command(self, PropertyCommand(self, 'setPen', self.pen(), QPen(color, 2), "Change color"))
+
+    def scene_items(self):
+        return [self]
 
 
 class SnapCircleItem(QGraphicsEllipseItem):
-    def __init__(self):
+    def __init__(self, quiet=False):
+        self._shape = None
         super().__init__()
         self.setPen(QPen(Qt.darkMagenta, 2))
         self.setBrush(QBrush(QColor(255, 255, 255, 0)))
-        self.setFlags(QGraphicsItem.ItemIsSelectable)
+        _cache_statically(self)
 
         self.true_radius = 50
         self.unit_vector = QPointF(1, 0)
@@ -243,27 +481,42 @@ class SnapCircleItem(QGraphicsEllipseItem):
         self.center_handle = None
         self.radius_handle = None
 
-        self.label = QGraphicsSimpleTextItem("", self)
-        self.label.setBrush(QBrush(Qt.darkBlue))
-        self.label.setZValue(1)
+        self.label = None
+        if not quiet:
+            self.complete()
 
-    def add_to_scene(self, scene):
-        self.center_handle = StretchHandle(self, 'center')
-        self.radius_handle = StretchHandle(self, 'radius')
-
-        self.center_handle.setPos(QPointF(200, 200))
-        self.radius_handle.setPos(QPointF(250, 200))
+    def complete(self, text=""):
+        """Add the label and flags; a quiet circle needs its handles and rect set first."""
+        self.label = readout_label(self, text)
+        self.setFlags(QGraphicsItem.ItemIsSelectable)
+        if self.center_handle is not None:
+            self._place_label()
+            self.center_handle.setFlags(StretchHandle.FLAGS)
+            self.radius_handle.setFlags(StretchHandle.FLAGS)
 
+    def add_to_scene(self, scene, center=QPointF(200, 200), radius_pos=QPointF(250, 200)):
+        self.set_handles(center, radius_pos)
         scene.addItem(self)
-        scene.addItem(self.center_handle)
-        scene.addItem(self.radius_handle)
-
         self.update_circle()
 
-    def move_radius_with_center(self, delta):
+    def set_handles(self, center, radius_pos):
+        """Create the handles at `center` and `radius_pos`; call update_circle() once in a scene."""
+        self.center_handle = StretchHandle(self, 'center', quiet=True)
+        self.radius_handle = StretchHandle(self, 'radius', quiet=True)
+
+        self.center_handle.setPos(center)
+        self.radius_handle.setPos(radius_pos)
+        if self.label is not None:
+            self.center_handle.setFlags(StretchHandle.FLAGS)
+            self.radius_handle.setFlags(StretchHandle.FLAGS)
+
+    def move_radius_with_center(self, delta, snap=True):
         if self.center_handle and self.radius_handle:
-            self.radius_handle.setPos(self.radius_handle.pos() + delta)
-            self.update_circle()
+            if snap:
+                self.radius_handle.setPos(self.radius_handle.pos() + delta)
+            else:
+                self.radius_handle.restore_pos(self.radius_handle.pos() + delta)
+            request_update(self, self, 'update_circle')
 
     def update_circle(self):
         if not (self.center_handle and self.radius_handle):
@@ -278,19 +531,27 @@ class SnapCircleItem(QGraphicsEllipseItem):
 
         self.setRect(c.x() - radius, c.y() - radius, 2 * radius, 2 * radius)
 
-        # Update label
-        if abs(c.y()) < 0.1:
-            r_val = c.x() / (1 - c.x()) if (1 - c.x()) != 0 else 0
-            label = f"r = {r_val:.2f}" if r_val >= 0 else ""
-        elif abs(c.x() - 1) < 0.1:
-            x_val = 1 / abs(c.y()) if c.y() != 0 else 0
-            sign = '+' if c.y() > 0 else '-'
-            label = f"x = {sign}{x_val:.2f}"
-        else:
-            label = ""
+        # Label from the center in Γ coordinates
+        request_readout(self, self.label, c, self._center_label)
+        self._place_label()
+
+    def _place_label(self):
+        rect = self.rect()
+        self.label.setPos(rect.center().x() + 0.55 * rect.width(), rect.center().y())
+
+    def _center_label(self, readout):
+        return self.circle_label(readout.gr, readout.gi)
 
-        self.label.setText(label)
-        self.label.setPos(c.x() + radius * 1.1, c.y())
+    @staticmethod
+    def circle_label(gx, gy, threshold=0.1):
+        if abs(gy) < threshold:
+            r_val = gx / (1 - gx) if (1 - gx) != 0 else 0
+            return f"r = {r_val:.2f}" if r_val >= 0 else ""
+        if abs(gx - 1) < threshold:
+            x_val = 1 / abs(gy) if gy != 0 else 0
+            sign = '+' if gy > 0 else '-'
+            return f"x = {sign}{x_val:.2f}"
+        return ""
 
     def move_center(self, new_center_pos):
         if self.center_handle and self.radius_handle:
@@ -310,13 +571,40 @@ class SnapCircleItem(QGraphicsEllipseItem):
         selected = menu.exec_(event.screenPos())
 
         if selected == delete_action:
-            scene = self.scene()
-            scene.removeItem(self)
-            if self.center_handle:
-                scene.removeItem(self.center_handle)
-            if self.radius_handle:
-                scene.removeItem(self.radius_handle)
+            push_command(self, DeleteCommand(self.scene(), self.scene_items()))
         elif selected == color_action:
             color = QColorDialog.getColor()
             if color.isValid():
-                self.setPen(QPen(color, 2))
+                push_command(self, PropertyCommand(self, 'setPen', self.pen(), QPen(color, 2), "Change color"))
+
+    def scene_items(self):
+        return [self]
+
+    # Only the outline is hit-testable, so clicks and rubber bands inside a large
+    # circle reach the items under it. The ring is cached: the scene index asks for
+    # it once per candidate on every hit test.
+    def shape(self):
+        if self._shape is None:
+            rect = self.rect()
+            half = self.pen().widthF() / 2 + HIT_TOLERANCE
+            self._shape = QPainterPath()
+            self._shape.addEllipse(rect.adjusted(-half, -half, half, half))
+            if rect.width() > 2 * half:
+                self._shape.addEllipse(rect.adjusted(half, half, -half, -half))
+        return self._shape
+
+    def setRect(self, *rect):
+        self._shape = None
+        super().setRect(*rect)
+
+    def setPen(self, pen):
+        self._shape = None
+        super().setPen(pen)
+
+
+def set_static_caching(scene, enabled):
+    """Switch the cached annotation shapes in `scene` between STATIC_CACHE_MODE and NoCache."""
+    mode = STATIC_CACHE_MODE if enabled else QGraphicsItem.NoCache
+    for item in list(_static_cached):
+        if not sip.isdeleted(item) and item.scene() is scene:
+            item.setCacheMode(mode)
@@ -0,0 +1,119 @@
+from collections import deque
+from contextlib import contextmanager
+import csv
+import json
+import time
+import numpy as np
+
+# Per-frame columns, in export order
+FRAME_FIELDS = ("frame", "t_ms", "paint_ms", "items", "snap_calls", "snap_ms",
+                "wheel_calls", "wheel_ms", "handle_updates")
+
+
+class Instrumentation:
+    """Opt-in per-frame timing and counters for the chart view.
+
+    Hot paths wrap themselves in `section(name)` or call `count(name)`; both are
+    no-ops while disabled. end_frame() closes the current frame into a bounded
+    history that can be shown on the HUD or exported as JSON / CSV.
+    """
+
+    def __init__(self, history=5000):
+        self.enabled = False
+        self.frames = deque(maxlen=history)
+        self._t0 = time.perf_counter()
+        self._frame = 0
+        self._reset_current()
+
+    def _reset_current(self):
+        self._current = {"snap_calls": 0, "snap_ms": 0.0, "wheel_calls": 0,
+                         "wheel_ms": 0.0, "handle_updates": 0}
+
+    def set_enabled(self, enabled):
+        self.enabled = bool(enabled)
+        self._reset_current()
+
+    def clear(self):
+        self.frames.clear()
+        self._frame = 0
+        self._reset_current()
+
+    @contextmanager
+    def section(self, name):
+        """Add the wall time of the block to `<name>_ms` and count it in `<name>_calls`."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            cur = self._current
+            cur[f"{name}_ms"] = cur.get(f"{name}_ms", 0.0) + (time.perf_counter() - start) * 1000
+            cur[f"{name}_calls"] = cur.get(f"{name}_calls", 0) + 1
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self._current[name] = self._current.get(name, 0) + n
+
+    def end_frame(self, paint_ms, items):
+        if not self.enabled:
+            return
+        row = dict(self._current)
+        row["frame"] = self._frame
+        row["t_ms"] = (time.perf_counter() - self._t0) * 1000
+        row["paint_ms"] = paint_ms
+        row["items"] = items
+        self.frames.append(row)
+        self._frame += 1
+        self._reset_current()
+
+    # Reporting
+
+    def summary(self, last=None):
+        """Mean / p50 / p95 / max of every field over the last `last` frames."""
+        rows = list(self.frames)[-last:] if last else list(self.frames)
+        if not rows:
+            return {}
+        out = {}
+        for field in FRAME_FIELDS[2:]:
+            values = np.array([row.get(field, 0) for row in rows], dtype=float)
+            out[field] = {
+                "mean": float(values.mean()),
+                "p50": float(np.percentile(values, 50)),
+                "p95": float(np.percentile(values, 95)),
+                "max": float(values.max()),
+            }
+        return out
+
+    def hud_lines(self, last=60):
+        rows = list(self.frames)[-last:]
+        if not rows:
+            return ["instrumentation: no frames yet"]
+        paint = np.array([row["paint_ms"] for row in rows])
+
+        def total(field):
+            return sum(row.get(field, 0) for row in rows)
+
+        return [
+            f"paint {paint.mean():.2f} ms avg, {np.percentile(paint, 95):.2f} p95, "
+            f"{paint.max():.2f} max (last {len(rows)} frames)",
+            f"items {rows[-1]['items']}",
+            f"snap {total('snap_calls')} calls, {total('snap_ms'):.2f} ms",
+            f"wheel {total('wheel_calls')} events, {total('wheel_ms'):.2f} ms",
+            f"handle updates {total('handle_updates')}",
+        ]
+
+    def export(self, path):
+        """Write the frame history to `path`; .csv gives one row per frame, anything else JSON."""
+        rows = list(self.frames)
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=FRAME_FIELDS, extrasaction="ignore")
+                writer.writeheader()
+                for row in rows:
+                    writer.writerow({field: row.get(field, 0) for field in FRAME_FIELDS})
+        else:
+            with open(path, "w") as f:
+                json.dump({"fields": FRAME_FIELDS, "summary": self.summary(), "frames": rows}, f, indent=1)
+        return len(rows)
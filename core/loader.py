@@ -0,0 +1,210 @@
+"""Loading and preparation work that runs on a QThreadPool instead of the GUI thread.
+
+Jobs only touch numpy arrays and QImages. Results reach the GUI thread through
+queued signals, where the scene is updated. Every job can be cancelled; it stops at
+its next chunk boundary.
+"""
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, QElapsedTimer, pyqtSignal
+from core.trace_item import TraceItem, decimate
+from utils.touchstone import TouchstoneData, iter_touchstone
+import os
+import threading
+import numpy as np
+
+# Decimation levels prepared by the loader around the view's current level of detail
+PRIMED_LEVELS = 3
+
+# Jobs run with autoDelete off, so they are kept here from start_job() until run() has
+# returned; the view or load that started one may be gone by then
+_running = set()
+
+
+class _JobSignals(QObject):
+    progress = pyqtSignal(int, int)
+    chunk = pyqtSignal(object, object, object)
+    done = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    # Last signal of every run, whatever its outcome
+    finished = pyqtSignal()
+
+
+def start_job(job, pool=None):
+    _running.add(job)
+    job.signals.finished.connect(lambda: _running.discard(job))
+    (pool or QThreadPool.globalInstance()).start(job)
+    return job
+
+
+class TouchstoneJob(QRunnable):
+    """Parse a Touchstone file, convert it to scene coordinates and decimate it.
+
+    Emits chunk(xs, ys, freq) per parsed chunk, progress(chars_read, file_size), then
+    done(result) with the full arrays and {level: indices} for `levels`.
+    """
+
+    def __init__(self, path, transform, port=(0, 0), levels=(), chunk_lines=16384):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.path = path
+        self.transform = transform
+        self.port = port
+        self.levels = tuple(levels)
+        self.chunk_lines = chunk_lines
+        self.signals = _JobSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            total = os.path.getsize(self.path)
+            xs, ys, freqs = [], [], []
+
+            def progress(done):
+                self.signals.progress.emit(done, total)
+
+            for options, freq, params in iter_touchstone(self.path, chunk_lines=self.chunk_lines,
+                                                         progress=progress):
+                if self._cancel.is_set():
+                    self.signals.cancelled.emit()
+                    return
+                gamma = TouchstoneData(freq, params, options["parameter"], options["z0"]).gamma(*self.port)
+                x, y = self.transform.complex_to_scene(gamma)
+                xs.append(x)
+                ys.append(y)
+                freqs.append(freq)
+                self.signals.chunk.emit(x, y, freq)
+
+            if not xs:
+                raise ValueError(f"No network data found in {os.path.basename(self.path)}")
+            points = np.column_stack([np.concatenate(xs), np.concatenate(ys)])
+            decimation = {}
+            for level in self.levels:
+                if self._cancel.is_set():
+                    self.signals.cancelled.emit()
+                    return
+                decimation[level] = decimate(points, level)
+            self.signals.done.emit({"xs": points[:, 0], "ys": points[:, 1],
+                                    "freq": np.concatenate(freqs), "decimation": decimation})
+        except (OSError, ValueError) as e:
+            self.signals.failed.emit(str(e))
+        except Exception as e:
+            # An exception escaping QRunnable.run() aborts the application
+            self.signals.failed.emit(f"{type(e).__name__}: {e}")
+        finally:
+            self.signals.finished.emit()
+
+
+class TraceLoad(QObject):
+    """GUI-side half of a TouchstoneJob: streams the sweep into a TraceItem as it parses.
+
+    The trace is added to the scene right away and refreshed with the chunks received
+    so far at most every `refresh_ms`. Cancelling removes the partial trace.
+    """
+
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, view, path, port=(0, 0), pool=None, refresh_ms=150):
+        super().__init__(view)
+        self.view = view
+        self.path = path
+        self.pool = pool or QThreadPool.globalInstance()
+        self.refresh_ms = refresh_ms
+        self.trace = TraceItem(np.empty(0), np.empty(0), name=os.path.basename(path), freq=np.empty(0))
+        self.active = False
+
+        lod = view.transform().m11()
+        level = int(np.floor(np.log2(lod))) if lod > 0 else 0
+        levels = range(level - 1, level + PRIMED_LEVELS - 1)
+        self.job = TouchstoneJob(path, view.chart_transform(), port, levels)
+        signals = self.job.signals
+        signals.progress.connect(self.progress)
+        signals.chunk.connect(self._on_chunk)
+        signals.done.connect(self._on_done)
+        signals.failed.connect(self._on_failed)
+        signals.cancelled.connect(self._on_cancelled)
+
+        self._chunks = []
+        self._since_refresh = QElapsedTimer()
+
+    def start(self):
+        self.view.scene.addItem(self.trace)
+        self.active = True
+        self._since_refresh.start()
+        start_job(self.job, self.pool)
+        return self
+
+    def cancel(self):
+        self.job.cancel()
+
+    def _on_chunk(self, xs, ys, freq):
+        if not self.active:
+            return
+        self._chunks.append((xs, ys, freq))
+        if self._since_refresh.elapsed() >= self.refresh_ms:
+            self._refresh()
+
+    def _refresh(self):
+        xs, ys, freq = (np.concatenate(parts) for parts in zip(*self._chunks))
+        self.trace.set_points(xs, ys, freq)
+        self._since_refresh.restart()
+
+    def _on_done(self, result):
+        if not self.active:
+            return
+        self.active = False
+        self._chunks = []
+        self.trace.set_points(result["xs"], result["ys"], result["freq"])
+        self.trace.prime_decimation(result["decimation"])
+        self.finished.emit(self.trace)
+
+    def _remove_trace(self):
+        self.active = False
+        self._chunks = []
+        if self.trace.scene() is not None:
+            self.trace.scene().removeItem(self.trace)
+
+    def _on_failed(self, message):
+        self._remove_trace()
+        self.failed.emit(message)
+
+    def _on_cancelled(self):
+        self._remove_trace()
+        self.cancelled.emit()
+
+
+class TilePrerenderJob(QRunnable):
+    """Render missing tiles of a TilePyramid to QImages off the GUI thread."""
+
+    def __init__(self, pyramid, levels):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.keys = [key for level in levels for key in pyramid.missing_tiles(level)]
+        self.pyramid = pyramid
+        self.signals = _JobSignals()
+        self._cancel = threading.Event()
+        # done carries (key, image) per tile; the GUI thread turns them into pixmaps
+        self.signals.done.connect(lambda item: pyramid.insert_tile(*item))
+        pyramid.queue_tiles(self.keys, self)
+        self.signals.finished.connect(lambda: pyramid.release_tiles(self.keys, self))
+
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        try:
+            for n, key in enumerate(self.keys):
+                if self._cancel.is_set():
+                    self.signals.cancelled.emit()
+                    return
+                self.signals.done.emit((key, self.pyramid.render_tile_image(*key)))
+                self.signals.progress.emit(n + 1, len(self.keys))
+        except Exception as e:
+            self.signals.failed.emit(f"{type(e).__name__}: {e}")
+        finally:
+            self.signals.finished.emit()
@@ -0,0 +1,165 @@
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsSimpleTextItem, QMenu, QInputDialog
+from PyQt5.QtGui import QPen, QBrush, QColor, QPainterPath, QPainterPathStroker
+from PyQt5.QtCore import Qt, QRectF, QPointF
+from core.graphics_items import StretchHandle, chart_transform_for, push_command, HIT_TOLERANCE
+from core.trace_item import polygon_from_arrays
+from core.undo import DeleteCommand, PropertyCommand
+from utils.geometry import gamma_to_impedance
+from utils.matching import SERIES, SHUNT, LINE, arc_points, l_network_solutions, line_shunt_solutions
+import numpy as np
+
+MOVE_COLORS = {SERIES: QColor(0, 90, 200), SHUNT: QColor(220, 110, 0), LINE: QColor(0, 140, 70)}
+
+
+class MatchingPathItem(QGraphicsItem):
+    """Matching network from a draggable load point to the chart center.
+
+    The L-network and line + shunt solutions are solved analytically from the load
+    impedance each time the load handle moves. Every element is drawn along its
+    exact constant-r, constant-g or constant-|Γ| arc and labelled with its
+    component value at `freq`.
+    """
+
+    def __init__(self, freq=1e9, z0=50.0):
+        super().__init__()
+        self.setFlags(QGraphicsItem.ItemIsSelectable)
+        self.freq = freq
+        self.z0 = z0
+        self.solution_index = 0
+        self.solutions = []
+        self.moves = ()
+        self._polygons = []
+        self._rect = QRectF()
+        self._shape = None
+        self._labels = []
+
+        self.load_handle = StretchHandle(self, 'load')
+        self.load_handle.setBrush(QBrush(Qt.red))
+        self.load_label = QGraphicsSimpleTextItem("", self)
+        self.load_label.setBrush(QBrush(Qt.darkRed))
+
+    def add_to_scene(self, scene, load_pos=QPointF(400, 250)):
+        scene.addItem(self)
+        self.load_handle.setPos(load_pos)
+        self.update_path()
+
+    def scene_items(self):
+        return [self]
+
+    def load_impedance(self):
+        transform = chart_transform_for(self)
+        if transform is None:
+            return None
+        pos = self.load_handle.pos()
+        return complex(gamma_to_impedance(transform.scene_to_complex(pos.x(), pos.y())))
+
+    def update_path(self):
+        transform = chart_transform_for(self)
+        z = self.load_impedance()
+        if transform is None or z is None:
+            return
+
+        self.solutions = l_network_solutions(z) + line_shunt_solutions(z) if np.isfinite(z) else []
+        if self.solutions:
+            self.solution_index %= len(self.solutions)
+            self.moves = self.solutions[self.solution_index]
+        else:
+            self.moves = ()
+
+        self.prepareGeometryChange()
+        self._polygons = []
+        self._shape = None
+        all_x, all_y = [], []
+        for move in self.moves:
+            xs, ys = transform.complex_to_scene(arc_points(move))
+            self._polygons.append((move.kind, polygon_from_arrays(xs, ys)))
+            all_x.append(xs)
+            all_y.append(ys)
+        if all_x:
+            xs, ys = np.concatenate(all_x), np.concatenate(all_y)
+            self._rect = QRectF(xs.min(), ys.min(), xs.max() - xs.min(), ys.max() - ys.min()).adjusted(-4, -4, 4, 4)
+        else:
+            self._rect = QRectF()
+        self._update_labels(transform)
+
+    def _update_labels(self, transform):
+        while len(self._labels) < len(self.moves):
+            label = QGraphicsSimpleTextItem("", self)
+            label.setZValue(1)
+            self._labels.append(label)
+        for label in self._labels[len(self.moves):]:
+            label.setVisible(False)
+
+        for move, label in zip(self.moves, self._labels):
+            mid = arc_points(move, 3)[1]
+            x, y = transform.complex_to_scene(mid)
+            label.setText(move.label(self.freq, self.z0))
+            label.setBrush(QBrush(MOVE_COLORS[move.kind]))
+            label.setPos(float(x) + 6, float(y) - 6)
+            label.setVisible(True)
+
+        z = self.load_impedance()
+        pos = self.load_handle.pos()
+        if self.solutions:
+            text = f"z = {z.real:.2f}{z.imag:+.2f}j  ({self.solution_index + 1}/{len(self.solutions)})"
+        else:
+            text = "no match" if z is not None and np.isfinite(z) else ""
+        self.load_label.setText(text)
+        self.load_label.setPos(pos.x() + 8, pos.y() + 4)
+
+    def set_solution(self, index):
+        self.solution_index = index
+        self.update_path()
+
+    def set_freq(self, freq):
+        self.freq = freq
+        self.update_path()
+
+    def boundingRect(self):
+        return self._rect
+
+    # Only the arcs are hit-testable, so clicks elsewhere in the path's box reach
+    # the points and handles under it
+    def shape(self):
+        if self._shape is None:
+            path = QPainterPath()
+            for _, polygon in self._polygons:
+                path.addPolygon(polygon)
+            stroker = QPainterPathStroker()
+            # The selected pen is 3 wide
+            stroker.setWidth(3 + 2 * HIT_TOLERANCE)
+            self._shape = stroker.createStroke(path)
+        return self._shape
+
+    def paint(self, painter, option, widget=None):
+        painter.setBrush(Qt.NoBrush)
+        for kind, polygon in self._polygons:
+            pen = QPen(MOVE_COLORS[kind], 3 if self.isSelected() else 2)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.drawPolyline(polygon)
+
+        # Junctions between elements
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QBrush(Qt.black))
+        for _, polygon in self._polygons[1:]:
+            painter.drawEllipse(polygon.first(), 3, 3)
+
+    def contextMenuEvent(self, event):
+        menu = QMenu()
+        next_action = menu.addAction("Next Solution")
+        next_action.setEnabled(len(self.solutions) > 1)
+        freq_action = menu.addAction("Set Frequency...")
+        delete_action = menu.addAction("Delete")
+        selected = menu.exec_(event.screenPos())
+
+        if selected == next_action:
+            push_command(self, PropertyCommand(
+                self, 'set_solution', self.solution_index, self.solution_index + 1, "Next solution"))
+        elif selected == freq_action:
+            ghz, ok = QInputDialog.getDouble(None, "Matching Frequency", "Frequency (GHz):",
+                                             self.freq / 1e9, 1e-6, 1e4, 6)
+            if ok:
+                push_command(self, PropertyCommand(self, 'set_freq', self.freq, ghz * 1e9, "Change frequency"))
+        elif selected == delete_action:
+            push_command(self, DeleteCommand(self.scene(), self.scene_items()))
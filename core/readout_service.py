@@ -0,0 +1,64 @@
+from PyQt5 import sip
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from utils.readout import ReadoutCache
+import numpy as np
+
+
+class ReadoutService(QObject):
+    """Fills readout labels and the cursor readout for one view, once per frame.
+
+    Items request a label text for a scene position with a formatter; requests
+    are collected and resolved together on the next event loop pass, with one
+    vectorized cache lookup for all of them. Later requests for the same label
+    replace earlier ones, so a label dragged across many mouse moves is resolved
+    once. The cache can be shared by several views.
+    """
+
+    cursor_changed = pyqtSignal(object)
+
+    def __init__(self, view, cache=None):
+        super().__init__(view)
+        self.view = view
+        self.cache = cache if cache is not None else ReadoutCache()
+        self._pending = {}
+        self._cursor = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(0)
+        self._timer.timeout.connect(self.flush)
+
+    def request(self, label, pos, formatter):
+        """Set `label`'s text to formatter(readout at scene point `pos`) on the next flush."""
+        self._pending[label] = (pos.x(), pos.y(), formatter)
+        self._timer.start()
+
+    def request_cursor(self, pos):
+        self._cursor = (pos.x(), pos.y())
+        self._timer.start()
+
+    def flush(self):
+        self._timer.stop()
+        pending, self._pending = self._pending, {}
+        cursor, self._cursor = self._cursor, None
+        if not pending and cursor is None:
+            return
+
+        requests = list(pending.items())
+        xs = [x for _, (x, _, _) in requests]
+        ys = [y for _, (_, y, _) in requests]
+        if cursor is not None:
+            xs.append(cursor[0])
+            ys.append(cursor[1])
+        gr, gi = self.view.chart_transform().scene_to_gamma(np.array(xs), np.array(ys))
+        readouts = self.cache.lookup_many(gr, gi)
+        self._set_texts([(label, formatter) for label, (_, _, formatter) in requests], readouts)
+        if cursor is not None:
+            self.cursor_changed.emit(readouts[-1])
+
+    def _set_texts(self, requests, readouts):
+        for (label, formatter), readout in zip(requests, readouts):
+            if sip.isdeleted(label):
+                continue
+            text = formatter(readout)
+            if label.text() != text:
+                label.setText(text)
@@ -0,0 +1,282 @@
+from PyQt5.QtGui import QColor, QPen, QBrush
+from PyQt5.QtCore import QPointF
+from core.graphics_items import MovablePoint, StretchableArrowWithHandles, DraggableText, SnapCircleItem
+from core.matching_item import MatchingPathItem
+from core.trace_item import TraceItem
+import json
+import os
+import uuid
+import numpy as np
+
+SESSION_VERSION = 1
+SESSION_SUFFIX = ".smithsession"
+
+
+def _rgba(color):
+    return np.uint32(QColor(color).rgba())
+
+
+def _color(value):
+    return QColor.fromRgba(int(value))
+
+
+class SessionStore:
+    """Chart session saved as a directory of columnar .npy files.
+
+    Annotations are stored one column per field and item type (e.g. `arrows.x1.npy`)
+    in Γ coordinates, so a session survives a background change. Each trace gets its
+    own `trace-<id>.*.npy` files. Everything loads memory-mapped.
+
+    save() is incremental: a type's columns are only rewritten when they differ from
+    what this store last wrote, and only new or changed traces are written, so
+    autosaving a scene with large sweeps costs little when only a label moved.
+    """
+
+    def __init__(self, path):
+        if not path.endswith(SESSION_SUFFIX):
+            path += SESSION_SUFFIX
+        self.path = path
+        self._saved_columns = {}
+        self._saved_traces = {}
+
+    # Collecting scene state
+
+    @staticmethod
+    def collect(view):
+        transform = view.chart_transform()
+        points, arrows, texts, circles, paths, traces = [], [], [], [], [], []
+        for item in view.scene.items():
+            if isinstance(item, MovablePoint):
+                points.append(item)
+            elif isinstance(item, StretchableArrowWithHandles):
+                arrows.append(item)
+            elif isinstance(item, DraggableText):
+                texts.append(item)
+            elif isinstance(item, SnapCircleItem):
+                circles.append(item)
+            elif isinstance(item, MatchingPathItem):
+                paths.append(item)
+            elif isinstance(item, TraceItem):
+                traces.append(item)
+
+        def g(x, y):
+            gx, gy = transform.scene_to_gamma(np.asarray(x, dtype=float), np.asarray(y, dtype=float))
+            return gx, gy
+
+        columns = {}
+        px, py = g([p.scenePos().x() for p in points], [p.scenePos().y() for p in points])
+        columns["points"] = {
+            "x": px, "y": py,
+            "radius": np.array([transform.length_to_gamma(p.rect().width() / 2) for p in points]),
+            "color": np.array([_rgba(p.brush().color()) for p in points], dtype=np.uint32),
+        }
+
+        lines = [a.line() for a in arrows]
+        x1, y1 = g([l.x1() for l in lines], [l.y1() for l in lines])
+        x2, y2 = g([l.x2() for l in lines], [l.y2() for l in lines])
+        columns["arrows"] = {
+            "x1": x1, "y1": y1, "x2": x2, "y2": y2,
+            "color": np.array([_rgba(a.pen().color()) for a in arrows], dtype=np.uint32),
+            "width": np.array([a.pen().widthF() for a in arrows]),
+        }
+
+        tx, ty = g([t.scenePos().x() for t in texts], [t.scenePos().y() for t in texts])
+        columns["texts"] = {
+            "x": tx, "y": ty,
+            "text": np.array([t.toPlainText() for t in texts], dtype=str),
+            "font_size": np.array([t.font().pointSizeF() for t in texts]),
+            "text_width": np.array([t.textWidth() for t in texts]),
+            "color": np.array([_rgba(t.defaultTextColor()) for t in texts], dtype=np.uint32),
+        }
+
+        circles = [c for c in circles if c.center_handle and c.radius_handle]
+        cx, cy = g([c.center_handle.pos().x() for c in circles], [c.center_handle.pos().y() for c in circles])
+        rx, ry = g([c.radius_handle.pos().x() for c in circles], [c.radius_handle.pos().y() for c in circles])
+        columns["circles"] = {
+            "cx": cx, "cy": cy, "rx": rx, "ry": ry,
+            "color": np.array([_rgba(c.pen().color()) for c in circles], dtype=np.uint32),
+        }
+
+        # The moves follow analytically from the load and the chosen solution
+        lx, ly = g([m.load_handle.scenePos().x() for m in paths], [m.load_handle.scenePos().y() for m in paths])
+        columns["paths"] = {
+            "x": lx, "y": ly,
+            "solution": np.array([m.solution_index for m in paths], dtype=np.int64),
+            "freq": np.array([m.freq for m in paths], dtype=float),
+            "z0": np.array([m.z0 for m in paths], dtype=float),
+        }
+        return columns, traces
+
+    # Saving
+
+    def save(self, view):
+        """Write what changed since the last save. Returns the number of files written."""
+        os.makedirs(self.path, exist_ok=True)
+        transform = view.chart_transform()
+        columns, traces = self.collect(view)
+        written = 0
+
+        for kind, cols in columns.items():
+            previous = self._saved_columns.get(kind)
+            if previous is not None and all(
+                    np.array_equal(previous[name], col) for name, col in cols.items()):
+                continue
+            for name, col in cols.items():
+                self._write(f"{kind}.{name}.npy", col)
+                written += 1
+            self._saved_columns[kind] = cols
+
+        trace_ids = []
+        for trace in traces:
+            if not hasattr(trace, "session_id"):
+                trace.session_id = uuid.uuid4().hex[:12]
+            tid = trace.session_id
+            trace_ids.append(tid)
+            signature = self._trace_signature(trace)
+            if self._saved_traces.get(tid) == signature:
+                continue
+
+            pts = trace.points + np.array([trace.pos().x(), trace.pos().y()])
+            gx, gy = transform.scene_to_gamma(pts[:, 0], pts[:, 1])
+            self._write(f"trace-{tid}.gamma.npy", np.column_stack([gx, gy]))
+            freq = trace.freq if trace.freq is not None else np.empty(0)
+            self._write(f"trace-{tid}.freq.npy", freq)
+            self._saved_traces[tid] = signature
+            written += 2
+
+        # Drop files of traces that were deleted from the scene
+        for tid in set(self._saved_traces) - set(trace_ids):
+            del self._saved_traces[tid]
+        for name in os.listdir(self.path):
+            if name.startswith("trace-") and name.split(".")[0][len("trace-"):] not in trace_ids:
+                os.remove(os.path.join(self.path, name))
+
+        manifest = {
+            "version": SESSION_VERSION,
+            "traces": [
+                {"id": t.session_id, "name": t.name, "color": int(_rgba(t.color))} for t in traces
+            ],
+        }
+        with open(os.path.join(self.path, "manifest.json.tmp"), "w") as f:
+            json.dump(manifest, f)
+        os.replace(os.path.join(self.path, "manifest.json.tmp"), os.path.join(self.path, "manifest.json"))
+        return written
+
+    @staticmethod
+    def _trace_signature(trace):
+        return (trace.revision, len(trace.points), trace.name, int(_rgba(trace.color)),
+                trace.pos().x(), trace.pos().y())
+
+    def _write(self, name, array):
+        final = os.path.join(self.path, name)
+        tmp = final + ".tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, array)
+        os.replace(tmp, final)
+
+    # Loading
+
+    def _read(self, name):
+        path = os.path.join(self.path, name)
+        if not os.path.exists(path):
+            return None
+        return np.load(path, mmap_mode="r")
+
+    def _read_kind(self, kind, names):
+        cols = {name: self._read(f"{kind}.{name}.npy") for name in names}
+        if any(col is None for col in cols.values()):
+            return None
+        return cols
+
+    def load(self, view):
+        """Add the saved items to `view`. The store then treats them as already saved."""
+        with open(os.path.join(self.path, "manifest.json")) as f:
+            manifest = json.load(f)
+        if manifest.get("version", 0) > SESSION_VERSION:
+            raise ValueError(f"Session {self.path} was written by a newer version")
+
+        transform = view.chart_transform()
+        scene = view.scene
+        existing_columns, existing_traces = self.collect(view)
+        was_empty = not existing_traces and all(
+            len(next(iter(cols.values()))) == 0 for cols in existing_columns.values())
+
+        def s(x, y):
+            sx, sy = transform.gamma_to_scene(np.asarray(x), np.asarray(y))
+            return sx.tolist(), sy.tolist()
+
+        cols = self._read_kind("points", ["x", "y", "radius", "color"])
+        if cols is not None:
+            xs, ys = s(cols["x"], cols["y"])
+            for x, y, r, c in zip(xs, ys, cols["radius"], cols["color"]):
+                point = MovablePoint(float(transform.length_to_scene(r)))
+                point.setBrush(QBrush(_color(c)))
+                scene.addItem(point)
+                point.setPos(x, y)
+
+        cols = self._read_kind("arrows", ["x1", "y1", "x2", "y2", "color", "width"])
+        if cols is not None:
+            x1, y1 = s(cols["x1"], cols["y1"])
+            x2, y2 = s(cols["x2"], cols["y2"])
+            for a, b, c, d, color, width in zip(x1, y1, x2, y2, cols["color"], cols["width"]):
+                arrow = StretchableArrowWithHandles((a, b), (c, d))
+                arrow.setPen(QPen(_color(color), float(width)))
+                arrow.add_to_scene(scene)
+
+        cols = self._read_kind("texts", ["x", "y", "text", "font_size", "text_width", "color"])
+        if cols is not None:
+            xs, ys = s(cols["x"], cols["y"])
+            for x, y, text, size, width, color in zip(
+                    xs, ys, cols["text"], cols["font_size"], cols["text_width"], cols["color"]):
+                item = DraggableText(str(text))
+                font = item.font()
+                font.setPointSizeF(float(size))
+                item.setFont(font)
+                item.setTextWidth(float(width))
+                item.setDefaultTextColor(_color(color))
+                scene.addItem(item)
+                item.setPos(x, y)
+
+        cols = self._read_kind("circles", ["cx", "cy", "rx", "ry", "color"])
+        if cols is not None:
+            cx, cy = s(cols["cx"], cols["cy"])
+            rx, ry = s(cols["rx"], cols["ry"])
+            for a, b, c, d, color in zip(cx, cy, rx, ry, cols["color"]):
+                circle = SnapCircleItem()
+                circle.setPen(QPen(_color(color), 2))
+                circle.add_to_scene(scene, QPointF(a, b), QPointF(c, d))
+
+        cols = self._read_kind("paths", ["x", "y", "solution", "freq", "z0"])
+        if cols is not None:
+            xs, ys = s(cols["x"], cols["y"])
+            for x, y, solution, freq, z0 in zip(xs, ys, cols["solution"], cols["freq"], cols["z0"]):
+                path = MatchingPathItem(freq=float(freq), z0=float(z0))
+                path.solution_index = int(solution)
+                scene.addItem(path)
+                path.load_handle.restore_pos(QPointF(x, y))
+                path.update_path()
+
+        for entry in manifest.get("traces", []):
+            tid = entry["id"]
+            gamma = self._read(f"trace-{tid}.gamma.npy")
+            if gamma is None:
+                continue
+            freq = self._read(f"trace-{tid}.freq.npy")
+            xs, ys = transform.gamma_to_scene(gamma[:, 0], gamma[:, 1])
+            trace = TraceItem(xs, ys, name=entry.get("name", ""),
+                              freq=freq if freq is not None and len(freq) else None,
+                              color=_color(entry.get("color", 0xff006400)))
+            trace.session_id = tid
+            scene.addItem(trace)
+
+        if not was_empty:
+            # The scene now holds more than the files do; the next save writes everything
+            self._saved_columns = {}
+            self._saved_traces = {}
+            return
+
+        # Everything on disk now matches the scene; the next save only writes changes
+        self._saved_columns, traces = self.collect(view)
+        self._saved_traces = {
+            t.session_id: self._trace_signature(t) for t in traces if hasattr(t, "session_id")
+        }
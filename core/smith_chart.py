@@ -1,13 +1,14 @@
-import matplotlib.pyplot as plt
-from matplotlib.patches import Circle, FancyArrowPatch
-
-
 class SmithChart:
     def __init__(self):
+        # Imported lazily: the editor never needs pyplot unless a SmithChart is built
+        import matplotlib.pyplot as plt
+
         self.figure, self.ax = plt.subplots(figsize=(6, 6))
         self.setup_chart()
 
     def setup_chart(self):
+        from matplotlib.patches import Circle
+
         self.ax.clear()
         self.ax.set_aspect('equal')
         self.ax.set_xlim(-1, 1.5)
@@ -28,6 +29,8 @@ class SmithChart:
             self._draw_reactance_arc(-x)
 
     def _draw_reactance_arc(self, x):
+        from matplotlib.patches import Circle
+
         center_x, center_y = 1, 1 / x
         radius = 1 / abs(x)
         arc = Circle((center_x, center_y), radius=radius, fill=False, linestyle='--', color='gray')
@@ -37,6 +40,8 @@ class SmithChart:
         self.ax.plot(x, y, 'ro')
 
     def draw_arrow(self, start, end):
+        from matplotlib.patches import FancyArrowPatch
+
         arrow = FancyArrowPatch(start, end, arrowstyle='->', color='blue', mutation_scale=10)
         self.ax.add_patch(arrow)
 
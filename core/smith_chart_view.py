@@ -1,25 +1,47 @@
-from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsPixmapItem
-from PyQt5.QtGui import QPixmap, QImage, QPainter
-from PyQt5.QtCore import QRectF, Qt, QPointF
-from core.graphics_items import MovablePoint, StretchableArrowWithHandles, DraggableText, SnapCircleItem
+from PyQt5.QtWidgets import QGraphicsView, QGraphicsScene, QGraphicsItem, QUndoStack
+from PyQt5.QtGui import QPixmap, QImage, QPainter, QColor
+from PyQt5.QtCore import QRectF, Qt, QPointF, QTimer, pyqtSignal
+from core.graphics_items import (MovablePoint, StretchableArrowWithHandles, DraggableText, SnapCircleItem,
+                                 set_static_caching)
+from core.smith_grid_item import SmithGridItem
+from core.background_cache import grid_cache_key
+from core.chart_resources import ChartResources, resource_path  # noqa: F401 (resource_path re-exported)
+from core.trace_item import TraceItem
+from core.matching_item import MatchingPathItem
+from core.sweep_playback import SweepPlayback
+from core.readout_service import ReadoutService
+from core.loader import TraceLoad, TilePrerenderJob, start_job
+from core.tiled_background_item import TiledBackgroundItem
+from utils.touchstone import read_touchstone
+from utils.geometry import ChartTransform
+from core.drag_scheduler import DragUpdateScheduler
+from core.instrumentation import Instrumentation
+from core.undo import UNDO_LIMIT, AddCommand, MoveCommand, movable_positions
 from utils.smith_snap import generate_smith_values
 import os
-import sys
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_agg import FigureCanvasAgg
+import time
 import numpy as np
 
 
-def resource_path(relative_path):
-    """ Get absolute path to resource, works for dev and for PyInstaller """
-    if hasattr(sys, '_MEIPASS'):
-        return os.path.join(sys._MEIPASS, relative_path)
-    return os.path.join(os.path.abspath("."), relative_path)
+# Unit circle of resources/smith_chart_bg.png: center x, center y, radius in image pixels
+BG_IMAGE_UNIT_CIRCLE = (647.0, 645.0, 559.0)
+
+# Fixed scene index depth. Qt's automatic depth grows with the item count and rebuilds
+# the whole index each time it changes; past ~1k annotations a deeper tree only adds
+# insertion cost for large items (circles) without speeding up hit tests.
+SCENE_BSP_DEPTH = 10
+
 
 class SmithChartView(QGraphicsView):
-    def __init__(self):
+    # background_mode: see ChartResources.background_item. Views of one workspace pass
+    # the same `resources` so they share the background data and the snap index.
+    viewport_changed = pyqtSignal()
+    activated = pyqtSignal()
+
+    def __init__(self, background_mode="auto", tile_cache_mb=64, background_cache=None, resources=None):
         super().__init__()
         self.scene = QGraphicsScene(self)
+        self.scene.setBspTreeDepth(SCENE_BSP_DEPTH)
         self.setScene(self.scene)
 
         self.setRenderHint(QPainter.Antialiasing)
@@ -29,15 +51,31 @@ class SmithChartView(QGraphicsView):
         self._pan = False
         self._pan_start = QPointF()
         self.setDragMode(QGraphicsView.ScrollHandDrag)
-        bg_path = resource_path("resources/smith_chart_bg.png")
-        if os.path.exists(bg_path):
-            bg = QPixmap(bg_path)
-        else:
-            print("Image not found, generating Smith chart with matplotlib...")
-            bg = self.generate_matplotlib_smith_chart()
-
-        self.bg_item = QGraphicsPixmapItem(bg)
-        self.scene.addItem(self.bg_item)
+        self.background_mode = background_mode
+        if resources is None:
+            resources = ChartResources(tile_cache_mb, background_cache)
+        self.resources = resources
+        self.tile_cache_mb = resources.tile_cache_mb
+        self.background_cache = resources.background_cache
+        self._chart_transform = None
+        self.drag_scheduler = DragUpdateScheduler(self)
+        self.show_debug_overlay = False
+        self.instrumentation = Instrumentation()
+        self.undo_stack = QUndoStack(self)
+        self.undo_stack.setUndoLimit(UNDO_LIMIT)
+        self._drag_items = ()
+        self.playback = None
+        self.readouts = ReadoutService(self, resources.readout_cache)
+        # Hover moves feed the cursor readout even with no button held
+        self.setMouseTracking(True)
+        # Annotation device caches are off while a wheel zoom is in progress
+        self._zoom_idle = QTimer(self)
+        self._zoom_idle.setSingleShot(True)
+        self._zoom_idle.setInterval(250)
+        self._zoom_idle.timeout.connect(self._end_zoom_gesture)
+        self.drag_scheduler.frame_applied.connect(self._on_drag_frame)
+        self.bg_item = None
+        self.set_background(self.create_background_item(background_mode))
 
         rect = self.bg_item.boundingRect()
         margin = 500
@@ -45,20 +83,36 @@ class SmithChartView(QGraphicsView):
         self.setSceneRect(expanded_rect)
 
         self.fitInView(self.bg_item, Qt.KeepAspectRatio)
+        self.prerender_job = None
+        self.prerender_tiles()
 
-    def generate_matplotlib_smith_chart(self):
-        fig = plt.figure(figsize=(6, 6), dpi=1000)
+    def create_background_item(self, mode):
+        return self.resources.background_item(mode, matplotlib_pixmap=self.generate_matplotlib_smith_chart)
+
+    def generate_matplotlib_smith_chart(self, figsize=6, dpi=1000):
+        r_vals, x_vals = generate_smith_values()
+        key = grid_cache_key(r_vals, x_vals, 'gray', '--', 0.8, figsize, dpi)
+        image = self.background_cache.load_image("matplotlib-bg", key)
+        if image is not None:
+            return QPixmap.fromImage(image)
+
+        # matplotlib is only needed on this fallback path; importing it at module level
+        # costs hundreds of milliseconds of startup. Figure + Agg avoids pyplot's backends.
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.patches import Circle
+
+        fig = Figure(figsize=(figsize, figsize), dpi=dpi)
         ax = fig.add_subplot(111)
         ax.set_aspect('equal')
         ax.set_xlim(-2, 1)
         ax.set_ylim(-2, 2)
         ax.axis('off')
 
-        r_vals, x_vals = generate_smith_values()
         for r in r_vals:
             center = r / (1 + r)
             radius = 1 / (1 + r)
-            circle = plt.Circle((center, 0), radius, fill=False, linestyle='--', color='gray', linewidth=0.8)
+            circle = Circle((center, 0), radius, fill=False, linestyle='--', color='gray', linewidth=0.8)
             ax.add_artist(circle)
 
         for x in x_vals:
@@ -69,14 +123,118 @@ class SmithChartView(QGraphicsView):
         canvas.draw()
         width, height = canvas.get_width_height()
         image = QImage(canvas.buffer_rgba(), width, height, QImage.Format_RGBA8888)
+        self.background_cache.save_image("matplotlib-bg", key, image)
         return QPixmap.fromImage(image)
 
     def _draw_reactance_arc(self, ax, x):
+        from matplotlib.patches import Circle
+
         center_x, center_y = 1, 1 / x
         radius = 1 / abs(x)
-        circle = plt.Circle((center_x, center_y), radius=radius, fill=False, linestyle='--', color='gray', linewidth=0.8)
+        circle = Circle((center_x, center_y), radius=radius, fill=False, linestyle='--', color='gray', linewidth=0.8)
         ax.add_artist(circle)
 
+    def set_background(self, item):
+        if self.bg_item is not None:
+            self.scene.removeItem(self.bg_item)
+        self.bg_item = item
+        self.scene.addItem(item)
+        self._chart_transform = None
+
+    def chart_transform(self):
+        """Γ <-> scene mapping derived from the background item, cached until it changes."""
+        if self._chart_transform is None:
+            self._chart_transform = ChartTransform(*self._background_unit_circle())
+        return self._chart_transform
+
+    def _background_unit_circle(self):
+        """Scene-space center x, center y and radius of the |Γ| = 1 circle."""
+        if isinstance(self.bg_item, SmithGridItem):
+            c = self.bg_item.size / 2
+            cx, cy, r = c, c, self.bg_item.unit_radius
+        else:
+            cx, cy, r = BG_IMAGE_UNIT_CIRCLE
+            rect = self.bg_item.boundingRect()
+            # A generated raster keeps the unit circle proportional to the PNG layout
+            if (rect.width(), rect.height()) != (1296, 1291):
+                sx, sy = rect.width() / 1296, rect.height() / 1291
+                cx, cy, r = cx * sx, cy * sy, r * sx
+        origin = self.bg_item.mapToScene(cx, cy)
+        return origin.x(), origin.y(), r
+
+    def grid_item(self):
+        """The SmithGridItem drawing the background, directly or through tiles, or None."""
+        if isinstance(self.bg_item, SmithGridItem):
+            return self.bg_item
+        return getattr(self.bg_item, 'grid', None)
+
+    def grid_level(self):
+        """Level of the adaptive grid shown at the current zoom (0 for a fixed background)."""
+        grid = self.grid_item()
+        if grid is None:
+            return 0
+        lod = self.transform().m11()
+        if isinstance(self.bg_item, TiledBackgroundItem):
+            # Tiles are drawn from the next finer pyramid level, rendered at its scale
+            lod = 2.0 ** -self.bg_item.level_for_lod(lod)
+        return grid.level_for_scale(lod * grid.unit_radius)
+
+    def snapper(self):
+        """Snapper for the curves drawn at the current zoom."""
+        grid = self.grid_item()
+        if grid is None or grid.grid_levels is None:
+            return self.resources.snapper
+        return grid.grid_levels.snapper(self.grid_level())
+
+    def import_touchstone(self, path, port=(0, 0)):
+        data = read_touchstone(path)
+        xs, ys = self.chart_transform().complex_to_scene(data.gamma(*port))
+        trace = TraceItem(xs, ys, name=os.path.basename(path), freq=data.freq)
+        self.scene.addItem(trace)
+        return trace
+
+    def import_touchstone_async(self, path, port=(0, 0), pool=None):
+        """Parse `path` on a worker thread; the trace fills in as chunks arrive. Returns the TraceLoad."""
+        return TraceLoad(self, path, port, pool).start()
+
+    def prerender_tiles(self, levels=(1, 0), pool=None):
+        """Render the coarse tile levels of a tiled background on a worker thread."""
+        if not isinstance(self.bg_item, TiledBackgroundItem):
+            return None
+        job = TilePrerenderJob(self.bg_item.pyramid, levels)
+        if not job.keys:
+            return None
+        if self.prerender_job is not None:
+            self.prerender_job.cancel()
+        self.prerender_job = job
+        job.signals.done.connect(self._on_tile_ready)
+        start_job(job, pool)
+        return job
+
+    def _on_tile_ready(self, _):
+        self.viewport().update()
+
+    def playable_traces(self):
+        return [item for item in self.scene.items()
+                if isinstance(item, TraceItem) and item.freq is not None and len(item.freq) == len(item)]
+
+    def start_playback(self, trace=None):
+        """Put a sweep marker on `trace` (default: the first playable trace) and return the player."""
+        if trace is None:
+            traces = self.playable_traces()
+            if not traces:
+                return None
+            trace = traces[0]
+        self.stop_playback()
+        self.playback = SweepPlayback(self, trace)
+        return self.playback
+
+    def stop_playback(self):
+        if self.playback is not None:
+            self.playback.stop()
+            self.playback.deleteLater()
+            self.playback = None
+
     # def resizeEvent(self, event):
     #     super().resizeEvent(event)
     #     self.fitInView(self.bg_item, Qt.KeepAspectRatio)
@@ -85,21 +243,42 @@ class SmithChartView(QGraphicsView):
         point = MovablePoint(5)
         self.scene.addItem(point)
         point.setPos(200, 200)
+        self.undo_stack.push(AddCommand(self.scene, point.scene_items(), "Add point"))
 
     def add_arrow(self):
         arrow = StretchableArrowWithHandles((100, 100), (250, 250))
         arrow.add_to_scene(self.scene)
+        self.undo_stack.push(AddCommand(self.scene, arrow.scene_items(), "Add arrow"))
 
     def add_text(self):
         text = DraggableText("Label")
         self.scene.addItem(text)
         text.setPos(300, 300)
+        self.undo_stack.push(AddCommand(self.scene, text.scene_items(), "Add text"))
 
     def add_circle(self):
         circle = SnapCircleItem()
         circle.add_to_scene(self.scene)
+        self.undo_stack.push(AddCommand(self.scene, circle.scene_items(), "Add circle"))
+
+    def add_matching_path(self):
+        path = MatchingPathItem()
+        x, y = self.chart_transform().complex_to_scene(0.3 - 0.4j)
+        path.add_to_scene(self.scene, QPointF(float(x), float(y)))
+        self.undo_stack.push(AddCommand(self.scene, path.scene_items(), "Add matching path"))
 
     def wheelEvent(self, event):
+        with self.instrumentation.section("wheel"):
+            if not self._zoom_idle.isActive():
+                set_static_caching(self.scene, False)
+            self._zoom_idle.start()
+            self._zoom_at(event)
+        self.viewport_changed.emit()
+
+    def _end_zoom_gesture(self):
+        set_static_caching(self.scene, True)
+
+    def _zoom_at(self, event):
         zoom_in_factor = 1.15
         zoom_out_factor = 1 / zoom_in_factor
 
@@ -125,6 +304,57 @@ class SmithChartView(QGraphicsView):
     def resizeEvent(self, event):
         super().resizeEvent(event)
 
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        self.viewport_changed.emit()
+
+    def focusInEvent(self, event):
+        super().focusInEvent(event)
+        self.activated.emit()
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_F3:
+            self.set_debug_overlay(not self.show_debug_overlay)
+            return
+        super().keyPressEvent(event)
+
+    def set_debug_overlay(self, shown):
+        """Show the HUD; frame instrumentation only runs while it is shown."""
+        self.show_debug_overlay = shown
+        self.instrumentation.set_enabled(shown)
+        self.viewport().update()
+
+    def paintEvent(self, event):
+        if not self.instrumentation.enabled:
+            super().paintEvent(event)
+            return
+        start = time.perf_counter()
+        super().paintEvent(event)
+        self.instrumentation.end_frame((time.perf_counter() - start) * 1000, len(self.scene.items()))
+
+    def _on_drag_frame(self):
+        if self.show_debug_overlay:
+            self.viewport().update()
+
+    def debug_overlay_lines(self):
+        return self.instrumentation.hud_lines() + [self.drag_scheduler.overlay_text()]
+
+    def drawForeground(self, painter, rect):
+        super().drawForeground(painter, rect)
+        if not self.show_debug_overlay:
+            return
+        painter.save()
+        painter.resetTransform()
+        lines = self.debug_overlay_lines()
+        metrics = painter.fontMetrics()
+        height = metrics.height() * len(lines) + 8
+        width = max(metrics.horizontalAdvance(line) for line in lines) + 12
+        painter.fillRect(QRectF(4, 4, width, height), QColor(255, 255, 255, 210))
+        painter.setPen(Qt.black)
+        for i, line in enumerate(lines):
+            painter.drawText(10, 8 + metrics.ascent() + i * metrics.height(), line)
+        painter.restore()
+
     def mousePressEvent(self, event):
         if event.button() == Qt.MiddleButton:
             self._pan = True
@@ -132,6 +362,8 @@ class SmithChartView(QGraphicsView):
             self.setCursor(Qt.ClosedHandCursor)  # Show closed hand
         else:
             super().mousePressEvent(event)
+            if event.button() == Qt.LeftButton:
+                self._begin_move()
 
     def mouseMoveEvent(self, event):
         if self._pan:
@@ -143,6 +375,7 @@ class SmithChartView(QGraphicsView):
             self.verticalScrollBar().setValue(self.verticalScrollBar().value() - delta.y())
         else:
             super().mouseMoveEvent(event)
+            self.readouts.request_cursor(self.mapToScene(event.pos()))
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MiddleButton:
@@ -150,4 +383,25 @@ class SmithChartView(QGraphicsView):
             self.setCursor(Qt.ArrowCursor)  # Restore cursor
         else:
             super().mouseReleaseEvent(event)
+            if event.button() == Qt.LeftButton:
+                self._end_move()
+
+    # A whole mouse drag (all selected items plus the grabbed one) is one undo step
+    def _begin_move(self):
+        items = list(self.scene.selectedItems())
+        grabber = self.scene.mouseGrabberItem()
+        if grabber is not None and grabber not in items:
+            items.append(grabber)
+        for item in list(items):
+            items.extend(i for i in getattr(item, 'dependent_items', list)() if i not in items)
+        self._drag_items = tuple(item for item in items if item.flags() & QGraphicsItem.ItemIsMovable)
+        self._drag_start = movable_positions(self._drag_items)
+
+    def _end_move(self):
+        items, self._drag_items = self._drag_items, ()
+        if not items:
+            return
+        end = movable_positions(items)
+        if not np.array_equal(end, self._drag_start):
+            self.undo_stack.push(MoveCommand(items, self._drag_start, end))
 
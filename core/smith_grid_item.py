@@ -0,0 +1,184 @@
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+from PyQt5.QtGui import QPainterPath, QPen, QColor
+from PyQt5.QtCore import Qt, QRectF
+from utils.smith_snap import GridLevels, GRID_FIELDS
+from utils.geometry import reactance_arc
+from core.background_cache import grid_cache_key
+import threading
+import numpy as np
+
+
+class SmithGridItem(QGraphicsItem):
+    """Smith chart r/x grid drawn as vector paths.
+
+    The grid lives in item coordinates: Γ = 0 sits at the center of a `size` x `size`
+    square and the unit circle has radius `unit_radius`. Each curve is kept as its own
+    QPainterPath so paint() only strokes the curves that cross the exposed rect, and the
+    pen is cosmetic so lines stay one device pixel wide at any zoom.
+
+    Without explicit `r_vals` / `x_vals` the grid follows `grid_levels` (a GridLevels):
+    render() draws the level for the painter's scale, so the vector grid and tiles
+    rendered from it get denser as the chart is zoomed in.
+
+    Each level's paths are built (or, with a BackgroundCache, loaded from disk under a
+    key hashed from the grid parameters) the first time that level is drawn, so a
+    chart that is never zoomed in never builds the dense levels. shared_copy() gives
+    another item over the same paths, for use in a second scene.
+    """
+
+    def __init__(self, size=1296, unit_radius=600, r_vals=None, x_vals=None,
+                 color=Qt.gray, line_width=0.8, cache=None, grid_levels=None):
+        super().__init__()
+        self.cache = cache
+        self.size = size
+        self.unit_radius = unit_radius
+        self.color = QColor(color)
+        self.line_width = line_width
+
+        if r_vals is None or x_vals is None:
+            self.grid_levels = grid_levels or GridLevels()
+            self._level_values = [self.grid_levels.new_values(level)
+                                  for level in range(self.grid_levels.n_levels)]
+        else:
+            self.grid_levels = None
+            empty = np.empty(0)
+            self._level_values = [{"r": np.asarray(r_vals, dtype=float), "x": np.asarray(x_vals, dtype=float),
+                                   "g": empty, "b": empty, "vswr": empty}]
+
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.setZValue(-1)
+
+        self._level_paths = []
+        self._outline = QPainterPath()
+        # Tiles of a grid are also rendered on worker threads (see core.loader)
+        self._paths_lock = threading.Lock()
+        self.rebuild()
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.size, self.size)
+
+    def shared_copy(self):
+        copy = SmithGridItem.__new__(SmithGridItem)
+        QGraphicsItem.__init__(copy)
+        copy.__dict__.update(self.__dict__)
+        copy.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        copy.setZValue(-1)
+        return copy
+
+    def gamma_rect(self, gx, gy, radius):
+        """Item-space rect of the circle with Γ-plane center (gx, gy) and radius."""
+        c = self.size / 2
+        s = self.unit_radius
+        return QRectF(c + s * (gx - radius), c - s * (gy + radius), 2 * s * radius, 2 * s * radius)
+
+    def values(self, level=None):
+        """{field: values} of the curves drawn at `level` (default: the densest)."""
+        if level is None:
+            level = len(self._level_values) - 1
+        shown = self._level_values[:max(0, level) + 1]
+        return {field: np.concatenate([v[field] for v in shown]) for field in GRID_FIELDS}
+
+    def level_for_scale(self, pixels_per_unit):
+        if self.grid_levels is None:
+            return 0
+        return self.grid_levels.level_for_scale(pixels_per_unit)
+
+    def cache_key(self, level=None):
+        """Hash of the grid parameters; of one level's curves only if `level` is given."""
+        levels = self._level_values if level is None else self._level_values[level:level + 1]
+        values = [v[field] for v in levels for field in GRID_FIELDS]
+        return grid_cache_key(*values, self.color.name(QColor.HexArgb),
+                              self.line_width, self.size, self.unit_radius)
+
+    def rebuild(self):
+        self.prepareGeometryChange()
+
+        # Unit circle and real axis
+        self._outline = QPainterPath()
+        self._outline.addEllipse(self.gamma_rect(0, 0, 1))
+        self._outline.moveTo(self.size / 2 - self.unit_radius, self.size / 2)
+        self._outline.lineTo(self.size / 2 + self.unit_radius, self.size / 2)
+        # Filled in place, so shared copies see levels built through any of them
+        self._level_paths[:] = [None] * len(self._level_values)
+        self.update()
+
+    def level_paths(self, level):
+        """(path, control point rect) of each curve `level` adds, built on first use."""
+        paths = self._level_paths[level]
+        if paths is None:
+            with self._paths_lock:
+                paths = self._level_paths[level]
+                if paths is None:
+                    paths = self._level_paths[level] = [(p, p.controlPointRect()) for p in self._load_paths(level)]
+        return paths
+
+    def _load_paths(self, level):
+        kind = f"grid-level{level}-paths"
+        paths = None
+        if self.cache is not None:
+            paths = self.cache.load_paths(kind, self.cache_key(level))
+        if paths is None:
+            paths = self._build_paths(self._level_values[level])
+            if self.cache is not None:
+                self.cache.save_paths(kind, self.cache_key(level), paths)
+        return paths
+
+    def _build_paths(self, values):
+        paths = []
+        for r in values["r"]:
+            paths.append(self._circle_path(r / (1 + r), 0, 1 / (1 + r)))
+        for x in values["x"]:
+            for sign in (+1, -1):
+                paths.append(self._reactance_path(sign * x))
+        # Admittance curves are the impedance ones turned half a turn about Γ = 0
+        for g in values["g"]:
+            paths.append(self._circle_path(-g / (1 + g), 0, 1 / (1 + g)))
+        for b in values["b"]:
+            for sign in (+1, -1):
+                paths.append(self._reactance_path(sign * b, mirrored=True))
+        for vswr in values["vswr"]:
+            paths.append(self._circle_path(0, 0, (vswr - 1) / (vswr + 1)))
+        return paths
+
+    def _circle_path(self, gx, gy, radius):
+        path = QPainterPath()
+        path.addEllipse(self.gamma_rect(gx, gy, radius))
+        return path
+
+    def _reactance_path(self, x, mirrored=False):
+        # Only the part of the arc inside the unit circle. Item y points down, so
+        # Qt's counter-clockwise angles are the same as Γ-plane angles here.
+        cx, cy, radius, start, end = reactance_arc(x)
+        if mirrored:
+            cx, cy, start, end = -cx, -cy, start + np.pi, end + np.pi
+        rect = self.gamma_rect(cx, cy, radius)
+        path = QPainterPath()
+        path.arcMoveTo(rect, np.degrees(start))
+        path.arcTo(rect, np.degrees(start), np.degrees(end - start))
+        return path
+
+    def pen(self):
+        pen = QPen(self.color, self.line_width, Qt.DashLine)
+        pen.setCosmetic(True)
+        return pen
+
+    def paint(self, painter, option, widget=None):
+        exposed = option.exposedRect if isinstance(option, QStyleOptionGraphicsItem) else self.boundingRect()
+        self.render(painter, exposed)
+
+    def render(self, painter, exposed):
+        """Stroke the curves that cross `exposed` (item coordinates), at the painter's zoom."""
+        lod = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        level = self.level_for_scale(lod * self.unit_radius)
+
+        painter.save()
+        painter.setClipRect(exposed)
+        painter.setPen(self.pen())
+        painter.setBrush(Qt.NoBrush)
+
+        painter.drawPath(self._outline)
+        for lvl in range(level + 1):
+            for path, rect in self.level_paths(lvl):
+                if rect.intersects(exposed):
+                    painter.drawPath(path)
+        painter.restore()
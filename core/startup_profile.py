@@ -0,0 +1,52 @@
+from PyQt5.QtCore import QObject, QEvent, QTimer
+import sys
+import time
+
+
+class StartupProfiler(QObject):
+    """Collects timestamps during startup and prints a per-phase breakdown.
+
+    `main.py --profile-startup` records the import phases itself, then hands the
+    window to watch_first_paint(), which ends the run once the chart has painted.
+    """
+
+    def __init__(self, t0):
+        super().__init__()
+        self.t0 = t0
+        self.marks = []
+        self._on_done = None
+        self._watched = None
+
+    def mark(self, label, when=None):
+        self.marks.append((label, time.perf_counter() if when is None else when))
+
+    def watch_first_paint(self, widget, on_done):
+        self._on_done = on_done
+        self._watched = widget
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self._watched and event.type() == QEvent.Paint:
+            obj.removeEventFilter(self)
+            self._watched = None
+            # Mark after the paint event has been handled, not before
+            QTimer.singleShot(0, self._first_paint_done)
+        return False
+
+    def _first_paint_done(self):
+        self.mark("first paint")
+        if self._on_done is not None:
+            self._on_done()
+
+    def report(self):
+        lines = ["Startup profile", "-" * 44]
+        prev = self.t0
+        for label, when in self.marks:
+            lines.append(f"{label:<28}{(when - prev) * 1000:9.1f} ms")
+            prev = when
+        lines.append("-" * 44)
+        lines.append(f"{'total':<28}{(prev - self.t0) * 1000:9.1f} ms")
+
+        heavy = [name for name in ("matplotlib", "matplotlib.pyplot") if name in sys.modules]
+        lines.append(f"heavy modules loaded: {', '.join(heavy) if heavy else 'none'}")
+        return "\n".join(lines)
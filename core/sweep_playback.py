@@ -0,0 +1,160 @@
+from PyQt5.QtWidgets import QGraphicsItem, QGraphicsSimpleTextItem
+from PyQt5.QtGui import QPen, QBrush, QColor
+from PyQt5.QtCore import Qt, QObject, QRectF, QTimer, QElapsedTimer, pyqtSignal
+from utils.geometry import gamma_to_impedance
+import numpy as np
+
+
+class SweepMarkerItem(QGraphicsItem):
+    """Fixed-size crosshair plus readout that follows the playback position.
+
+    It ignores view transforms, so moving it only repaints its own few pixels
+    and the trace underneath is never redrawn from scratch.
+    """
+
+    SIZE = 7
+
+    def __init__(self, color=QColor(200, 0, 0)):
+        super().__init__()
+        self.color = color
+        self.setFlag(QGraphicsItem.ItemIgnoresTransformations)
+        self.setZValue(10)
+        self.readout = QGraphicsSimpleTextItem("", self)
+        self.readout.setBrush(QBrush(Qt.black))
+        self.readout.setPos(self.SIZE + 4, self.SIZE + 2)
+
+    def boundingRect(self):
+        s = self.SIZE + 1
+        return QRectF(-s, -s, 2 * s, 2 * s)
+
+    def paint(self, painter, option, widget=None):
+        s = self.SIZE
+        painter.setPen(QPen(self.color, 2))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawEllipse(QRectF(-s / 2, -s / 2, s, s))
+        painter.drawLine(-s, 0, -s // 2, 0)
+        painter.drawLine(s // 2, 0, s, 0)
+        painter.drawLine(0, -s, 0, -s // 2)
+        painter.drawLine(0, s // 2, 0, s)
+
+
+class SweepPlayback(QObject):
+    """Scrubs and animates a marker along a TraceItem by frequency.
+
+    Γ, z and VSWR of every sample are computed once up front; a frequency is
+    mapped to a sample with a binary search over the sorted frequency array,
+    so each step costs O(log N) plus moving one small item.
+    """
+
+    position_changed = pyqtSignal(int)
+    playing_changed = pyqtSignal(bool)
+
+    def __init__(self, view, trace, duration_s=8.0, parent=None):
+        super().__init__(parent if parent is not None else view)
+        if trace.freq is None or len(trace.freq) != len(trace.points):
+            raise ValueError("Playback needs a trace with one frequency per point")
+        self.view = view
+        self.trace = trace
+        self.duration_s = duration_s
+
+        # Precomputed per-sample arrays, in increasing frequency order
+        order = np.argsort(trace.freq, kind="stable")
+        self.order = order
+        self.freq = np.ascontiguousarray(trace.freq[order])
+        pts = trace.points[order] + np.array([trace.pos().x(), trace.pos().y()])
+        self.scene_xy = pts
+        self.gamma = view.chart_transform().scene_to_complex(pts[:, 0], pts[:, 1])
+        self.z = gamma_to_impedance(self.gamma)
+        mag = np.abs(self.gamma)
+        with np.errstate(divide="ignore"):
+            self.vswr = np.where(mag < 1, (1 + mag) / (1 - mag), np.inf)
+
+        self.index = -1
+        self.marker = SweepMarkerItem()
+        view.scene.addItem(self.marker)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(int(round(view.drag_scheduler.frame_ms)))
+        self._timer.timeout.connect(self._tick)
+        self._clock = QElapsedTimer()
+        self._play_from = 0.0
+
+        self.set_index(0)
+
+    @property
+    def f_min(self):
+        return float(self.freq[0])
+
+    @property
+    def f_max(self):
+        return float(self.freq[-1])
+
+    def index_for_freq(self, f):
+        """Index of the sample closest to frequency `f`."""
+        i = int(np.searchsorted(self.freq, f))
+        if i <= 0:
+            return 0
+        if i >= len(self.freq):
+            return len(self.freq) - 1
+        return i - 1 if f - self.freq[i - 1] <= self.freq[i] - f else i
+
+    def set_freq(self, f):
+        self.set_index(self.index_for_freq(f))
+
+    def set_fraction(self, t):
+        """Scrub to fraction t in [0, 1] of the frequency span."""
+        self.set_freq(self.f_min + min(max(t, 0.0), 1.0) * (self.f_max - self.f_min))
+
+    def set_index(self, i):
+        if i == self.index:
+            return
+        self.index = i
+        x, y = self.scene_xy[i]
+        self.marker.setPos(x, y)
+        self.marker.readout.setText(self.readout(i))
+        self.position_changed.emit(i)
+
+    def readout(self, i):
+        z = self.z[i]
+        vswr = self.vswr[i]
+        vswr_text = f"{vswr:.2f}" if np.isfinite(vswr) else "∞"
+        return (f"{self.freq[i] / 1e9:.6g} GHz\n"
+                f"z = {z.real:.3f} {'+' if z.imag >= 0 else '-'} j{abs(z.imag):.3f}\n"
+                f"VSWR = {vswr_text}")
+
+    # Animation
+
+    def is_playing(self):
+        return self._timer.isActive()
+
+    def play(self):
+        if self.index >= len(self.freq) - 1:
+            self.set_index(0)
+        self._play_from = self.fraction()
+        self._clock.start()
+        if not self._timer.isActive():
+            self._timer.start()
+            self.playing_changed.emit(True)
+
+    def pause(self):
+        if self._timer.isActive():
+            self._timer.stop()
+            self.playing_changed.emit(False)
+
+    def fraction(self):
+        span = self.f_max - self.f_min
+        return (self.freq[self.index] - self.f_min) / span if span > 0 else 0.0
+
+    def _tick(self):
+        t = self._play_from + self._clock.elapsed() / 1000.0 / self.duration_s
+        if t >= 1.0:
+            self.pause()
+            self.set_fraction(1.0)
+            return
+        self.set_fraction(t)
+
+    def stop(self):
+        """Stop playing and take the marker off the scene."""
+        self.pause()
+        if self.marker.scene() is not None:
+            self.marker.scene().removeItem(self.marker)
@@ -0,0 +1,293 @@
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+from PyQt5.QtGui import QImage, QPainter, QPixmap
+from PyQt5.QtCore import Qt, QRectF
+from collections import OrderedDict
+from core.background_cache import grid_cache_key
+import math
+
+
+class TilePyramid:
+    """Tiles of a chart background over a pyramid of zoom levels.
+
+    Level k holds the background at scale 2**-k, cut into `tile_size` pixel tiles.
+    Rendered tiles live in an LRU cache capped at `cache_limit_mb`.
+
+    The source is either a QImage (levels are built by repeated halving) or a
+    `renderer(painter, rect)` callable that paints the chart in item coordinates, in
+    which case tiles are rendered on demand and levels below 0 give extra resolution
+    when zoomed in. Rendered tiles can also be persisted through a `tile_store`.
+    `grid` is the SmithGridItem the renderer draws, if it is one.
+
+    A pyramid holds no scene state, so any number of TiledBackgroundItems in
+    different views can draw from the same one. Tiles queued by a TilePrerenderJob
+    are not rendered again on demand; paint() covers them with a coarser tile until
+    the job delivers them.
+    """
+
+    def __init__(self, size, image=None, renderer=None, tile_size=256, cache_limit_mb=64,
+                 max_zoom_in_levels=3, prerender_levels=2, tile_store=None, grid=None):
+        if (image is None) == (renderer is None):
+            raise ValueError("TilePyramid needs exactly one of image or renderer")
+
+        self.width = size[0]
+        self.height = size[1]
+        self.tile_size = tile_size
+        self.cache_limit = int(cache_limit_mb * 1024 * 1024)
+        self.renderer = renderer
+        self.tile_store = tile_store
+        self.grid = grid
+
+        # Coarsest level: the whole chart fits in a single tile
+        self.max_level = max(0, math.ceil(math.log2(max(self.width, self.height) / tile_size)))
+        self.min_level = 0 if image is not None else -max_zoom_in_levels
+
+        self._mipmaps = {}
+        if image is not None:
+            level_image = image.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+            for level in range(self.max_level + 1):
+                self._mipmaps[level] = level_image
+                level_image = level_image.scaled(
+                    max(1, level_image.width() // 2), max(1, level_image.height() // 2),
+                    Qt.IgnoreAspectRatio, Qt.SmoothTransformation
+                )
+
+        self._tiles = OrderedDict()
+        self._cache_bytes = 0
+        # key -> the prerender job that will deliver it
+        self._pending = {}
+
+        for level in range(self.max_level, self.max_level - prerender_levels, -1):
+            if level >= self.min_level:
+                self.prerender(level)
+
+    def bounding_rect(self):
+        return QRectF(0, 0, self.width, self.height)
+
+    def cache_bytes(self):
+        return self._cache_bytes
+
+    def set_cache_limit(self, limit_mb):
+        self.cache_limit = int(limit_mb * 1024 * 1024)
+        self._evict()
+
+    def clear_cache(self):
+        self._tiles.clear()
+        self._cache_bytes = 0
+
+    def level_for_lod(self, lod):
+        # Largest level whose scale is still at least the on-screen scale
+        if lod <= 0:
+            return self.max_level
+        level = math.floor(-math.log2(lod))
+        return min(self.max_level, max(self.min_level, level))
+
+    def tile_span(self, level):
+        """Item-space width of one tile at `level`."""
+        return self.tile_size * 2.0 ** level
+
+    def prerender(self, level):
+        span = self.tile_span(level)
+        for j in range(math.ceil(self.height / span)):
+            for i in range(math.ceil(self.width / span)):
+                self.tile(level, i, j)
+
+    def tile(self, level, i, j):
+        """The tile's pixmap, rendered if needed; None while a prerender job has it queued."""
+        key = (level, i, j)
+        pixmap = self._tiles.get(key)
+        if pixmap is not None:
+            self._tiles.move_to_end(key)
+            return pixmap
+        if key in self._pending:
+            return None
+
+        pixmap = self._render_tile(level, i, j)
+        self._tiles[key] = pixmap
+        self._cache_bytes += pixmap.width() * pixmap.height() * 4
+        self._evict()
+        return pixmap
+
+    def _evict(self):
+        while self._cache_bytes > self.cache_limit and len(self._tiles) > 1:
+            _, pixmap = self._tiles.popitem(last=False)
+            self._cache_bytes -= pixmap.width() * pixmap.height() * 4
+
+    def _render_tile(self, level, i, j):
+        return QPixmap.fromImage(self.render_tile_image(level, i, j))
+
+    def render_tile_image(self, level, i, j):
+        """Tile (level, i, j) as a QImage. Touches no pixmaps, so it may run off the GUI thread."""
+        if self.renderer is None:
+            image = self._mipmaps[level]
+            x = i * self.tile_size
+            y = j * self.tile_size
+            w = min(self.tile_size, image.width() - x)
+            h = min(self.tile_size, image.height() - y)
+            return image.copy(x, y, w, h)
+
+        if self.tile_store is not None:
+            image = self.tile_store.load(level, i, j)
+            if image is not None:
+                return image
+
+        scale = 2.0 ** -level
+        span = self.tile_span(level)
+        rect = QRectF(i * span, j * span, span, span).intersected(self.bounding_rect())
+
+        image = QImage(
+            max(1, math.ceil(rect.width() * scale)), max(1, math.ceil(rect.height() * scale)),
+            QImage.Format_ARGB32_Premultiplied
+        )
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.scale(scale, scale)
+        painter.translate(-rect.x(), -rect.y())
+        self.renderer(painter, rect)
+        painter.end()
+
+        if self.tile_store is not None:
+            self.tile_store.save(level, i, j, image)
+        return image
+
+    def missing_tiles(self, level):
+        span = self.tile_span(level)
+        return [(level, i, j)
+                for j in range(math.ceil(self.height / span))
+                for i in range(math.ceil(self.width / span))
+                if (level, i, j) not in self._tiles]
+
+    def coarser_tile(self, level, i, j):
+        """((level, i, j), pixmap) of the closest cached coarser tile covering a tile, or None."""
+        for coarser in range(level + 1, self.max_level + 1):
+            f = 2 ** (coarser - level)
+            key = (coarser, i // f, j // f)
+            pixmap = self._tiles.get(key)
+            if pixmap is not None:
+                return key, pixmap
+        return None
+
+    def queue_tiles(self, keys, job):
+        for key in keys:
+            self._pending[key] = job
+
+    def release_tiles(self, keys, job):
+        """Forget `job`'s queued tiles it did not deliver (cancelled or finished)."""
+        for key in keys:
+            if self._pending.get(key) is job:
+                del self._pending[key]
+
+    def insert_tile(self, key, image):
+        """Add a tile rendered elsewhere (see core.loader.TilePrerenderJob)."""
+        self._pending.pop(key, None)
+        if key in self._tiles:
+            return
+        pixmap = QPixmap.fromImage(image)
+        self._tiles[key] = pixmap
+        self._cache_bytes += pixmap.width() * pixmap.height() * 4
+        self._evict()
+
+
+class TiledBackgroundItem(QGraphicsItem):
+    """Chart background drawn from a TilePyramid.
+
+    paint() picks the level closest to the view's level of detail and draws only the
+    tiles that intersect the exposed rect. Pass `pyramid` to share tiles with other
+    items (see shared_copy()); otherwise the remaining arguments build a new one.
+    """
+
+    def __init__(self, size=None, image=None, renderer=None, pyramid=None, **kwargs):
+        super().__init__()
+        if pyramid is None:
+            pyramid = TilePyramid(size, image=image, renderer=renderer, **kwargs)
+        self.pyramid = pyramid
+        self.width = pyramid.width
+        self.height = pyramid.height
+
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.setZValue(-1)
+
+    @classmethod
+    def from_pixmap_file(cls, path, **kwargs):
+        image = QImage(path)
+        return cls((image.width(), image.height()), image=image, **kwargs)
+
+    @classmethod
+    def from_grid(cls, grid_item, tile_size=256, **kwargs):
+        rect = grid_item.boundingRect()
+        if grid_item.cache is not None and "tile_store" not in kwargs:
+            key = grid_cache_key(grid_item.cache_key(), tile_size)
+            kwargs["tile_store"] = grid_item.cache.tile_store("grid-tiles", key)
+        return cls((rect.width(), rect.height()), renderer=grid_item.render, tile_size=tile_size,
+                   grid=grid_item, **kwargs)
+
+    def shared_copy(self):
+        """A new item drawing from the same pyramid, for another scene."""
+        return TiledBackgroundItem(pyramid=self.pyramid)
+
+    def boundingRect(self):
+        return QRectF(0, 0, self.width, self.height)
+
+    @property
+    def grid(self):
+        return self.pyramid.grid
+
+    def cache_bytes(self):
+        return self.pyramid.cache_bytes()
+
+    def set_cache_limit(self, limit_mb):
+        self.pyramid.set_cache_limit(limit_mb)
+
+    def clear_cache(self):
+        self.pyramid.clear_cache()
+        self.update()
+
+    def level_for_lod(self, lod):
+        return self.pyramid.level_for_lod(lod)
+
+    def tile_span(self, level):
+        return self.pyramid.tile_span(level)
+
+    def tile(self, level, i, j):
+        return self.pyramid.tile(level, i, j)
+
+    def paint(self, painter, option, widget=None):
+        if isinstance(option, QStyleOptionGraphicsItem):
+            exposed = option.exposedRect
+            lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        else:
+            exposed = self.boundingRect()
+            lod = 1.0
+
+        level = self.level_for_lod(lod)
+        scale = 2.0 ** -level
+        span = self.tile_span(level)
+        exposed = exposed.intersected(self.boundingRect())
+
+        i0 = max(0, int(exposed.left() // span))
+        j0 = max(0, int(exposed.top() // span))
+        i1 = int(math.ceil(exposed.right() / span))
+        j1 = int(math.ceil(exposed.bottom() / span))
+
+        for j in range(j0, j1):
+            for i in range(i0, i1):
+                pixmap = self.tile(level, i, j)
+                if pixmap is None:
+                    self._paint_coarser(painter, level, i, j)
+                    continue
+                target = QRectF(i * span, j * span, pixmap.width() / scale, pixmap.height() / scale)
+                painter.drawPixmap(target, pixmap, QRectF(pixmap.rect()))
+
+    def _paint_coarser(self, painter, level, i, j):
+        found = self.pyramid.coarser_tile(level, i, j)
+        if found is None:
+            return
+        (coarser, ci, cj), pixmap = found
+        span = self.tile_span(level)
+        coarse_span = self.tile_span(coarser)
+        coarse_scale = 2.0 ** -coarser
+        target = QRectF(i * span, j * span, span, span).intersected(self.boundingRect())
+        source = QRectF((target.x() - ci * coarse_span) * coarse_scale,
+                        (target.y() - cj * coarse_span) * coarse_scale,
+                        target.width() * coarse_scale, target.height() * coarse_scale)
+        painter.drawPixmap(target, pixmap, source.intersected(QRectF(pixmap.rect())))
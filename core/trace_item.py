@@ -0,0 +1,249 @@
+from PyQt5.QtWidgets import QGraphicsItem, QStyleOptionGraphicsItem
+from PyQt5.QtGui import QPen, QPolygonF, QBrush
+from PyQt5.QtCore import Qt, QRectF, QPointF
+import math
+import numpy as np
+
+
+def polygon_from_arrays(xs, ys):
+    """Build a QPolygonF by writing straight into its point buffer (no per-point QPointF)."""
+    n = len(xs)
+    polygon = QPolygonF(n)
+    if n == 0:
+        return polygon
+    ptr = polygon.data()
+    ptr.setsize(n * 2 * np.dtype(np.float64).itemsize)
+    buf = np.frombuffer(ptr, dtype=np.float64).reshape(n, 2)
+    buf[:, 0] = xs
+    buf[:, 1] = ys
+    return polygon
+
+
+def decimate(points, level):
+    """Indices of the samples kept at bucket width 2**-level, in sample order.
+
+    Per x bucket (pixel column) the first, last, lowest and highest sample are kept,
+    so at most four per column survive however noisy the trace is. Both ends are
+    always kept.
+    """
+    n = len(points)
+    if n < 3:
+        return np.arange(n)
+    column = np.floor(points[:, 0] * (2.0 ** level)).astype(np.int64)
+    # By column, then by y: each column's run starts at its lowest sample and ends at its highest
+    order = np.lexsort((points[:, 1], column))
+    column = column[order]
+    starts = np.flatnonzero(np.concatenate([[True], column[1:] != column[:-1]]))
+    ends = np.append(starts[1:], n) - 1
+    kept = np.concatenate([
+        order[starts], order[ends],
+        np.minimum.reduceat(order, starts), np.maximum.reduceat(order, starts),
+        [0, n - 1],
+    ])
+    return np.unique(kept)
+
+
+class PointGridIndex:
+    """Uniform grid hash over a point array, for nearest-point picking."""
+
+    def __init__(self, points, cell_size):
+        self.points = points
+        self.cell_size = cell_size
+        cells = np.floor(points / cell_size).astype(np.int64)
+        self.origin = cells.min(axis=0) if len(cells) else np.zeros(2, dtype=np.int64)
+        cells -= self.origin
+        self.stride = int(cells[:, 1].max()) + 3 if len(cells) else 1
+        keys = cells[:, 0] * self.stride + cells[:, 1]
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+
+    def nearest(self, x, y, max_dist):
+        """Index of the closest point within max_dist of (x, y), or None."""
+        if len(self.points) == 0:
+            return None
+        reach = max(1, int(math.ceil(max_dist / self.cell_size)))
+        cx = int(math.floor(x / self.cell_size)) - self.origin[0]
+        cy = int(math.floor(y / self.cell_size)) - self.origin[1]
+
+        found = []
+        for ix in range(cx - reach, cx + reach + 1):
+            if ix < 0:
+                continue
+            lo_y, hi_y = max(0, cy - reach), min(self.stride - 1, cy + reach)
+            if hi_y < lo_y:
+                continue
+            lo = np.searchsorted(self.keys, ix * self.stride + lo_y, side="left")
+            hi = np.searchsorted(self.keys, ix * self.stride + hi_y, side="right")
+            if hi > lo:
+                found.append(self.order[lo:hi])
+        if not found:
+            return None
+
+        candidates = np.concatenate(found)
+        d = np.hypot(self.points[candidates, 0] - x, self.points[candidates, 1] - y)
+        best = int(np.argmin(d))
+        return int(candidates[best]) if d[best] <= max_dist else None
+
+
+class TraceItem(QGraphicsItem):
+    """A measured sweep stored as a compact (N, 2) float64 array of item coordinates.
+
+    paint() draws a decimated polyline: at each zoom level only the first, last,
+    lowest and highest sample of each device-pixel column are kept (cached per
+    power-of-two level of detail), then the result is clipped to the exposed rect.
+    Paint cost is bounded by the pixel columns the trace covers rather than by N. Hovering highlights the nearest sample, found
+    through a grid index instead of per-point child items.
+    """
+
+    def __init__(self, xs, ys, name="", freq=None, color=Qt.darkGreen, width=1.5, pick_radius_px=6):
+        super().__init__()
+        self.freq = None if freq is None else np.asarray(freq, dtype=np.float64)
+        self.name = name
+        self.color = color
+        self.width = width
+        self.pick_radius_px = pick_radius_px
+        self.hover_index = None
+        self._decimated = {}
+        self._index = None
+        # Bumped on every set_points(), so savers can tell the data changed
+        self.revision = 0
+        self._load_points(xs, ys)
+
+        self.setFlags(QGraphicsItem.ItemIsSelectable)
+        self.setFlag(QGraphicsItem.ItemUsesExtendedStyleOption)
+        self.setAcceptHoverEvents(True)
+
+    def __len__(self):
+        return len(self.points)
+
+    def boundingRect(self):
+        pad = 8
+        return self._rect.adjusted(-pad, -pad, pad, pad)
+
+    def pen(self):
+        pen = QPen(self.color, self.width)
+        pen.setCosmetic(True)
+        return pen
+
+    def set_points(self, xs, ys, freq=None):
+        self.prepareGeometryChange()
+        if freq is not None:
+            self.freq = np.asarray(freq, dtype=np.float64)
+        self._load_points(xs, ys)
+        self.update()
+
+    def _load_points(self, xs, ys):
+        self.points = np.column_stack([xs, ys]).astype(np.float64)
+        self.revision += 1
+        self._decimated.clear()
+        self._index = None
+        self.hover_index = None
+        if len(self.points):
+            lo = self.points.min(axis=0)
+            hi = self.points.max(axis=0)
+            self._rect = QRectF(lo[0], lo[1], hi[0] - lo[0], hi[1] - lo[1])
+        else:
+            self._rect = QRectF()
+
+    def decimated_indices(self, lod):
+        """Indices of the samples kept at level of detail `lod` (device px per item unit)."""
+        level = int(math.floor(math.log2(lod))) if lod > 0 else 0
+        kept = self._decimated.get(level)
+        if kept is None:
+            kept = decimate(self.points, level)
+            self._decimated[level] = kept
+        return kept
+
+    def prime_decimation(self, levels):
+        """Adopt {level: indices} computed elsewhere (e.g. by a loader thread) for the current points."""
+        self._decimated.update(levels)
+
+    def visible_runs(self, indices, rect):
+        """Split decimated indices into runs whose segments can touch `rect`."""
+        pts = self.points[indices]
+        inside = ((pts[:, 0] >= rect.left()) & (pts[:, 0] <= rect.right()) &
+                  (pts[:, 1] >= rect.top()) & (pts[:, 1] <= rect.bottom()))
+        # Keep neighbours of visible points so segments crossing the edge are drawn
+        keep = inside.copy()
+        keep[1:] |= inside[:-1]
+        keep[:-1] |= inside[1:]
+        if keep.all():
+            return [indices]
+
+        idx = np.flatnonzero(keep)
+        if len(idx) == 0:
+            return []
+        breaks = np.flatnonzero(np.diff(idx) > 1) + 1
+        return [indices[run] for run in np.split(idx, breaks)]
+
+    def paint(self, painter, option, widget=None):
+        if len(self.points) == 0:
+            return
+        if isinstance(option, QStyleOptionGraphicsItem):
+            lod = option.levelOfDetailFromTransform(painter.worldTransform())
+            exposed = option.exposedRect
+        else:
+            lod = 1.0
+            exposed = self.boundingRect()
+
+        painter.setPen(self.pen())
+        painter.setBrush(Qt.NoBrush)
+        for run in self.visible_runs(self.decimated_indices(lod), exposed):
+            pts = self.points[run]
+            painter.drawPolyline(polygon_from_arrays(pts[:, 0], pts[:, 1]))
+
+        if self.hover_index is not None:
+            x, y = self.points[self.hover_index]
+            r = 4 / lod if lod > 0 else 4
+            painter.setBrush(QBrush(self.color))
+            painter.drawEllipse(QPointF(x, y), r, r)
+
+        if self.isSelected():
+            pen = QPen(Qt.black, 1, Qt.DashLine)
+            pen.setCosmetic(True)
+            painter.setPen(pen)
+            painter.setBrush(Qt.NoBrush)
+            painter.drawRect(self._rect)
+
+    def _view_scale(self):
+        scene = self.scene()
+        if scene is None or not scene.views():
+            return 1.0
+        return max(1e-9, self.deviceTransform(scene.views()[0].viewportTransform()).m11())
+
+    def pick(self, pos, radius_px=None):
+        """Index of the sample nearest to item position `pos` within radius_px screen pixels."""
+        radius = (radius_px or self.pick_radius_px) / self._view_scale()
+        if self._index is None:
+            span = max(self._rect.width(), self._rect.height(), 1e-9)
+            cell = span / max(1, int(math.sqrt(len(self.points))))
+            self._index = PointGridIndex(self.points, cell)
+        # The grid cell size is fixed; a large radius only means scanning more cells
+        return self._index.nearest(pos.x(), pos.y(), radius)
+
+    def point_label(self, i):
+        label = f"{self.name} [{i}]" if self.name else f"[{i}]"
+        if self.freq is not None:
+            label += f"  {self.freq[i] / 1e9:.6g} GHz"
+        return label
+
+    def hoverMoveEvent(self, event):
+        i = self.pick(event.pos())
+        if i != self.hover_index:
+            self._update_marker(self.hover_index)
+            self.hover_index = i
+            self._update_marker(i)
+            self.setToolTip(self.point_label(i) if i is not None else "")
+        super().hoverMoveEvent(event)
+
+    def hoverLeaveEvent(self, event):
+        self._update_marker(self.hover_index)
+        self.hover_index = None
+        super().hoverLeaveEvent(event)
+
+    def _update_marker(self, i):
+        if i is None:
+            return
+        x, y = self.points[i]
+        r = 6 / self._view_scale()
+        self.update(QRectF(x - r, y - r, 2 * r, 2 * r))
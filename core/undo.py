@@ -0,0 +1,139 @@
+from PyQt5.QtWidgets import QUndoCommand, QGraphicsScene
+from PyQt5.QtCore import QPointF
+from contextlib import contextmanager, nullcontext
+import time
+import numpy as np
+
+UNDO_LIMIT = 500
+
+# Moves of the same items closer together than this become one command
+MOVE_MERGE_WINDOW = 0.5
+
+MOVE_COMMAND_ID = 1
+
+# Below this many items, dropping and rebuilding the scene index costs more than it saves
+BULK_INDEX_MIN_ITEMS = 256
+
+
+@contextmanager
+def suspended_updates(scene, rebuild_index=True):
+    """Pause repaints of every view of `scene` and, if `rebuild_index`, its BSP index.
+
+    The index is dropped on entry and rebuilt once on exit, at the same fixed depth.
+    Nested uses leave both to the outermost one.
+    """
+    views = [view for view in scene.views() if view.updatesEnabled()]
+    for view in views:
+        view.setUpdatesEnabled(False)
+    depth = scene.bspTreeDepth()
+    rebuild_index = rebuild_index and scene.itemIndexMethod() == QGraphicsScene.BspTreeIndex
+    if rebuild_index:
+        scene.setItemIndexMethod(QGraphicsScene.NoIndex)
+    try:
+        yield
+    finally:
+        if rebuild_index:
+            scene.setItemIndexMethod(QGraphicsScene.BspTreeIndex)
+            scene.setBspTreeDepth(depth)
+        for view in views:
+            view.setUpdatesEnabled(True)
+
+
+class MoveCommand(QUndoCommand):
+    """Position change of one or more items, stored as two (n, 2) float arrays."""
+
+    def __init__(self, items, old_positions, new_positions, text="Move"):
+        super().__init__(text)
+        self.items = tuple(items)
+        self.old = np.asarray(old_positions, dtype=float).reshape(-1, 2)
+        self.new = np.asarray(new_positions, dtype=float).reshape(-1, 2)
+        self.stamp = time.monotonic()
+        self._first = True
+
+    def id(self):
+        return MOVE_COMMAND_ID
+
+    def mergeWith(self, other):
+        if other.items != self.items or other.stamp - self.stamp > MOVE_MERGE_WINDOW:
+            return False
+        self.new = other.new
+        self.stamp = other.stamp
+        return True
+
+    def _apply(self, positions):
+        for item, (x, y) in zip(self.items, positions.tolist()):
+            # Handles would otherwise snap the recorded position a second time
+            setter = getattr(item, 'restore_pos', item.setPos)
+            setter(QPointF(x, y))
+
+    def redo(self):
+        # The user already moved the items when the command is pushed
+        if self._first:
+            self._first = False
+            return
+        self._apply(self.new)
+
+    def undo(self):
+        self._apply(self.old)
+
+
+class PropertyCommand(QUndoCommand):
+    """item.<setter>(value) with the previous and new value, e.g. setPen / setBrush."""
+
+    def __init__(self, item, setter, old, new, text="Change"):
+        super().__init__(text)
+        self.item = item
+        self.setter = setter
+        self.old = old
+        self.new = new
+
+    def redo(self):
+        getattr(self.item, self.setter)(self.new)
+
+    def undo(self):
+        getattr(self.item, self.setter)(self.old)
+
+
+class AddCommand(QUndoCommand):
+    """Items added to a scene; undo takes them out again (they stay alive in the command).
+
+    Large batches go in and out with the scene index and repaints suspended;
+    removing items one by one from a BSP index is what makes undoing them slow.
+    """
+
+    def __init__(self, scene, items, text="Add"):
+        super().__init__(text)
+        self.scene = scene
+        self.items = list(items)
+
+    def _suspended(self):
+        if len(self.items) < BULK_INDEX_MIN_ITEMS:
+            return nullcontext()
+        return suspended_updates(self.scene)
+
+    def redo(self):
+        with self._suspended():
+            for item in self.items:
+                if item.scene() is None:
+                    self.scene.addItem(item)
+
+    def undo(self):
+        with self._suspended():
+            for item in self.items:
+                if item.scene() is self.scene:
+                    self.scene.removeItem(item)
+
+
+class DeleteCommand(AddCommand):
+    def __init__(self, scene, items, text="Delete"):
+        super().__init__(scene, items, text)
+
+    def redo(self):
+        super().undo()
+
+    def undo(self):
+        super().redo()
+
+
+def movable_positions(items):
+    return np.array([(item.pos().x(), item.pos().y()) for item in items], dtype=float).reshape(-1, 2)
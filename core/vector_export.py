@@ -0,0 +1,210 @@
+"""SVG / PDF export straight from chart geometry.
+
+The r/x grid is written from its analytic circles and arcs (the same values the
+vector background uses), and scene items from their own geometry: circles stay
+circles, matching paths stay arcs, traces are decimated to the output
+resolution. Nothing is rasterized. Items are visited one at a time and written
+through a streaming writer, so memory use does not depend on the size of the scene.
+"""
+from PyQt5.QtWidgets import (QGraphicsEllipseItem, QGraphicsLineItem, QGraphicsTextItem,
+                             QGraphicsSimpleTextItem)
+from PyQt5.QtGui import QColor, QFontMetricsF, QFontInfo
+from PyQt5.QtCore import Qt, QPointF
+from core.graphics_items import StretchHandle, SnapCircleItem, chart_transform_for
+from core.matching_item import MatchingPathItem, MOVE_COLORS
+from core.sweep_playback import SweepMarkerItem
+from core.trace_item import TraceItem
+from utils.geometry import reactance_arc
+from utils.matching import arc_geometry, gamma_of
+from utils.smith_snap import generate_smith_values, GRID_FIELDS
+from utils.vector_writer import SvgWriter, PdfWriter
+import os
+import numpy as np
+
+VECTOR_WRITERS = {"svg": SvgWriter, "pdf": PdfWriter}
+
+# Editing aids that are not part of the chart
+SKIPPED_TYPES = (StretchHandle, SweepMarkerItem)
+
+GRID_COLOR = (128, 128, 128, 255)
+GRID_WIDTH = 0.8
+# Trace points kept per output point (see TraceItem.decimated_indices)
+TRACE_OVERSAMPLE = 4
+
+
+def _rgba(color):
+    color = QColor(color)
+    return color.red(), color.green(), color.blue(), color.alpha()
+
+
+class _Page:
+    """Scene -> page mapping: `source` (scene rect) scaled to a page `width` wide."""
+
+    def __init__(self, source, width):
+        self.x0 = source.left()
+        self.y0 = source.top()
+        self.scale = width / source.width()
+        self.width = width
+        self.height = source.height() * self.scale
+
+    def xy(self, x, y):
+        return (x - self.x0) * self.scale, (y - self.y0) * self.scale
+
+    def point(self, p):
+        return self.xy(p.x(), p.y())
+
+    def pen_width(self, pen):
+        # Cosmetic pens are sized in device pixels; one pixel maps to one point
+        if pen.isCosmetic() or pen.widthF() == 0:
+            return max(pen.widthF(), 1.0)
+        return pen.widthF() * self.scale
+
+    def stroke(self, pen):
+        if pen.style() == Qt.NoPen:
+            return {"stroke": None}
+        width = self.pen_width(pen)
+        dash = None
+        if pen.style() != Qt.SolidLine:
+            dash = [d * width for d in pen.dashPattern()]
+        return {"stroke": _rgba(pen.color()), "width": width, "dash": dash}
+
+
+def export_vector(view, path, fmt=None, size=1200):
+    """Write `view`'s chart area to `path` as SVG or PDF, `size` points wide."""
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    if fmt not in VECTOR_WRITERS:
+        raise ValueError(f"Unknown vector format {fmt!r}")
+
+    view.readouts.flush()
+    page = _Page(view.bg_item.sceneBoundingRect(), size)
+    with VECTOR_WRITERS[fmt](path, page.width, page.height) as out:
+        write_grid(out, view, page)
+        for item in view.scene.items(Qt.AscendingOrder):
+            if item is view.bg_item or not item.isVisible() or isinstance(item, SKIPPED_TYPES):
+                continue
+            write_item(out, item, page)
+
+
+def grid_values(view, pixels_per_unit):
+    """{field: values} of the grid curves the view's background shows at that zoom."""
+    grid = view.grid_item()
+    if grid is not None:
+        return grid.values(grid.level_for_scale(pixels_per_unit))
+    r_vals, x_vals = generate_smith_values()
+    values = dict.fromkeys(GRID_FIELDS, ())
+    values.update(r=r_vals, x=x_vals)
+    return values
+
+
+def write_grid(out, view, page):
+    """Unit circle, real axis, and the r/x (and g/b, VSWR) curves at the page's scale."""
+    transform = view.chart_transform()
+    scale = transform.radius * page.scale
+    values = grid_values(view, scale)
+
+    def gamma_xy(gx, gy):
+        return page.xy(*transform.gamma_to_scene(gx, gy))
+
+    def reactance(x, sign):
+        gx, gy, radius, start, end = reactance_arc(x)
+        cx, cy = gamma_xy(sign * gx, sign * gy)
+        # Page y points down, so Γ-plane angles change sign; admittance arcs are
+        # turned half a turn (sign -1)
+        turn = 0 if sign > 0 else np.pi
+        out.arc(cx, cy, radius * scale, -(start + turn), -(end + turn))
+
+    out.set_style(stroke=GRID_COLOR, width=GRID_WIDTH, dash=[4 * GRID_WIDTH, 2 * GRID_WIDTH])
+    cx0, cy0 = gamma_xy(0, 0)
+    out.circle(cx0, cy0, scale)
+    out.line(*gamma_xy(-1, 0), *gamma_xy(1, 0))
+
+    for r in values["r"]:
+        cx, cy = gamma_xy(r / (1 + r), 0)
+        out.circle(cx, cy, scale / (1 + r))
+    for x in values["x"]:
+        reactance(x, 1)
+        reactance(-x, 1)
+    for g in values["g"]:
+        cx, cy = gamma_xy(-g / (1 + g), 0)
+        out.circle(cx, cy, scale / (1 + g))
+    for b in values["b"]:
+        reactance(b, -1)
+        reactance(-b, -1)
+    for vswr in values["vswr"]:
+        out.circle(cx0, cy0, scale * (vswr - 1) / (vswr + 1))
+
+
+def write_item(out, item, page):
+    if isinstance(item, TraceItem):
+        _write_trace(out, item, page)
+    elif isinstance(item, MatchingPathItem):
+        _write_matching_path(out, item, page)
+    elif isinstance(item, QGraphicsEllipseItem):
+        _write_ellipse(out, item, page)
+    elif isinstance(item, QGraphicsLineItem):
+        line = item.line()
+        out.set_style(**page.stroke(item.pen()))
+        out.line(*page.point(item.mapToScene(line.p1())), *page.point(item.mapToScene(line.p2())))
+    elif isinstance(item, QGraphicsTextItem):
+        _write_text_item(out, item, page)
+    elif isinstance(item, QGraphicsSimpleTextItem) and item.text():
+        font = item.font()
+        x, y = page.point(item.mapToScene(QPointF(0, QFontMetricsF(font).ascent())))
+        out.text(x, y, item.text(), QFontInfo(font).pixelSize() * page.scale, _rgba(item.brush().color()))
+
+
+def _write_ellipse(out, item, page):
+    rect = item.mapRectToScene(item.rect())
+    brush = item.brush()
+    fill = None
+    if brush.style() != Qt.NoBrush and brush.color().alpha() > 0 and not isinstance(item, SnapCircleItem):
+        fill = _rgba(brush.color())
+    out.set_style(fill=fill, **page.stroke(item.pen()))
+    cx, cy = page.point(rect.center())
+    out.circle(cx, cy, rect.width() / 2 * page.scale)
+
+
+def _write_trace(out, item, page):
+    if len(item) < 2:
+        return
+    kept = item.decimated_indices(page.scale * TRACE_OVERSAMPLE)
+    pts = item.points[kept]
+    pos = item.scenePos()
+    xs, ys = page.xy(pts[:, 0] + pos.x(), pts[:, 1] + pos.y())
+    out.set_style(**page.stroke(item.pen()))
+    out.polyline(xs, ys)
+
+
+def _write_matching_path(out, item, page):
+    transform = chart_transform_for(item)
+    if transform is None:
+        return
+    scale = transform.radius * page.scale
+    for move in item.moves:
+        center, radius, start, end = arc_geometry(move)
+        cx, cy = page.xy(*transform.complex_to_scene(center))
+        out.set_style(stroke=_rgba(MOVE_COLORS[move.kind]), width=2.0)
+        out.arc(float(cx), float(cy), radius * scale, -start, -end)
+
+    # Junctions between elements
+    out.set_style(fill=(0, 0, 0, 255))
+    for move in item.moves[1:]:
+        x, y = page.xy(*transform.complex_to_scene(gamma_of(move.z_start)))
+        out.circle(float(x), float(y), 3 * page.scale)
+
+
+def _write_text_item(out, item, page):
+    # Lines as laid out by the item's document, so wrapping matches the screen
+    doc = item.document()
+    color = _rgba(item.defaultTextColor())
+    size = QFontInfo(item.font()).pixelSize() * page.scale
+    block = doc.begin()
+    while block.isValid():
+        layout = block.layout()
+        text = block.text()
+        for i in range(layout.lineCount()):
+            line = layout.lineAt(i)
+            origin = layout.position() + line.position() + QPointF(0, line.ascent())
+            x, y = page.point(item.mapToScene(origin))
+            out.text(x, y, text[line.textStart():line.textStart() + line.textLength()], size, color)
+        block = block.next()
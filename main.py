@@ -1,14 +1,48 @@
-from PyQt5.QtWidgets import QApplication
 import sys
+import time
+
+_T0 = time.perf_counter()
+
+from PyQt5.QtWidgets import QApplication
+_T_QT = time.perf_counter()
+
 from ui.main_window import MainWindow
+_T_UI = time.perf_counter()
 
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "export":
+        from core.batch_export import main as export_main
+        sys.exit(export_main(sys.argv[2:]))
+
+    if "--profile-startup" in sys.argv:
+        sys.argv.remove("--profile-startup")
+        return profile_startup()
+
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
     sys.exit(app.exec_())
 
 
+def profile_startup():
+    from core.startup_profile import StartupProfiler
+
+    profiler = StartupProfiler(_T0)
+    profiler.mark("import PyQt5", _T_QT)
+    profiler.mark("import app modules", _T_UI)
+
+    app = QApplication(sys.argv)
+    profiler.mark("QApplication")
+    window = MainWindow()
+    profiler.mark("MainWindow()")
+    window.show()
+    profiler.mark("show()")
+
+    profiler.watch_first_paint(window.view.viewport(), app.quit)
+    app.exec_()
+    print(profiler.report())
+
+
 if __name__ == "__main__":
     main()
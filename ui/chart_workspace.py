@@ -0,0 +1,133 @@
+from PyQt5.QtWidgets import QWidget, QTabWidget, QGridLayout, QVBoxLayout, QUndoGroup
+from PyQt5.QtCore import pyqtSignal
+from core.smith_chart_view import SmithChartView
+from core.chart_resources import ChartResources
+import math
+
+
+class ChartWorkspace(QWidget):
+    """Several SmithChartViews, as tabs or tiled in a grid, over one ChartResources.
+
+    Every view draws its background from the shared resources and snaps through the
+    shared index, so adding a chart only costs its own scene. With `linked` set,
+    panning or zooming one view applies the same transform to the others.
+    """
+
+    current_changed = pyqtSignal(object)
+    chart_added = pyqtSignal(object)
+
+    def __init__(self, background_mode="auto", resources=None, parent=None):
+        super().__init__(parent)
+        self.background_mode = background_mode
+        self.resources = resources if resources is not None else ChartResources()
+        self.views = []
+        self.linked = False
+        self.tiled = False
+        self.undo_group = QUndoGroup(self)
+        self._current = None
+        self._syncing = False
+
+        self.tabs = QTabWidget()
+        self.tabs.setTabsClosable(True)
+        self.tabs.currentChanged.connect(self._on_tab_changed)
+        self.tabs.tabCloseRequested.connect(lambda i: self.close_chart(self.tabs.widget(i)))
+        self.grid_widget = QWidget()
+        self.grid = QGridLayout(self.grid_widget)
+        self.grid.setContentsMargins(0, 0, 0, 0)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.tabs)
+        layout.addWidget(self.grid_widget)
+        self.grid_widget.hide()
+
+    def current_view(self):
+        return self._current
+
+    def add_chart(self, title=None):
+        view = SmithChartView(background_mode=self.background_mode, resources=self.resources)
+        view.chart_title = title or f"Chart {len(self.views) + 1}"
+        self.views.append(view)
+        self.undo_group.addStack(view.undo_stack)
+        view.activated.connect(lambda v=view: self.set_current(v))
+        view.viewport_changed.connect(lambda v=view: self._sync_from(v))
+        self._place_views()
+        self.chart_added.emit(view)
+        self.set_current(view)
+        if self.linked and len(self.views) > 1:
+            self._sync_from(self.views[0])
+        return view
+
+    def close_chart(self, view):
+        if view not in self.views or len(self.views) == 1:
+            return
+        view.stop_playback()
+        self.views.remove(view)
+        self.undo_group.removeStack(view.undo_stack)
+        if self.tiled:
+            self.grid.removeWidget(view)
+        else:
+            self.tabs.removeTab(self.tabs.indexOf(view))
+        view.deleteLater()
+        if self._current is view:
+            self.set_current(self.views[-1])
+        self._place_views()
+
+    def set_current(self, view):
+        if view is self._current:
+            return
+        self._current = view
+        self.undo_group.setActiveStack(view.undo_stack)
+        if not self.tiled:
+            self.tabs.setCurrentWidget(view)
+        self.current_changed.emit(view)
+
+    def _on_tab_changed(self, index):
+        view = self.tabs.widget(index)
+        if view is not None and not self.tiled:
+            self.set_current(view)
+
+    def set_tiled(self, tiled):
+        if tiled == self.tiled:
+            return
+        self.tiled = tiled
+        for view in self.views:
+            if tiled:
+                self.tabs.removeTab(self.tabs.indexOf(view))
+            else:
+                self.grid.removeWidget(view)
+        self.tabs.setVisible(not tiled)
+        self.grid_widget.setVisible(tiled)
+        self._place_views()
+        for view in self.views:
+            view.show()
+
+    def _place_views(self):
+        if self.tiled:
+            columns = max(1, math.ceil(math.sqrt(len(self.views))))
+            for i, view in enumerate(self.views):
+                self.grid.addWidget(view, i // columns, i % columns)
+        else:
+            for view in self.views:
+                if self.tabs.indexOf(view) < 0:
+                    self.tabs.addTab(view, view.chart_title)
+
+    # Linked pan / zoom
+
+    def set_linked(self, linked):
+        self.linked = linked
+        if linked and self._current is not None:
+            self._sync_from(self._current)
+
+    def _sync_from(self, source):
+        if not self.linked or self._syncing:
+            return
+        self._syncing = True
+        try:
+            center = source.mapToScene(source.viewport().rect().center())
+            for view in self.views:
+                if view is not source:
+                    view.setTransform(source.transform())
+                    view.centerOn(center)
+        finally:
+            self._syncing = False
@@ -1,5 +1,16 @@
-from PyQt5.QtWidgets import QMainWindow, QVBoxLayout, QPushButton, QWidget, QHBoxLayout
-from core.smith_chart_view import SmithChartView
+from PyQt5.QtWidgets import (QMainWindow, QVBoxLayout, QPushButton, QWidget, QHBoxLayout, QFileDialog,
+                             QMessageBox, QShortcut, QSlider, QLabel, QProgressBar)
+from PyQt5.QtGui import QKeySequence
+from PyQt5.QtCore import QTimer, Qt
+from core.session import SessionStore, SESSION_SUFFIX
+from core.vector_export import export_vector
+from core.chart_api import run_script
+from utils.readout import format_cursor
+from ui.chart_workspace import ChartWorkspace
+import os
+
+SWEEP_SLIDER_STEPS = 100000
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -9,35 +20,300 @@ class MainWindow(QMainWindow):
         # self.setMinimumSize(800, 600)
         # self.setMaximumSize(1600, 1200)
 
-        # Initialize the SmithChartView
+        # Charts live in a workspace; the buttons act on the current one
+        self.workspace = ChartWorkspace()
+        self.workspace.chart_added.connect(self.on_chart_added)
+        self.cursor_label = QLabel("")
+        self.workspace.add_chart()
+        self.workspace.current_changed.connect(self.on_current_chart_changed)
+        self.sessions = {}
+        self.trace_load = None
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.setInterval(30000)
+        self.autosave_timer.timeout.connect(self.autosave)
+        self.init_ui()
 
+    @property
+    def view(self):
+        return self.workspace.current_view()
 
-        self.view = SmithChartView()
-        self.init_ui()
+    @property
+    def session(self):
+        return self.sessions.get(self.view)
+
+    @session.setter
+    def session(self, store):
+        self.sessions[self.view] = store
 
     def init_ui(self):
         add_point = QPushButton("Add Point")
         add_arrow = QPushButton("Add Arrow")
         add_text = QPushButton("Add Text")
         add_circle = QPushButton("Add Circle")
+        add_match = QPushButton("Add Match")
+        import_data = QPushButton("Import Touchstone")
+        save_session = QPushButton("Save Session")
+        open_session = QPushButton("Open Session")
+        export_chart = QPushButton("Export")
+        run_script = QPushButton("Run Script")
+
+        new_chart = QPushButton("New Chart")
+        tile_charts = QPushButton("Tile")
+        tile_charts.setCheckable(True)
+        link_charts = QPushButton("Link Views")
+        link_charts.setCheckable(True)
 
-        add_point.clicked.connect(self.view.add_point)
-        add_arrow.clicked.connect(self.view.add_arrow)
-        add_text.clicked.connect(self.view.add_text)
-        add_circle.clicked.connect(self.view.add_circle)
+        add_point.clicked.connect(lambda: self.view.add_point())
+        add_arrow.clicked.connect(lambda: self.view.add_arrow())
+        add_text.clicked.connect(lambda: self.view.add_text())
+        add_circle.clicked.connect(lambda: self.view.add_circle())
+        add_match.clicked.connect(lambda: self.view.add_matching_path())
+        new_chart.clicked.connect(lambda: self.workspace.add_chart())
+        tile_charts.toggled.connect(self.workspace.set_tiled)
+        link_charts.toggled.connect(self.workspace.set_linked)
+        import_data.clicked.connect(self.import_touchstone)
+        save_session.clicked.connect(self.save_session)
+        open_session.clicked.connect(self.open_session)
+        export_chart.clicked.connect(self.export_chart)
+        run_script.clicked.connect(self.run_script)
 
         button_layout = QHBoxLayout()
         button_layout.addWidget(add_point)
         button_layout.addWidget(add_arrow)
         button_layout.addWidget(add_text)
         button_layout.addWidget(add_circle)
+        button_layout.addWidget(add_match)
+        button_layout.addWidget(import_data)
+        button_layout.addWidget(save_session)
+        button_layout.addWidget(open_session)
+        button_layout.addWidget(export_chart)
+        button_layout.addWidget(run_script)
+        button_layout.addWidget(new_chart)
+        button_layout.addWidget(tile_charts)
+        button_layout.addWidget(link_charts)
+
+        # Sweep playback: scrub or animate a marker along an imported trace by frequency
+        self.play_button = QPushButton("Play")
+        self.play_button.setCheckable(True)
+        self.play_button.toggled.connect(self.toggle_playback)
+        self.sweep_slider = QSlider(Qt.Horizontal)
+        self.sweep_slider.setRange(0, SWEEP_SLIDER_STEPS)
+        self.sweep_slider.valueChanged.connect(self.scrub_sweep)
+        self.sweep_label = QLabel("")
+        playback_layout = QHBoxLayout()
+        playback_layout.addWidget(self.play_button)
+        playback_layout.addWidget(self.sweep_slider, 1)
+        playback_layout.addWidget(self.sweep_label)
+        self.set_playback_enabled(False)
 
         layout = QVBoxLayout()
         layout.addLayout(button_layout)
-        layout.addWidget(self.view)
+        layout.addWidget(self.workspace)
+        layout.addLayout(playback_layout)
 
         container = QWidget()
         container.setLayout(layout)
         self.setCentralWidget(container)
 
+        # Touchstone imports run in the background; progress and cancel sit in the status bar
+        self.load_progress = QProgressBar()
+        self.load_progress.setMaximumWidth(200)
+        self.load_cancel = QPushButton("Cancel")
+        self.load_cancel.clicked.connect(self.cancel_import)
+        self.statusBar().addWidget(self.cursor_label, 1)
+        self.statusBar().addPermanentWidget(self.load_progress)
+        self.statusBar().addPermanentWidget(self.load_cancel)
+        self.set_loading(False)
+
+        undo = self.workspace.undo_group.createUndoAction(self, "Undo")
+        undo.setShortcut(QKeySequence.Undo)
+        redo = self.workspace.undo_group.createRedoAction(self, "Redo")
+        redo.setShortcut(QKeySequence.Redo)
+        self.addActions([undo, redo])
+
+        # F3 (in the view) toggles the instrumentation HUD, F4 saves what it recorded
+        QShortcut(QKeySequence(Qt.Key_F4), self, self.export_instrumentation)
+
+    def import_touchstone(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Touchstone", "", "Touchstone (*.s1p *.s2p *.s*p);;All files (*)"
+        )
+        if not path:
+            return
+        self.cancel_import()
+        load = self.view.import_touchstone_async(path)
+        # A cancelled load still reports from its worker for a while; handlers
+        # ignore every load but the current one
+        load.progress.connect(lambda done, total, load=load: self.on_import_progress(load, done, total))
+        load.finished.connect(lambda trace, load=load: self.on_import_finished(load, trace))
+        load.failed.connect(lambda message, load=load: self.on_import_failed(load, message))
+        load.cancelled.connect(lambda load=load: self.on_import_cancelled(load))
+        self.trace_load = load
+        self.statusBar().showMessage(f"Loading {load.trace.name}...")
+        self.set_loading(True)
+
+    def cancel_import(self):
+        if self.trace_load is not None and self.trace_load.active:
+            self.trace_load.cancel()
+
+    def set_loading(self, loading):
+        self.load_progress.setVisible(loading)
+        self.load_cancel.setVisible(loading)
+        if loading:
+            self.load_progress.setValue(0)
+        else:
+            self.statusBar().clearMessage()
+
+    def on_import_progress(self, load, done, total):
+        if load is self.trace_load:
+            self.load_progress.setValue(int(100 * done / total) if total else 0)
+
+    def on_import_finished(self, load, trace):
+        if load is not self.trace_load:
+            return
+        self.set_loading(False)
+        if load.view is self.view:
+            self.attach_playback(trace)
+
+    def on_import_failed(self, load, message):
+        if load is not self.trace_load:
+            return
+        self.set_loading(False)
+        QMessageBox.warning(self, "Import failed", message)
+
+    def on_import_cancelled(self, load):
+        if load is self.trace_load:
+            self.set_loading(False)
+
+    def save_session(self):
+        if self.session is None:
+            path, _ = QFileDialog.getSaveFileName(self, "Save Session", "", f"Session (*{SESSION_SUFFIX})")
+            if not path:
+                return
+            self.session = SessionStore(path)
+        try:
+            self.session.save(self.view)
+        except OSError as e:
+            QMessageBox.warning(self, "Save failed", str(e))
+            return
+        self.autosave_timer.start()
+
+    def open_session(self):
+        path = QFileDialog.getExistingDirectory(self, "Open Session")
+        if not path:
+            return
+        store = SessionStore(path)
+        try:
+            store.load(self.view)
+        except (OSError, ValueError) as e:
+            QMessageBox.warning(self, "Open failed", str(e))
+            return
+        self.session = store
+        self.autosave_timer.start()
+        self.attach_playback()
+
+    def export_chart(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Chart", "", "SVG (*.svg);;PDF (*.pdf)")
+        if not path:
+            return
+        if os.path.splitext(path)[1].lower() not in (".svg", ".pdf"):
+            path += ".svg"
+        try:
+            export_vector(self.view, path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export failed", str(e))
+
+    def run_script(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Run Script", "", "Python (*.py)")
+        if not path:
+            return
+        try:
+            run_script(self.view, path)
+        except Exception as e:
+            # A broken script must not take the application down with it
+            QMessageBox.warning(self, "Script failed", f"{type(e).__name__}: {e}")
+
+    def on_chart_added(self, view):
+        view.readouts.cursor_changed.connect(self.on_cursor_readout)
+
+    def on_cursor_readout(self, readout):
+        self.cursor_label.setText(format_cursor(readout) if readout.mag <= 1 else "")
+
+    def on_current_chart_changed(self, view):
+        # Playback controls follow the current chart's player, if it has one
+        for other in self.workspace.views:
+            if other.playback is not None:
+                other.playback.pause()
+        self.play_button.setChecked(False)
+        player = view.playback
+        self.set_playback_enabled(player is not None)
+        if player is not None:
+            self.on_sweep_position(player.index)
+        else:
+            self.sweep_label.setText("")
+
+    def set_playback_enabled(self, enabled):
+        for widget in (self.play_button, self.sweep_slider, self.sweep_label):
+            widget.setEnabled(enabled)
+
+    def attach_playback(self, trace=None):
+        self.play_button.setChecked(False)
+        player = self.view.start_playback(trace)
+        self.set_playback_enabled(player is not None)
+        if player is not None:
+            player.position_changed.connect(self.on_sweep_position)
+            player.playing_changed.connect(self.on_playing_changed)
+            self.on_sweep_position(player.index)
+
+    def toggle_playback(self, playing):
+        player = self.view.playback
+        if player is None:
+            return
+        if playing:
+            player.play()
+        else:
+            player.pause()
+
+    def scrub_sweep(self, value):
+        player = self.view.playback
+        if player is not None:
+            player.set_fraction(value / SWEEP_SLIDER_STEPS)
+
+    def on_sweep_position(self, index):
+        player = self.view.playback
+        if player is None or self.sender() not in (None, player):
+            return
+        self.sweep_label.setText(player.readout(index).replace("\n", "   "))
+        self.sweep_slider.blockSignals(True)
+        self.sweep_slider.setValue(int(round(player.fraction() * SWEEP_SLIDER_STEPS)))
+        self.sweep_slider.blockSignals(False)
+
+    def on_playing_changed(self, playing):
+        # Playback also stops by itself at the end of the sweep
+        if self.view.playback is not self.sender():
+            return
+        self.play_button.setChecked(playing)
+
+    def export_instrumentation(self):
+        instrumentation = self.view.instrumentation
+        if not instrumentation.frames:
+            QMessageBox.information(self, "Export trace", "Press F3 to record frames first.")
+            return
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Instrumentation Trace", "", "JSON (*.json);;CSV (*.csv)"
+        )
+        if not path:
+            return
+        try:
+            instrumentation.export(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export failed", str(e))
 
+    def autosave(self):
+        for view, store in list(self.sessions.items()):
+            if store is None or view not in self.workspace.views:
+                continue
+            try:
+                store.save(view)
+            except OSError as e:
+                print(f"Autosave failed: {e}")
@@ -0,0 +1,84 @@
+# smith_chart_qt/utils/geometry.py
+import numpy as np
+
+
+class ChartTransform:
+    """Maps between the normalized Γ plane and scene coordinates.
+
+    The chart's unit circle sits at scene (cx, cy) with radius `radius`; scene y
+    points down, Γ imaginary points up. Every method takes scalars or arrays.
+    """
+
+    def __init__(self, cx, cy, radius):
+        self.cx = float(cx)
+        self.cy = float(cy)
+        self.radius = float(radius)
+
+    def __repr__(self):
+        return f"ChartTransform(cx={self.cx}, cy={self.cy}, radius={self.radius})"
+
+    def __eq__(self, other):
+        return (isinstance(other, ChartTransform) and
+                (self.cx, self.cy, self.radius) == (other.cx, other.cy, other.radius))
+
+    def gamma_to_scene(self, gr, gi):
+        return self.cx + self.radius * np.asarray(gr), self.cy - self.radius * np.asarray(gi)
+
+    def scene_to_gamma(self, x, y):
+        return (np.asarray(x) - self.cx) / self.radius, (self.cy - np.asarray(y)) / self.radius
+
+    def complex_to_scene(self, gamma):
+        gamma = np.asarray(gamma)
+        return self.gamma_to_scene(gamma.real, gamma.imag)
+
+    def scene_to_complex(self, x, y):
+        gr, gi = self.scene_to_gamma(x, y)
+        return gr + 1j * gi
+
+    def length_to_gamma(self, length):
+        return length / self.radius
+
+    def length_to_scene(self, length):
+        return length * self.radius
+
+    def snap_scene(self, x, y, snapper, tolerance=0.05):
+        """Snap a scene point with a Γ-plane snapper; tolerance is in Γ units."""
+        gr, gi = self.scene_to_gamma(x, y)
+        sr, si = snapper.snap(float(gr), float(gi), tolerance)
+        sx, sy = self.gamma_to_scene(sr, si)
+        return float(sx), float(sy)
+
+    def snap_scene_many(self, xs, ys, snapper, tolerance=0.05):
+        gr, gi = self.scene_to_gamma(xs, ys)
+        sr, si = snapper.snap_many(gr, gi, tolerance)
+        return self.gamma_to_scene(sr, si)
+
+
+def reactance_arc(x):
+    """Constant-x arc inside the unit circle as (cx, cy, radius, start, end) in the Γ plane.
+
+    The arc runs from Γ = 1 to where it meets the unit circle again; angles are in
+    radians, counter-clockwise positive, and `end` may be below `start`.
+    """
+    cy = 1 / x
+    px = (x * x - 1) / (x * x + 1)
+    py = 2 * x / (x * x + 1)
+    end = np.arctan2(py - cy, px - 1)
+    if x > 0:
+        start = -np.pi / 2
+        return 1.0, cy, 1 / abs(x), start, start - (start - end) % (2 * np.pi)
+    start = np.pi / 2
+    return 1.0, cy, 1 / abs(x), start, start + (end - start) % (2 * np.pi)
+
+
+def gamma_to_impedance(gamma):
+    """Normalized impedance z = (1 + Γ) / (1 - Γ)."""
+    gamma = np.asarray(gamma, dtype=complex)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (1 + gamma) / (1 - gamma)
+
+
+def impedance_to_gamma(z):
+    z = np.asarray(z, dtype=complex)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (z - 1) / (z + 1)
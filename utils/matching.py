@@ -0,0 +1,188 @@
+# smith_chart_qt/utils/matching.py
+"""Analytic matching-network moves on the Smith chart.
+
+A move is one element added to a network and follows a chart curve exactly:
+series L/C moves along a constant-r circle, shunt L/C along a constant-g circle
+and a transmission line along a constant-|Γ| circle. Impedances are normalized
+to z0; component values come out in henries, farads and wavelengths.
+"""
+import cmath
+import math
+import numpy as np
+
+SERIES = "series"
+SHUNT = "shunt"
+LINE = "line"
+
+ARC_SAMPLES = 64
+
+
+class Move:
+    __slots__ = ("kind", "z_start", "z_end", "turn")
+
+    def __init__(self, kind, z_start, z_end, turn=0.0):
+        self.kind = kind
+        self.z_start = complex(z_start)
+        self.z_end = complex(z_end)
+        # Line moves only: rotation toward the generator in radians of Γ angle
+        self.turn = turn
+
+    def __repr__(self):
+        return f"Move({self.kind!r}, {self.z_start:.4g}, {self.z_end:.4g})"
+
+    @property
+    def reactance(self):
+        """Normalized series reactance (series) or shunt susceptance (shunt) of the element."""
+        if self.kind == SERIES:
+            return self.z_end.imag - self.z_start.imag
+        if self.kind == SHUNT:
+            return (1 / self.z_end).imag - (1 / self.z_start).imag
+        return 0.0
+
+    def component(self, freq, z0=50.0):
+        """(name, value, unit) of the element at `freq` Hz on a `z0` ohm system."""
+        w = 2 * math.pi * freq
+        value = self.reactance
+        if self.kind == LINE:
+            return "TL", self.turn / (4 * math.pi), "λ"
+        if abs(value) < 1e-12:
+            return ("L" if self.kind == SERIES else "C"), 0.0, ("H" if self.kind == SERIES else "F")
+        if self.kind == SERIES:
+            if value > 0:
+                return "L", value * z0 / w, "H"
+            return "C", 1 / (w * -value * z0), "F"
+        if value > 0:
+            return "C", value / (w * z0), "F"
+        return "L", z0 / (w * -value), "H"
+
+    def label(self, freq, z0=50.0):
+        name, value, unit = self.component(freq, z0)
+        where = "" if self.kind == LINE else f"{self.kind} "
+        return f"{where}{name} = {format_si(value, unit)}"
+
+
+def format_si(value, unit):
+    if unit == "λ":
+        return f"{value:.4f} λ"
+    for prefix, scale in (("", 1), ("m", 1e-3), ("µ", 1e-6), ("n", 1e-9), ("p", 1e-12), ("f", 1e-15)):
+        if abs(value) >= scale:
+            return f"{value / scale:.3g} {prefix}{unit}"
+    return f"0 {unit}"
+
+
+def gamma_of(z):
+    return (z - 1) / (z + 1)
+
+
+# Arc geometry
+
+def _arc_angles(center, g_start, g_end, excluded):
+    # Angles are measured from the one point a finite element never reaches
+    # (Γ = 1 for series, Γ = -1 for shunt), so the arc runs the way the element
+    # actually moves.
+    a0 = (cmath.phase(g_start - center) - excluded) % (2 * math.pi)
+    a1 = (cmath.phase(g_end - center) - excluded) % (2 * math.pi)
+    return excluded + a0, excluded + a1
+
+
+def arc_geometry(move):
+    """(center, radius, start, end) of the move's chart curve in the Γ plane.
+
+    The curve runs from angle `start` to `end` (radians, counter-clockwise positive,
+    either direction) around the complex `center`.
+    """
+    g0, g1 = gamma_of(move.z_start), gamma_of(move.z_end)
+    if move.kind == SERIES:
+        r = move.z_start.real
+        center = r / (1 + r)
+        return (center, 1 / (1 + r)) + _arc_angles(center, g0, g1, 0.0)
+    if move.kind == SHUNT:
+        g = (1 / move.z_start).real
+        center = -g / (1 + g)
+        return (center, 1 / (1 + g)) + _arc_angles(center, g0, g1, math.pi)
+    start = cmath.phase(g0)
+    return 0j, abs(g0), start, start - move.turn
+
+
+def arc_points(move, n=ARC_SAMPLES):
+    """Γ of `n` points along the move's chart curve, as a complex array."""
+    center, radius, start, end = arc_geometry(move)
+    return center + radius * np.exp(1j * np.linspace(start, end, n))
+
+
+def path_points(moves, n=ARC_SAMPLES):
+    if not moves:
+        return np.empty(0, dtype=complex)
+    return np.concatenate([arc_points(move, n) for move in moves])
+
+
+# Analytic moves
+
+def series_move(z, x):
+    return Move(SERIES, z, z + 1j * x)
+
+
+def shunt_move(z, b):
+    y = 1 / z + 1j * b
+    return Move(SHUNT, z, 1 / y)
+
+
+def line_move(z, length):
+    """Transmission line of `length` wavelengths toward the generator."""
+    turn = 4 * math.pi * length
+    g = gamma_of(z) * cmath.exp(-1j * turn)
+    return Move(LINE, z, (1 + g) / (1 - g), turn)
+
+
+def l_network_solutions(z_load):
+    """Every lossless L-network matching normalized `z_load` to 1.
+
+    Returns a list of move pairs, the element at the load first. A series element
+    at the load works when r <= 1 (it moves z onto the g = 1 circle), a shunt
+    element at the load when g <= 1 (onto the r = 1 circle); each gives two
+    solutions, one per intersection.
+    """
+    z = complex(z_load)
+    if z.real <= 0:
+        return []
+    y = 1 / z
+    solutions = []
+
+    if y.real <= 1:
+        for sign in (1, -1):
+            b_total = sign * math.sqrt(y.real * (1 - y.real))
+            first = shunt_move(z, b_total - y.imag)
+            solutions.append((first, series_move(first.z_end, -first.z_end.imag)))
+
+    if z.real <= 1:
+        for sign in (1, -1):
+            x_total = sign * math.sqrt(z.real * (1 - z.real))
+            first = series_move(z, x_total - z.imag)
+            solutions.append((first, shunt_move(first.z_end, -(1 / first.z_end).imag)))
+    return solutions
+
+
+def line_shunt_solutions(z_load):
+    """Series line then shunt element (a single-stub match), two solutions.
+
+    The line rotates Γ at constant |Γ| until it meets the g = 1 circle, where
+    Re Γ = -|Γ|², and the shunt element cancels the remaining susceptance.
+    """
+    z = complex(z_load)
+    if z.real <= 0:
+        return []
+    g = gamma_of(z)
+    rho = abs(g)
+    if rho < 1e-12:
+        return []
+    solutions = []
+    for sign in (1, -1):
+        target = complex(-rho * rho, sign * rho * math.sqrt(max(1 - rho * rho, 0.0)))
+        turn = (cmath.phase(g) - cmath.phase(target)) % (2 * math.pi)
+        first = line_move(z, turn / (4 * math.pi))
+        solutions.append((first, shunt_move(first.z_end, -(1 / first.z_end).imag)))
+    return solutions
+
+
+def path_end_error(moves, z_target=1.0):
+    return abs(gamma_of(moves[-1].z_end) - gamma_of(complex(z_target))) if moves else float("inf")
@@ -0,0 +1,114 @@
+# smith_chart_qt/utils/readout.py
+"""Derived quantities of Γ-plane positions for labels and the cursor readout.
+
+readout_arrays() computes everything for an array of positions in one
+vectorized pass. ReadoutCache memoizes rows by quantized position with LRU
+eviction, so labels that sit still, and a cursor hovering around the same spot,
+are not recomputed.
+"""
+from collections import OrderedDict, namedtuple
+import numpy as np
+
+READOUT_FIELDS = ("gr", "gi", "mag", "angle", "r", "x", "g", "b", "vswr", "return_loss")
+
+# One position: Γ (real, imag), |Γ|, arg Γ in degrees, z = r + jx, y = g + jb,
+# VSWR and return loss in dB (inf at a perfect match)
+Readout = namedtuple("Readout", READOUT_FIELDS)
+
+
+def readout_arrays(gr, gi):
+    """(n, len(READOUT_FIELDS)) array of every readout quantity for Γ = gr + j gi."""
+    gamma = np.asarray(gr, dtype=float) + 1j * np.asarray(gi, dtype=float)
+    mag = np.abs(gamma)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (1 + gamma) / (1 - gamma)
+        y = (1 - gamma) / (1 + gamma)
+        vswr = np.where(mag < 1, (1 + mag) / (1 - mag), np.inf)
+        return_loss = -20 * np.log10(mag)
+    return np.column_stack([gamma.real, gamma.imag, mag, np.degrees(np.angle(gamma)),
+                            z.real, z.imag, y.real, y.imag, vswr, return_loss])
+
+
+def quantize(gr, gi, quantum):
+    """Cache keys and key centres (gr, gi) for positions, on a grid that shrinks where z, y move fast.
+
+    dz/dΓ = 2 / (1 - Γ)², dy/dΓ = -2 / (1 + Γ)², so a step of quantum * |1 ∓ Γ|² keeps
+    z and y within about 1.4 * quantum of the values at the key centre; |Γ| does the same
+    for the angle. Steps are rounded down to powers of two so a key names one grid cell.
+    """
+    gr = np.asarray(gr, dtype=float)
+    gi = np.asarray(gi, dtype=float)
+    gamma = gr + 1j * gi
+    bound = quantum * np.minimum.reduce([np.abs(1 - gamma) ** 2, np.abs(1 + gamma) ** 2, np.abs(gamma)])
+    _, exponent = np.frexp(bound)
+    step = np.ldexp(1.0, exponent - 1)
+    qr = np.rint(gr / step)
+    qi = np.rint(gi / step)
+    # At the open and short circuits and the centre: exact keys
+    exact = ~(bound > 0)
+    step[exact] = 1.0
+    qr[exact] = gr[exact]
+    qi[exact] = gi[exact]
+    exponent[exact] = 0
+    keys = list(zip(exponent.tolist(), qr.tolist(), qi.tolist()))
+    return keys, qr * step, qi * step
+
+
+class ReadoutCache:
+    def __init__(self, quantum=2e-3, capacity=16384):
+        self.quantum = quantum
+        self.capacity = capacity
+        self._rows = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._rows)
+
+    def lookup(self, gr, gi):
+        return self.lookup_many([gr], [gi])[0]
+
+    def lookup_many(self, gr, gi):
+        """Readouts for each position; only positions not cached are computed, in one call."""
+        keys, gr, gi = quantize(gr, gi, self.quantum)
+
+        rows = self._rows
+        result = [rows.get(key) for key in keys]
+        missing = [i for i, row in enumerate(result) if row is None]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        for key, row in zip(keys, result):
+            if row is not None:
+                rows.move_to_end(key)
+
+        if missing:
+            # Computed at the key centre, so a key always maps to the same values
+            for i, values in zip(missing, readout_arrays(gr[missing], gi[missing]).tolist()):
+                row = Readout(*values)
+                result[i] = row
+                rows[keys[i]] = row
+            while len(rows) > self.capacity:
+                rows.popitem(last=False)
+        return result
+
+    def clear(self):
+        self._rows.clear()
+
+
+def _signed(value):
+    return f"{'+' if value >= 0 else '-'} j{abs(value):.2f}"
+
+
+def format_impedance(readout):
+    if not np.isfinite(readout.r):
+        return "z = ∞"
+    return f"z = {readout.r:.2f} {_signed(readout.x)}"
+
+
+def format_cursor(readout):
+    """One-line summary of every quantity, for the status bar."""
+    vswr = f"{readout.vswr:.2f}" if np.isfinite(readout.vswr) else "∞"
+    rl = f"{readout.return_loss:.1f} dB" if np.isfinite(readout.return_loss) else "∞"
+    y = f"y = {readout.g:.2f} {_signed(readout.b)}" if np.isfinite(readout.g) else "y = ∞"
+    return (f"Γ = {readout.mag:.3f} ∠ {readout.angle:.1f}°   {format_impedance(readout)}   {y}   "
+            f"VSWR = {vswr}   RL = {rl}")
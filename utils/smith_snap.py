@@ -22,35 +22,317 @@ def generate_smith_values():
 r_values, x_values = generate_smith_values()
 
 
+def smith_circles(r_vals, x_vals, g_vals=(), b_vals=(), vswr_vals=()):
+    """Centers and radii of all snap curves, in the order snap_to_smith visits them.
+
+    Admittance (g/b) and constant-|Γ| (VSWR) circles are appended after the r/x curves.
+    """
+    r_vals = np.asarray(r_vals, dtype=float)
+    x_vals = np.asarray(x_vals, dtype=float)
+    g_vals = np.asarray(g_vals, dtype=float)
+    b_vals = np.asarray(b_vals, dtype=float)
+    vswr_vals = np.asarray(vswr_vals, dtype=float)
+
+    # Resistance circles (center = (r/(1+r), 0), radius = 1/(1+r))
+    r_cx = r_vals / (1 + r_vals)
+    r_cy = np.zeros_like(r_vals)
+    r_radius = 1 / (1 + r_vals)
+
+    # Reactance arcs (center = (1, ±1/x), radius = 1/|x|), +x then -x for each value
+    x_cx, x_cy, x_radius = _arc_pairs(1, x_vals)
+
+    # Conductance circles mirror the resistance circles through the origin
+    g_cx = -g_vals / (1 + g_vals)
+    g_cy = np.zeros_like(g_vals)
+    g_radius = 1 / (1 + g_vals)
+
+    # Susceptance arcs (center = (-1, ±1/b), radius = 1/|b|)
+    b_cx, b_cy, b_radius = _arc_pairs(-1, b_vals)
+
+    # Constant-|Γ| circles around the origin, |Γ| = (s - 1) / (s + 1)
+    v_cx = np.zeros_like(vswr_vals)
+    v_cy = np.zeros_like(vswr_vals)
+    v_radius = (vswr_vals - 1) / (vswr_vals + 1)
+
+    cx = np.concatenate([r_cx, x_cx, g_cx, b_cx, v_cx])
+    cy = np.concatenate([r_cy, x_cy, g_cy, b_cy, v_cy])
+    radius = np.concatenate([r_radius, x_radius, g_radius, b_radius, v_radius])
+    return cx, cy, radius
+
+
+def _arc_pairs(center_x, vals):
+    cx = np.full(2 * len(vals), float(center_x))
+    cy = np.empty(2 * len(vals))
+    cy[0::2] = 1 / vals
+    cy[1::2] = -1 / vals
+    radius = np.repeat(1 / np.abs(vals), 2)
+    return cx, cy, radius
+
+
+class PolarSnapIndex:
+    """Polar bucket grid over the Γ plane.
+
+    Each (ring, sector) cell stores the curves that pass within `tolerance` of it, so a
+    lookup only has to test the handful of curves near the cursor. Points beyond
+    `r_max` fall into a single outer bucket holding the curves that reach that far.
+    Candidate lists are stored CSR-style (one offsets array, one flat index array).
+    """
+
+    def __init__(self, cx, cy, radius, tolerance=0.05, n_rings=48, n_sectors=96, r_max=1.25):
+        self.tolerance = tolerance
+        self.n_rings = n_rings
+        self.n_sectors = n_sectors
+        self.r_max = r_max
+        self.ring_step = r_max / n_rings
+        self.sector_step = 2 * np.pi / n_sectors
+
+        theta0 = -np.pi + self.sector_step * np.arange(n_sectors)
+        theta1 = theta0 + self.sector_step
+        theta_mid = theta0 + self.sector_step / 2
+
+        buckets = []
+        for k in range(n_rings):
+            rho_in = k * self.ring_step
+            rho_out = rho_in + self.ring_step
+            rho_mid = (rho_in + rho_out) / 2
+            mid_x = rho_mid * np.cos(theta_mid)
+            mid_y = rho_mid * np.sin(theta_mid)
+
+            # Farthest point of an annular sector from its midpoint is one of its corners
+            bound = np.zeros(n_sectors)
+            for rho in (rho_in, rho_out):
+                for theta in (theta0, theta1):
+                    d = np.hypot(rho * np.cos(theta) - mid_x, rho * np.sin(theta) - mid_y)
+                    bound = np.maximum(bound, d)
+
+            center_dist = np.hypot(mid_x[:, None] - cx, mid_y[:, None] - cy)
+            near = np.abs(center_dist - radius) <= (bound + tolerance)[:, None] + 1e-12
+            buckets.extend(np.flatnonzero(row) for row in near)
+
+        # Curves that leave the gridded disc can be near points outside it
+        reach = np.hypot(cx, cy) + radius
+        buckets.append(np.flatnonzero(reach > r_max - tolerance - 1e-12))
+
+        sizes = np.array([len(b) for b in buckets])
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)])
+        self.indices = np.concatenate(buckets).astype(np.intp)
+        self.outer_cell = len(buckets) - 1
+
+    def cell_of(self, x, y):
+        rho = np.hypot(x, y)
+        # Also catches NaN, which snaps to nothing and comes back unchanged
+        if not rho < self.r_max:
+            return self.outer_cell
+        ring = min(int(rho / self.ring_step), self.n_rings - 1)
+        sector = int((np.arctan2(y, x) + np.pi) / self.sector_step) % self.n_sectors
+        return ring * self.n_sectors + sector
+
+    def cells_of(self, xs, ys):
+        rho = np.hypot(xs, ys)
+        outside = ~(rho < self.r_max)
+        rho = np.where(outside, 0.0, rho)
+        ring = np.minimum((rho / self.ring_step).astype(np.intp), self.n_rings - 1)
+        sector = ((np.arctan2(ys, xs) + np.pi) / self.sector_step)
+        sector = np.where(outside, 0.0, sector).astype(np.intp) % self.n_sectors
+        cells = ring * self.n_sectors + sector
+        cells[outside] = self.outer_cell
+        return cells
+
+    def candidates(self, cell):
+        return self.indices[self.offsets[cell]:self.offsets[cell + 1]]
+
+
+# Below this many curves a full vectorized scan beats grouping a batch by index cell
+BATCH_INDEX_MIN_CURVES = 2048
+
+
+class SmithSnapper:
+    """Snaps points to the nearest curve using precomputed circle arrays.
+
+    With `indexed=True` lookups go through a PolarSnapIndex, so the cost per call stays
+    roughly flat as the number of curves grows. Calls with a tolerance larger than the
+    one the index was built for fall back to testing every curve.
+    """
+
+    def __init__(self, r_vals=None, x_vals=None, g_vals=(), b_vals=(), vswr_vals=(),
+                 indexed=True, index_tolerance=0.05):
+        if r_vals is None or x_vals is None:
+            r_vals, x_vals = generate_smith_values()
+        self.cx, self.cy, self.radius = smith_circles(r_vals, x_vals, g_vals, b_vals, vswr_vals)
+        self.index = None
+        if indexed:
+            self.index = PolarSnapIndex(self.cx, self.cy, self.radius, tolerance=index_tolerance)
+
+    def __len__(self):
+        return len(self.radius)
+
+    def _use_index(self, tolerance):
+        return self.index is not None and tolerance <= self.index.tolerance
+
+    def snap(self, x, y, tolerance=0.05):
+        if self._use_index(tolerance):
+            candidates = self.index.candidates(self.index.cell_of(x, y))
+            if len(candidates) == 0:
+                return x, y
+            cx = self.cx[candidates]
+            cy = self.cy[candidates]
+            radius = self.radius[candidates]
+        else:
+            candidates = None
+            cx, cy, radius = self.cx, self.cy, self.radius
+
+        dx = x - cx
+        dy = y - cy
+        dist = np.abs(np.hypot(dx, dy) - radius)
+
+        # Candidates are sorted, so ties still resolve to the first curve in visit order
+        i = int(np.argmin(dist))
+        if not dist[i] < tolerance:
+            return x, y
+
+        # Project with scalar ops so results match the per-circle loop bit for bit
+        theta = np.arctan2(dy[i], dx[i])
+        new_x = cx[i] + radius[i] * np.cos(theta)
+        new_y = cy[i] + radius[i] * np.sin(theta)
+        return new_x, new_y
+
+    def snap_many(self, xs, ys, tolerance=0.05, chunk_size=4096):
+        """Snap N points in one call. Returns two arrays; unsnapped points are passed through."""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        out_x = xs.copy()
+        out_y = ys.copy()
+
+        if not self._use_index(tolerance) or len(self) < BATCH_INDEX_MIN_CURVES:
+            for start in range(0, len(xs), chunk_size):
+                sl = slice(start, start + chunk_size)
+                self._snap_group(xs[sl], ys[sl], out_x[sl], out_y[sl], None, tolerance)
+            return out_x, out_y
+
+        # Group points by index cell and test each group against that cell's candidates
+        cells = self.index.cells_of(xs, ys)
+        order = np.argsort(cells, kind='stable')
+        sorted_cells = cells[order]
+        bounds = np.flatnonzero(np.diff(sorted_cells)) + 1
+        for group in np.split(order, bounds):
+            if len(group) == 0:
+                continue
+            candidates = self.index.candidates(cells[group[0]])
+            if len(candidates) == 0:
+                continue
+            gx, gy = out_x[group], out_y[group]
+            for start in range(0, len(group), chunk_size):
+                sl = slice(start, start + chunk_size)
+                self._snap_group(xs[group][sl], ys[group][sl], gx[sl], gy[sl], candidates, tolerance)
+            out_x[group] = gx
+            out_y[group] = gy
+
+        return out_x, out_y
+
+    def _snap_group(self, xs, ys, out_x, out_y, candidates, tolerance):
+        if candidates is None:
+            cx, cy, radius = self.cx, self.cy, self.radius
+        else:
+            cx, cy, radius = self.cx[candidates], self.cy[candidates], self.radius[candidates]
+
+        dx = xs[:, None] - cx
+        dy = ys[:, None] - cy
+        dist = np.abs(np.hypot(dx, dy) - radius)
+
+        idx = np.argmin(dist, axis=1)
+        rows = np.arange(len(idx))
+        hit = dist[rows, idx] < tolerance
+        if not hit.any():
+            return
+
+        idx = idx[hit]
+        rows = rows[hit]
+        theta = np.arctan2(dy[rows, idx], dx[rows, idx])
+        out_x[hit] = cx[idx] + radius[idx] * np.cos(theta)
+        out_y[hit] = cy[idx] + radius[idx] * np.sin(theta)
+
+
+# Adaptive grid. Level 0 holds the classic chart values; level 1 fills each band with
+# its step and every further level halves the steps, so each level contains all the
+# curves of the coarser ones and about twice as many. Bands are (low, high, step).
+GRID_LEVEL0 = (0.2, 0.5, 1, 2, 5, 10, 20, 50)
+GRID_BANDS = ((0, 1, 0.1), (1, 2, 0.2), (2, 5, 0.5), (5, 10, 1), (10, 20, 2), (20, 50, 10))
+VSWR_LEVEL0 = (1.5, 2, 3, 5, 10)
+VSWR_BANDS = ((1, 2, 0.1), (2, 5, 0.5), (5, 10, 1), (10, 20, 5))
+
+GRID_FIELDS = ("r", "x", "g", "b", "vswr")
+
+
+def band_values(level0, bands, level):
+    """Grid values of `level` for one family of curves (see GRID_BANDS)."""
+    if level <= 0:
+        return np.array(level0, dtype=float)
+    values = []
+    for low, high, step in bands:
+        step = step / 2 ** (level - 1)
+        values.append(low + step * np.arange(1, round((high - low) / step) + 1))
+    return np.unique(np.round(np.concatenate(values), 9))
+
+
+class GridLevels:
+    """Nested r/x grids, optionally with g/b and VSWR curves, from sparse to dense.
+
+    level_for_scale() picks the level for a zoom given in device pixels per unit of Γ,
+    going one level denser per doubling of the zoom, so the curves drawn and searched
+    per screen stay roughly constant. Snappers are built per level on first use.
+    """
+
+    def __init__(self, n_levels=6, admittance=False, vswr=False, base_scale=150.0):
+        self.n_levels = n_levels
+        self.admittance = admittance
+        self.vswr = vswr
+        self.base_scale = base_scale
+        self._values = {}
+        self._snappers = {}
+
+    def key(self):
+        return (self.n_levels, self.admittance, self.vswr, GRID_LEVEL0, GRID_BANDS, VSWR_LEVEL0, VSWR_BANDS)
+
+    def level_for_scale(self, pixels_per_unit):
+        if pixels_per_unit <= 0:
+            return 0
+        level = int(np.floor(np.log2(pixels_per_unit / self.base_scale)))
+        return min(self.n_levels - 1, max(0, level))
+
+    def values(self, level):
+        """{field: values} of every curve at `level`; fields not enabled are empty."""
+        level = min(self.n_levels - 1, max(0, level))
+        values = self._values.get(level)
+        if values is None:
+            rx = band_values(GRID_LEVEL0, GRID_BANDS, level)
+            gb = rx if self.admittance else np.empty(0)
+            s = band_values(VSWR_LEVEL0, VSWR_BANDS, level) if self.vswr else np.empty(0)
+            values = self._values[level] = {"r": rx, "x": rx, "g": gb, "b": gb, "vswr": s}
+        return values
+
+    def new_values(self, level):
+        """{field: values} of the curves `level` adds to the level below it."""
+        values = self.values(level)
+        if level <= 0:
+            return values
+        coarser = self.values(level - 1)
+        return {field: np.setdiff1d(values[field], coarser[field]) for field in GRID_FIELDS}
+
+    def snapper(self, level):
+        level = min(self.n_levels - 1, max(0, level))
+        snapper = self._snappers.get(level)
+        if snapper is None:
+            v = self.values(level)
+            snapper = self._snappers[level] = SmithSnapper(v["r"], v["x"], v["g"], v["b"], v["vswr"])
+        return snapper
+
+
+default_snapper = SmithSnapper(r_values, x_values)
+
+
 def snap_to_smith(x, y, tolerance=0.05):
-    closest_point = (x, y)
-    min_dist = float('inf')
-
-    # Snap to resistance circles (center = (r/(1+r), 0), radius = 1/(1+r))
-    for r in r_values:
-        center = r / (1 + r), 0
-        radius = 1 / (1 + r)
-        dx, dy = x - center[0], y - center[1]
-        dist_to_circle = abs(np.hypot(dx, dy) - radius)
-        if dist_to_circle < min_dist and dist_to_circle < tolerance:
-            theta = np.arctan2(dy, dx)
-            new_x = center[0] + radius * np.cos(theta)
-            new_y = center[1] + radius * np.sin(theta)
-            closest_point = (new_x, new_y)
-            min_dist = dist_to_circle
-
-    # Snap to reactance arcs (center = (1, ±1/x), radius = 1/|x|)
-    for xval in x_values:
-        for sign in [+1, -1]:
-            cx, cy = 1, sign * 1 / xval
-            r = 1 / abs(xval)
-            dx, dy = x - cx, y - cy
-            dist_to_arc = abs(np.hypot(dx, dy) - r)
-            if dist_to_arc < min_dist and dist_to_arc < tolerance:
-                theta = np.arctan2(dy, dx)
-                new_x = cx + r * np.cos(theta)
-                new_y = cy + r * np.sin(theta)
-                closest_point = (new_x, new_y)
-                min_dist = dist_to_arc
-
-    return closest_point
+    return default_snapper.snap(x, y, tolerance)
+
+
+def snap_many_to_smith(xs, ys, tolerance=0.05):
+    return default_snapper.snap_many(xs, ys, tolerance)
@@ -0,0 +1,165 @@
+# smith_chart_qt/utils/touchstone.py
+import os
+import re
+import numpy as np
+
+
+FREQ_UNITS = {"HZ": 1.0, "KHZ": 1e3, "MHZ": 1e6, "GHZ": 1e9}
+
+
+class TouchstoneData:
+    def __init__(self, freq, params, parameter="S", z0=50.0):
+        self.freq = freq        # (N,) Hz
+        self.params = params    # (N, n, n) complex, Z/Y normalized to z0
+        self.parameter = parameter
+        self.z0 = z0
+
+    def __len__(self):
+        return len(self.freq)
+
+    @property
+    def n_ports(self):
+        return self.params.shape[1]
+
+    def gamma(self, i=0, j=0):
+        """Normalized reflection coefficient of parameter (i, j), as a complex array."""
+        if not (0 <= i < self.n_ports and 0 <= j < self.n_ports):
+            raise ValueError(f"No parameter ({i}, {j}) in {self.n_ports}-port data")
+        p = self.params[:, i, j]
+        if self.parameter == "S":
+            return p
+        if self.parameter == "Z":
+            return (p - 1) / (p + 1)
+        if self.parameter == "Y":
+            return (1 - p) / (1 + p)
+        raise ValueError(f"Cannot convert {self.parameter}-parameters to a reflection coefficient")
+
+
+def ports_from_filename(path):
+    match = re.search(r"\.s(\d+)p$", path, re.IGNORECASE)
+    return int(match.group(1)) if match else None
+
+
+def parse_option_line(line):
+    options = {"unit": "GHZ", "parameter": "S", "format": "MA", "z0": 50.0}
+    tokens = line.lstrip("#").upper().split()
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        if token in FREQ_UNITS:
+            options["unit"] = token
+        elif token in ("S", "Y", "Z", "H", "G"):
+            options["parameter"] = token
+        elif token in ("MA", "DB", "RI"):
+            options["format"] = token
+        elif token == "R" and i + 1 < len(tokens):
+            options["z0"] = float(tokens[i + 1])
+            i += 1
+        i += 1
+    return options
+
+
+def _to_complex(a, b, fmt):
+    if fmt == "RI":
+        return a + 1j * b
+    mag = a if fmt == "MA" else 10 ** (a / 20)
+    return mag * np.exp(1j * np.deg2rad(b))
+
+
+def iter_touchstone(path, n_ports=None, chunk_lines=65536, progress=None):
+    """Parse a Touchstone file in chunks without reading all of the text at once.
+
+    Yields (options, freq, params) per chunk, with freq in Hz and params a complex
+    (k, n, n) array. Parsing stops at v1 noise data (frequency goes backwards) or
+    at a v2 [Noise Data] section. `progress(chars_read)` is called before each chunk.
+    """
+    n_ports = n_ports or ports_from_filename(path) or 1
+    options = parse_option_line("#")
+    per_record = 1 + 2 * n_ports * n_ports
+
+    two_port_order = "21_12"
+    pending = np.empty(0)
+    last_freq = -np.inf
+    lines = []
+    consumed = 0
+
+    def flush(values):
+        nonlocal last_freq
+        n = len(values) // per_record
+        records = values[:n * per_record].reshape(n, per_record)
+        rest = values[n * per_record:]
+
+        freq = records[:, 0] * FREQ_UNITS[options["unit"]]
+        # v1 two-port files append noise parameters with restarting frequencies
+        drops = np.flatnonzero(np.diff(np.concatenate([[last_freq], freq])) < 0)
+        stop = len(drops) > 0
+        if stop:
+            records = records[:drops[0]]
+            freq = freq[:drops[0]]
+        if len(freq):
+            last_freq = freq[-1]
+
+        pairs = records[:, 1:].reshape(len(records), -1, 2)
+        params = _to_complex(pairs[..., 0], pairs[..., 1], options["format"])
+        params = params.reshape(len(records), n_ports, n_ports)
+        if n_ports == 2 and two_port_order == "21_12":
+            # v1 two-port order is S11 S21 S12 S22
+            params = params.transpose(0, 2, 1)
+        return freq, params, rest, stop
+
+    with open(path, "r", errors="replace") as f:
+        for raw in f:
+            consumed += len(raw)
+            line = raw.split("!", 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith("#"):
+                options = parse_option_line(line)
+                continue
+            if line.startswith("["):
+                keyword = line.upper()
+                if keyword.startswith("[NUMBER OF PORTS]"):
+                    n_ports = int(line.split("]", 1)[1])
+                    per_record = 1 + 2 * n_ports * n_ports
+                elif keyword.startswith("[TWO-PORT DATA ORDER]"):
+                    two_port_order = line.split("]", 1)[1].strip()
+                elif keyword.startswith("[NOISE DATA]") or keyword.startswith("[END]"):
+                    break
+                continue
+
+            lines.append(line)
+            if len(lines) >= chunk_lines:
+                values = np.concatenate([pending, np.array(" ".join(lines).split(), dtype=float)])
+                lines = []
+                freq, params, pending, stop = flush(values)
+                if progress is not None:
+                    progress(consumed)
+                if len(freq):
+                    yield options, freq, params
+                if stop:
+                    return
+
+    if lines:
+        values = np.concatenate([pending, np.array(" ".join(lines).split(), dtype=float)])
+        freq, params, pending, _ = flush(values)
+        if progress is not None:
+            progress(consumed)
+        if len(freq):
+            yield options, freq, params
+
+
+def read_touchstone(path, n_ports=None, chunk_lines=65536):
+    freqs = []
+    blocks = []
+    options = parse_option_line("#")
+    for options, freq, params in iter_touchstone(path, n_ports, chunk_lines):
+        freqs.append(freq)
+        blocks.append(params)
+
+    if not freqs:
+        raise ValueError(f"No network data found in {os.path.basename(path)}")
+
+    return TouchstoneData(
+        np.concatenate(freqs), np.concatenate(blocks),
+        parameter=options["parameter"], z0=options["z0"]
+    )
@@ -0,0 +1,251 @@
+# smith_chart_qt/utils/vector_writer.py
+"""Streaming SVG and PDF writers for line art.
+
+Both writers take page coordinates in points with y pointing down, and draw
+circles and arcs as native primitives: SVG `<circle>` / `A` path commands, PDF
+cubic Béziers (at most 90° each, error below 0.03% of the radius). Output is
+buffered in small blocks and written as it is produced, so memory use does not
+grow with the size of the drawing.
+
+    with SvgWriter("chart.svg", 600, 600) as out:
+        out.set_style(stroke=(128, 128, 128, 255), width=0.8)
+        out.circle(300, 300, 250)
+"""
+import math
+import zlib
+import numpy as np
+
+FLUSH_BYTES = 1 << 16
+POLYLINE_CHUNK = 4096
+
+
+def _fmt(v):
+    return f"{v:.2f}"
+
+
+def _coords(xs, ys):
+    """'x,y' pairs of two arrays as strings, two decimals."""
+    pairs = np.char.add(np.char.add(np.char.mod("%.2f", xs), ","), np.char.mod("%.2f", ys))
+    return pairs.tolist()
+
+
+class _Writer:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._parts = []
+        self._size = 0
+        self._style = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _emit(self, text):
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= FLUSH_BYTES:
+            self._flush()
+
+    def _flush(self):
+        if self._parts:
+            self._write("".join(self._parts))
+            self._parts = []
+            self._size = 0
+
+    def set_style(self, stroke=None, width=1.0, fill=None, dash=None):
+        """Colors are (r, g, b, a) in 0-255 or None; `dash` is a list of lengths."""
+        style = (stroke, width, fill, tuple(dash) if dash else None)
+        if style != self._style:
+            self._style = style
+            self._apply_style(*style)
+
+    def polyline(self, xs, ys):
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float)
+        for start in range(0, len(xs) - 1, POLYLINE_CHUNK):
+            # Chunks overlap by one point so the line stays continuous
+            end = min(start + POLYLINE_CHUNK + 1, len(xs))
+            self._polyline(xs[start:end], ys[start:end])
+
+
+class SvgWriter(_Writer):
+    def __init__(self, path, width, height):
+        super().__init__(width, height)
+        self._file = open(path, "w", encoding="utf-8")
+        self._group_open = False
+        self._emit(f'<svg xmlns="http://www.w3.org/2000/svg" width="{_fmt(width)}pt" height="{_fmt(height)}pt" '
+                   f'viewBox="0 0 {_fmt(width)} {_fmt(height)}">\n')
+
+    def _write(self, text):
+        self._file.write(text)
+
+    @staticmethod
+    def _paint(attr, color):
+        """`fill="..."` / `stroke="..."` attributes for an (r, g, b, a) color or None."""
+        if color is None or color[3] == 0:
+            return f'{attr}="none"'
+        text = f'{attr}="#%02x%02x%02x"' % tuple(color[:3])
+        return text if color[3] == 255 else f'{text} {attr}-opacity="{color[3] / 255:.3g}"'
+
+    def _apply_style(self, stroke, width, fill, dash):
+        if self._group_open:
+            self._emit("</g>\n")
+        attrs = f'{self._paint("fill", fill)} {self._paint("stroke", stroke)}'
+        if stroke is not None and stroke[3] > 0:
+            attrs += f' stroke-width="{_fmt(width)}"'
+            if dash:
+                attrs += f' stroke-dasharray="{" ".join(_fmt(d) for d in dash)}"'
+        self._emit(f"<g {attrs}>\n")
+        self._group_open = True
+
+    def line(self, x1, y1, x2, y2):
+        self._emit(f'<line x1="{_fmt(x1)}" y1="{_fmt(y1)}" x2="{_fmt(x2)}" y2="{_fmt(y2)}"/>\n')
+
+    def circle(self, cx, cy, r):
+        self._emit(f'<circle cx="{_fmt(cx)}" cy="{_fmt(cy)}" r="{_fmt(r)}"/>\n')
+
+    def arc(self, cx, cy, r, start, end):
+        """Arc of the circle (cx, cy, r) from angle `start` to `end` (radians, y down)."""
+        if abs(end - start) >= 2 * math.pi:
+            self.circle(cx, cy, r)
+            return
+        x0, y0 = cx + r * math.cos(start), cy + r * math.sin(start)
+        x1, y1 = cx + r * math.cos(end), cy + r * math.sin(end)
+        large = int(abs(end - start) > math.pi)
+        sweep = int(end > start)
+        self._emit(f'<path d="M{_fmt(x0)},{_fmt(y0)}A{_fmt(r)},{_fmt(r)} 0 {large} {sweep} '
+                   f'{_fmt(x1)},{_fmt(y1)}"/>\n')
+
+    def _polyline(self, xs, ys):
+        self._emit(f'<polyline points="{" ".join(_coords(xs, ys))}"/>\n')
+
+    def text(self, x, y, text, size, color):
+        """`text` with its first baseline at (x, y); lines are split on newlines."""
+        escaped = text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+        lines = escaped.split("\n")
+        self._emit(f'<text x="{_fmt(x)}" y="{_fmt(y)}" font-family="Helvetica, Arial, sans-serif" '
+                   f'font-size="{_fmt(size)}" {self._paint("fill", color)} stroke="none">')
+        if len(lines) == 1:
+            self._emit(lines[0])
+        else:
+            for i, line in enumerate(lines):
+                self._emit(f'<tspan x="{_fmt(x)}" dy="{_fmt(0 if i == 0 else 1.2 * size)}">{line}</tspan>')
+        self._emit("</text>\n")
+
+    def close(self):
+        if self._file.closed:
+            return
+        if self._group_open:
+            self._emit("</g>\n")
+        self._emit("</svg>\n")
+        self._flush()
+        self._file.close()
+
+
+class PdfWriter(_Writer):
+    """Single-page PDF. The content stream is deflated as it is written and its
+    length is stored in a separate object written after it."""
+
+    def __init__(self, path, width, height):
+        super().__init__(width, height)
+        self._file = open(path, "wb")
+        self._offsets = {}
+        self._compressor = zlib.compressobj()
+        self._file.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        self._object(1, "<< /Type /Catalog /Pages 2 0 R >>")
+        self._object(2, "<< /Type /Pages /Kids [3 0 R] /Count 1 >>")
+        self._object(3, f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {_fmt(width)} {_fmt(height)}] "
+                        "/Contents 4 0 R /Resources << /Font << /F1 6 0 R >> >> >>")
+        self._offsets[4] = self._file.tell()
+        self._file.write(b"4 0 obj\n<< /Length 5 0 R /Filter /FlateDecode >>\nstream\n")
+        self._stream_start = self._file.tell()
+
+    def _object(self, number, body):
+        self._offsets[number] = self._file.tell()
+        self._file.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+
+    def _write(self, text):
+        self._file.write(self._compressor.compress(text.encode("latin-1")))
+
+    def _xy(self, x, y):
+        return f"{_fmt(x)} {_fmt(self.height - y)}"
+
+    @staticmethod
+    def _rgb(color):
+        return " ".join(f"{c / 255:.3g}" for c in color[:3])
+
+    def _apply_style(self, stroke, width, fill, dash):
+        ops = []
+        if stroke is not None:
+            ops.append(f"{self._rgb(stroke)} RG {_fmt(width)} w")
+        if fill is not None:
+            ops.append(f"{self._rgb(fill)} rg")
+        ops.append(f"[{' '.join(_fmt(d) for d in dash)}] 0 d" if dash else "[] 0 d")
+        self._emit(" ".join(ops) + "\n")
+
+    def _paint_op(self):
+        stroke, _, fill, _ = self._style or (None, 0, None, None)
+        stroke = stroke is not None and stroke[3] > 0
+        fill = fill is not None and fill[3] > 0
+        return "B" if stroke and fill else "f" if fill else "S" if stroke else "n"
+
+    def line(self, x1, y1, x2, y2):
+        self._emit(f"{self._xy(x1, y1)} m {self._xy(x2, y2)} l S\n")
+
+    def circle(self, cx, cy, r):
+        self._arc_path(cx, cy, r, 0.0, 2 * math.pi)
+        self._emit(f"h {self._paint_op()}\n")
+
+    def arc(self, cx, cy, r, start, end):
+        self._arc_path(cx, cy, r, start, end)
+        self._emit("S\n")
+
+    def _arc_path(self, cx, cy, r, start, end):
+        segments = max(1, math.ceil(abs(end - start) / (math.pi / 2) - 1e-9))
+        step = (end - start) / segments
+        k = 4 / 3 * math.tan(step / 4) * r
+        ops = [f"{self._xy(cx + r * math.cos(start), cy + r * math.sin(start))} m"]
+        a = start
+        for _ in range(segments):
+            b = a + step
+            ca, sa, cb, sb = math.cos(a), math.sin(a), math.cos(b), math.sin(b)
+            ops.append(f"{self._xy(cx + r * ca - k * sa, cy + r * sa + k * ca)} "
+                       f"{self._xy(cx + r * cb + k * sb, cy + r * sb - k * cb)} "
+                       f"{self._xy(cx + r * cb, cy + r * sb)} c")
+            a = b
+        self._emit(" ".join(ops) + "\n")
+
+    def _polyline(self, xs, ys):
+        pts = [p.replace(",", " ") for p in _coords(xs, self.height - ys)]
+        self._emit(pts[0] + " m " + " l ".join(pts[1:]) + " l S\n")
+
+    def text(self, x, y, text, size, color):
+        self._emit(f"q {self._rgb(color)} rg BT /F1 {_fmt(size)} Tf {_fmt(1.2 * size)} TL "
+                   f"1 0 0 1 {self._xy(x, y)} Tm ")
+        for i, line in enumerate(text.split("\n")):
+            # Base-14 Helvetica only covers WinAnsi; other characters become '?'
+            encoded = line.encode("cp1252", errors="replace").decode("latin-1")
+            escaped = encoded.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            self._emit(f"{'T* ' if i else ''}({escaped}) Tj ")
+        self._emit("ET Q\n")
+
+    def close(self):
+        if self._file.closed:
+            return
+        self._flush()
+        self._file.write(self._compressor.flush())
+        length = self._file.tell() - self._stream_start
+        self._file.write(b"\nendstream\nendobj\n")
+        self._object(5, str(length))
+        self._object(6, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+
+        xref = self._file.tell()
+        count = len(self._offsets) + 1
+        lines = [f"xref\n0 {count}\n", "0000000000 65535 f \n"]
+        lines += [f"{self._offsets[n]:010d} 00000 n \n" for n in range(1, count)]
+        lines.append(f"trailer\n<< /Size {count} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n")
+        self._file.write("".join(lines).encode("latin-1"))
+        self._file.close()